@@ -0,0 +1,149 @@
+"""
+Векторное начисление дивидендов, купонов и процентов по вкладам.
+
+Правила категорий активов один раз переводятся в векторы ставок в порядке
+каталога: у акций и облигаций начисление идет от цены (сумма цен за тики,
+умноженная на ставку), у вкладов - от номинала (число тиков, умноженное на
+ставку). Начисление за тики - одна операция над вектором количеств, а для
+нескольких игроков - над матрицей количеств (игроки x активы).
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from market_state import AssetCatalog, _read_only
+
+# Виды начислений
+ACCRUAL_DIVIDEND = 'dividend'
+ACCRUAL_INTEREST = 'interest'
+
+# База начисления
+BASIS_PRICE = 'price'
+BASIS_NOTIONAL = 'notional'
+
+# Правила категорий: (поле ставки в процентах годовых, вид начисления, база)
+ACCRUAL_RULES: Dict[str, Tuple[str, str, str]] = {
+    'акции': ('dividend', ACCRUAL_DIVIDEND, BASIS_PRICE),
+    'облигации': ('yield', ACCRUAL_INTEREST, BASIS_PRICE),
+    'вклады': ('yield', ACCRUAL_INTEREST, BASIS_NOTIONAL)
+}
+
+
+class AccrualTable:
+    """Векторы ставок начисления, скомпилированные под каталог активов."""
+
+    def __init__(
+            self,
+            catalog: AssetCatalog,
+            rules: Mapping[str, Tuple[str, str, str]] = ACCRUAL_RULES
+    ):
+        """
+        Компилирует правила начисления.
+
+        Args:
+            catalog: Каталог активов
+            rules: Правила категорий в формате ACCRUAL_RULES; активы
+                   остальных категорий ничего не приносят
+        """
+        size = len(catalog)
+        price_rates = np.zeros(size)
+        notional_rates = np.zeros(size)
+        dividend_weights = np.zeros(size)
+        kinds: list = [None] * size
+        for asset_class, (field, kind, basis) in rules.items():
+            for position in catalog.class_positions.get(asset_class, ()):
+                rate = float(np.nan_to_num(catalog.columns[field][position])) / 100
+                if basis == BASIS_NOTIONAL:
+                    notional_rates[position] = rate
+                else:
+                    price_rates[position] = rate
+                if kind == ACCRUAL_DIVIDEND:
+                    dividend_weights[position] = 1.0
+                kinds[position] = kind
+
+        self.catalog = catalog
+        self.price_rates = _read_only(price_rates)
+        self.notional_rates = _read_only(notional_rates)
+        # Веса для разделения суммы начислений на дивиденды и проценты
+        self.dividend_weights = _read_only(dividend_weights)
+        self.interest_weights = _read_only(
+            (np.array(kinds) == ACCRUAL_INTEREST).astype(np.float64)
+        )
+        self.kinds: Tuple[Optional[str], ...] = tuple(kinds)
+
+    def holdings(self, portfolio: Mapping[str, Any]) -> np.ndarray:
+        """
+        Возвращает вектор количеств портфеля в порядке каталога.
+
+        Тикеры, которых нет в каталоге, и непозитивные количества
+        не учитываются.
+        """
+        positions = self.catalog.positions
+        holdings = np.zeros(len(self.catalog))
+        for ticker, quantity in portfolio.items():
+            position = positions.get(ticker)
+            if position is not None and quantity > 0:
+                holdings[position] = quantity
+        return holdings
+
+    def holdings_matrix(self, portfolios: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Возвращает матрицу количеств (игроки x активы) для нескольких портфелей."""
+        matrix = np.zeros((len(portfolios), len(self.catalog)))
+        for row, portfolio in enumerate(portfolios):
+            matrix[row] = self.holdings(portfolio)
+        return matrix
+
+    def accrue(
+            self,
+            holdings: np.ndarray,
+            price_sums: Any,
+            periods_per_year: int,
+            ticks: int = 1
+    ) -> np.ndarray:
+        """
+        Вычисляет начисления по каждому активу за ticks тиков.
+
+        Args:
+            holdings: Вектор количеств или матрица (игроки x активы)
+            price_sums: Суммы цен активов за эти тики в порядке каталога
+            periods_per_year: Число тиков в году
+            ticks: Число тиков
+
+        Returns:
+            Начисления той же формы, что и holdings
+        """
+        rates = (
+            np.asarray(price_sums, dtype=np.float64) * self.price_rates +
+            ticks * self.notional_rates
+        )
+        return holdings * rates / periods_per_year
+
+    def totals(self, amounts: np.ndarray) -> Tuple[Any, Any]:
+        """
+        Разделяет начисления на дивиденды и проценты.
+
+        Args:
+            amounts: Результат accrue
+
+        Returns:
+            (дивиденды, проценты) - числа для вектора или векторы по игрокам
+            для матрицы
+        """
+        return amounts @ self.dividend_weights, amounts @ self.interest_weights
+
+
+_table: Optional[AccrualTable] = None
+
+
+def get_accrual_table(catalog: AssetCatalog) -> AccrualTable:
+    """
+    Возвращает таблицу начислений каталога.
+
+    Каталог неизменяем, поэтому таблица компилируется заново только при
+    смене каталога.
+    """
+    global _table
+    if _table is None or _table.catalog is not catalog:
+        _table = AccrualTable(catalog)
+    return _table
@@ -0,0 +1,100 @@
+"""
+Скомпилированная таблица эффектов рыночных событий.
+
+Ключи эффектов (категория активов или тикер) разрешаются в позиции каталога
+один раз при компиляции: для каждого события хранятся массив позиций
+затронутых активов и массив множителей цен. Применение события - одно
+векторное умножение, а использованные события отмечаются битами целого
+числа вместо поиска словарей в списке.
+"""
+
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from market_state import AssetCatalog
+
+
+class EventTable:
+    """Рыночные события, скомпилированные под каталог активов."""
+
+    def __init__(
+            self,
+            events: Sequence[Mapping[str, Any]],
+            catalog: AssetCatalog
+    ):
+        """
+        Компилирует события.
+
+        Эффекты одного события на один актив (например, по категории и по
+        тикеру) перемножаются; ключи, которых нет в каталоге, пропускаются.
+
+        Args:
+            events: События в формате MARKET_EVENTS
+            catalog: Каталог активов
+        """
+        self.events = tuple(events)
+        self.catalog = catalog
+        self._index_by_id = {id(event): index for index, event in enumerate(events)}
+
+        positions = []
+        multipliers = []
+        for event in self.events:
+            factors: Dict[int, float] = {}
+            for key, value in event['effects'].items():
+                targets = catalog.class_positions.get(key)
+                if targets is None:
+                    position = catalog.positions.get(key)
+                    targets = () if position is None else (position,)
+                for position in targets:
+                    factors[position] = factors.get(position, 1.0) * (1 + value)
+            event_positions = np.array(list(factors), dtype=np.intp)
+            event_multipliers = np.array(list(factors.values()), dtype=np.float64)
+            event_positions.flags.writeable = False
+            event_multipliers.flags.writeable = False
+            positions.append(event_positions)
+            multipliers.append(event_multipliers)
+
+        self.positions = tuple(positions)
+        self.multipliers = tuple(multipliers)
+        self.volatility_effects = tuple(
+            event.get('volatility_effect', 0) for event in self.events
+        )
+        # Маска, в которой отмечены все события
+        self.full_mask = (1 << len(self.events)) - 1
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def index_of(self, event: Mapping[str, Any]) -> int:
+        """
+        Возвращает номер события в таблице.
+
+        Raises:
+            ValueError: Если события нет в таблице
+        """
+        index = self._index_by_id.get(id(event))
+        if index is None:
+            raise ValueError(f"Событие {event.get('name')} не найдено в таблице")
+        return index
+
+    def free_indices(self, used_mask: int) -> List[int]:
+        """Возвращает номера событий, не отмеченных в маске, по порядку."""
+        return [
+            index for index in range(len(self.events))
+            if not used_mask >> index & 1
+        ]
+
+    def mask_of(self, events: Sequence[Mapping[str, Any]]) -> int:
+        """Возвращает маску, в которой отмечены указанные события."""
+        mask = 0
+        for event in events:
+            mask |= 1 << self.index_of(event)
+        return mask
+
+    def events_in(self, used_mask: int) -> List[Mapping[str, Any]]:
+        """Возвращает события, отмеченные в маске, по порядку таблицы."""
+        return [
+            event for index, event in enumerate(self.events)
+            if used_mask >> index & 1
+        ]
@@ -1,27 +1,39 @@
 import pygame
 import sys
-import random
 import math
 import os
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any
-
-# Инициализация Pygame
-pygame.init()
+from typing import Callable, Dict, List, Tuple, Optional, Any
+
+from simulation_core import (
+    MAX_TRADES_PER_DAY, TOTAL_WEEKS, INITIAL_BALANCE,
+    VTB_DARK_BLUE, VTB_BLUE, VTB_LIGHT_BLUE, VTB_WHITE, VTB_GREEN, VTB_RED,
+    VTB_GRAY, VTB_DARK_GRAY, VTB_BORDER_GRAY, VTB_ACCENT_BLUE, VTB_YELLOW,
+    VTB_PURPLE, ASSETS, MARKET_EVENTS, GameState, get_catalog
+)
+from market_state import MarketState
+from snapshot import SnapshotWriter, read_snapshot
+from universe import load_universe
 
 # Константы
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
 FPS = 60
-MAX_TRADES_PER_DAY = 10
-TOTAL_WEEKS = 12
-INITIAL_BALANCE = 10000.0
+FRAME_MODE_RESPONSIVE = 'responsive'
+FRAME_MODE_POWER_SAVING = 'power_saving'
+FRAME_SCHEDULER_MODE = FRAME_MODE_POWER_SAVING
+IDLE_WAIT_TIMEOUT = 1000  # максимальное ожидание события в простое, мс
+ACTIVE_PERIOD = 500  # полная частота кадров после ввода, мс
 MESSAGE_DISPLAY_TIME = 3000  # 3 seconds
+DIRTY_RECT_RENDERING = True  # False - полная перерисовка каждый кадр
 
 # Размеры UI элементов
 CARD_WIDTH = 500
 CARD_HEIGHT = 140
 CARD_SPACING = 150
+CARDS_LEFT = 50
+CARDS_TOP = 210
 BUTTON_WIDTH_SMALL = 180
 BUTTON_WIDTH_MEDIUM = 280
 BUTTON_WIDTH_LARGE = 200
@@ -29,34 +41,24 @@ BUTTON_HEIGHT = 40
 INPUT_FIELD_WIDTH = 100
 INPUT_FIELD_HEIGHT = 30
 LOGO_SIZE = (40, 40)
+HEADER_HEIGHT = 100
 CARD_RADIUS = 12
 BUTTON_RADIUS = 8
+TEXT_CACHE_SIZE = 512
 
-# Создание папки для логотипов
+# Пути к изображениям
 LOGOS_DIR = "logos"
-if not os.path.exists(LOGOS_DIR):
-    try:
-        os.makedirs(LOGOS_DIR)
-        print(f"Создана папка для логотипов: {LOGOS_DIR}")
-        print("Пожалуйста, добавьте в неё логотипы с именами: sber.png, vtb.png, tinkoff.png")
-        print(f"Рекомендуемый размер логотипов: {LOGO_SIZE[0]}x{LOGO_SIZE[1]} пикселей")
-    except OSError as e:
-        print(f"Ошибка при создании папки {LOGOS_DIR}: {e}")
-        sys.exit(1)
-
-# Цветовая палитра
-VTB_DARK_BLUE = (13, 37, 72)
-VTB_BLUE = (25, 68, 142)
-VTB_LIGHT_BLUE = (232, 240, 254)
-VTB_WHITE = (255, 255, 255)
-VTB_GREEN = (0, 168, 107)
-VTB_RED = (227, 58, 61)
-VTB_GRAY = (245, 247, 250)
-VTB_DARK_GRAY = (102, 112, 133)
-VTB_BORDER_GRAY = (226, 230, 238)
-VTB_ACCENT_BLUE = (56, 119, 237)
-VTB_YELLOW = (255, 184, 0)
-VTB_PURPLE = (121, 97, 225)
+NEWS_ICON_PATH = "news_icon.png"
+NEWS_ICON_SIZE = (20, 20)
+# Файл автосохранения (None - автосохранение выключено): снимок пишется
+# после каждой недели; незавершенная игра продолжается, только если игрок
+# запустил приложение с флагом RESUME_FLAG
+AUTOSAVE_PATH: Optional[str] = None
+RESUME_FLAG = "--resume"
+# Файлы набора активов и событий (CSV/JSON); None - встроенные ASSETS
+# и MARKET_EVENTS. Разобранный набор кэшируется рядом с файлом активов
+UNIVERSE_ASSETS_PATH: Optional[str] = None
+UNIVERSE_EVENTS_PATH: Optional[str] = None
 
 # Новый цвет основного фона
 BACKGROUND_COLOR = (231, 234, 239)
@@ -69,15 +71,15 @@ BUTTON_HOVER_COLOR = (100, 125, 180)
 VTB_BRIGHT_BLUE = (0, 91, 187)
 VTB_LIGHT_ACCENT = (74, 144, 255)
 
-# Создание экрана
-try:
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("ВТБ Инвестиционный Симулятор")
-except pygame.error as e:
-    print(f"Ошибка инициализации дисплея: {e}")
-    sys.exit(1)
+# Экран, часы, шрифты и логотипы создаются в init_ui()
+screen: Optional[pygame.Surface] = None
+clock: Optional[pygame.time.Clock] = None
 
-clock = pygame.time.Clock()
+# События ввода, после которых цикл возвращается к полной частоте кадров
+ACTIVITY_EVENTS = (
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT
+)
 
 
 def initialize_fonts() -> Tuple[Any, ...]:
@@ -108,8 +110,140 @@ def initialize_fonts() -> Tuple[Any, ...]:
         return title_font, header_font, normal_font, small_font, large_font, bold_font
 
 
-# Инициализация шрифтов
-title_font, header_font, normal_font, small_font, large_font, bold_font = initialize_fonts()
+# Шрифты создаются в init_ui()
+title_font = header_font = normal_font = small_font = large_font = bold_font = None
+
+
+class TextCache:
+    """LRU-кэш поверхностей с отрисованным текстом."""
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        """
+        Инициализация кэша текста.
+
+        Args:
+            max_size: Максимальное количество хранимых поверхностей
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: "OrderedDict[Tuple[Any, str, Tuple[int, ...], bool], pygame.Surface]" = (
+            OrderedDict()
+        )
+
+    def render(
+            self,
+            font: Any,
+            text: str,
+            color: Tuple[int, int, int],
+            antialias: bool = True
+    ) -> pygame.Surface:
+        """
+        Возвращает поверхность с текстом, растеризуя его только при промахе.
+
+        Args:
+            font: Шрифт текста
+            text: Текст для отрисовки
+            color: Цвет текста
+            antialias: Использовать ли сглаживание
+
+        Returns:
+            Surface с отрисованным текстом
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            # Вытесняем давно не использовавшийся текст (старые цены и балансы)
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """Очищает кэш и счетчики."""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+text_cache = TextCache()
+
+
+class ImageCache:
+    """Кэш изображений, загруженных с диска."""
+
+    def __init__(self):
+        """Инициализация пустого кэша."""
+        self._images: Dict[Tuple[str, Optional[Tuple[int, int]]], pygame.Surface] = {}
+        self._missing: Dict[str, str] = {}
+
+    def get(
+            self,
+            path: str,
+            size: Optional[Tuple[int, int]] = None
+    ) -> Optional[pygame.Surface]:
+        """
+        Возвращает изображение из кэша, при первом обращении загружая его.
+
+        Отсутствующие и повреждённые файлы запоминаются, поэтому повторные
+        обращения к ним не обращаются к диску и не выводят ошибку.
+
+        Args:
+            path: Путь к файлу изображения
+            size: Размер, к которому нужно масштабировать изображение
+
+        Returns:
+            Surface с изображением или None если его не удалось загрузить
+        """
+        key = (path, size)
+        if key in self._images:
+            return self._images[key]
+        if path in self._missing:
+            return None
+
+        try:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Файл {path} не найден")
+
+            image = pygame.image.load(path)
+            if size is not None:
+                image = pygame.transform.smoothscale(image, size)
+            image = self._convert(image)
+        except (pygame.error, FileNotFoundError, OSError) as e:
+            print(f"Ошибка загрузки изображения {path}: {e}")
+            self._missing[path] = str(e)
+            return None
+
+        self._images[key] = image
+        return image
+
+    def clear(self) -> None:
+        """Очищает кэш, включая список отсутствующих файлов."""
+        self._images.clear()
+        self._missing.clear()
+
+    @staticmethod
+    def _convert(image: pygame.Surface) -> pygame.Surface:
+        """Приводит изображение к формату экрана для быстрого blit."""
+        try:
+            if image.get_alpha() is not None:
+                return image.convert_alpha()
+            return image.convert()
+        except pygame.error:
+            # Видеорежим ещё не установлен - оставляем исходный формат
+            return image
+
+
+image_cache = ImageCache()
 
 
 def load_logo(filename: str, default_size: Tuple[int, int] = LOGO_SIZE) -> pygame.Surface:
@@ -123,17 +257,10 @@ def load_logo(filename: str, default_size: Tuple[int, int] = LOGO_SIZE) -> pygam
     Returns:
         Surface с логотипом
     """
-    try:
-        logo_path = os.path.join(LOGOS_DIR, filename)
-        if not os.path.exists(logo_path):
-            raise FileNotFoundError(f"Файл {logo_path} не найден")
-
-        logo = pygame.image.load(logo_path)
-        logo = pygame.transform.smoothscale(logo, default_size)
-        return logo
-    except (pygame.error, FileNotFoundError, OSError) as e:
-        print(f"Ошибка загрузки логотипа {filename}: {e}")
+    logo = image_cache.get(os.path.join(LOGOS_DIR, filename), default_size)
+    if logo is None:
         return create_dummy_logo(default_size)
+    return logo
 
 
 def create_dummy_logo(size: Tuple[int, int]) -> pygame.Surface:
@@ -160,100 +287,85 @@ def create_dummy_logo(size: Tuple[int, int]) -> pygame.Surface:
 
 def load_all_logos() -> Dict[str, pygame.Surface]:
     """
-    Загружает все логотипы для приложения.
+    Загружает логотипы всех активов каталога.
+
+    Файл логотипа берется из поля 'logo_file' актива, ключ - из поля 'logo'
+    (по умолчанию тикер). Один файл загружается один раз для всех активов.
 
     Returns:
         Словарь с логотипами
     """
     logos = {}
-    logo_mappings = {
-        'SBER': 'sber.png',
-        'VTBR': 'vtb.png',
-        'TCSG': 'tinkoff.png',
-        'VTB-B1379': 'vtb.png',
-        'SBER-SB29R': 'sber.png',
-        'TCSG-2R': 'tinkoff.png',
-        'VTB-DEP': 'vtb.png',
-        'SBER-DEP': 'sber.png',
-        'TCSG-DEP': 'tinkoff.png'
-    }
-
-    for key, filename in logo_mappings.items():
-        logos[key] = load_logo(filename)
+    loaded: Dict[str, pygame.Surface] = {}
+    catalog = get_catalog()
+    for position, (ticker, logo) in enumerate(zip(catalog.tickers, catalog.logos)):
+        try:
+            filename = catalog.value(position, 'logo_file')
+        except KeyError:
+            continue
+        if filename not in loaded:
+            loaded[filename] = load_logo(filename)
+        logos[logo or ticker] = loaded[filename]
 
     return logos
 
 
-# Загружаем логотипы
-try:
-    LOGOS = load_all_logos()
-except Exception as e:
-    print(f"Критическая ошибка при загрузке логотипов: {e}")
-    sys.exit(1)
-
-# Данные активов
-ASSETS = {
-    'акции': [
-        {
-            'name': 'Сбербанк', 'ticker': 'SBER', 'price': 297.17,
-            'base_price': 297.17, 'change': 0.0, 'dividend': 6.8,
-            'risk': 'Низкий', 'volatility': 0.03, 'color': VTB_GREEN,
-            'logo': 'SBER'
-        },
-        {
-            'name': 'ВТБ', 'ticker': 'VTBR', 'price': 69.96,
-            'base_price': 69.96, 'change': 0.0, 'dividend': 7.5,
-            'risk': 'Средний', 'volatility': 0.05, 'color': VTB_BLUE,
-            'logo': 'VTBR'
-        },
-        {
-            'name': 'Тинькофф', 'ticker': 'TCSG', 'price': 2920.20,
-            'base_price': 2920.20, 'change': 0.0, 'dividend': 5.2,
-            'risk': 'Высокий', 'volatility': 0.07, 'color': VTB_PURPLE,
-            'logo': 'TCSG'
-        }
-    ],
-    'облигации': [
-        {
-            'name': 'Сбер Sb29R', 'ticker': 'SBER-SB29R',
-            'price': 964.50, 'base_price': 964.50, 'change': 0.0,
-            'yield': 13.26, 'risk': 'Низкий', 'volatility': 0.01,
-            'color': VTB_GREEN, 'logo': 'SBER-SB29R'
-        },
-        {
-            'name': 'ВТБ Б1-379', 'ticker': 'VTB-B1379',
-            'price': 1001.10, 'base_price': 1001.10, 'change': 0.0,
-            'yield': 14.25, 'risk': 'Низкий', 'volatility': 0.01,
-            'color': VTB_BLUE, 'logo': 'VTB-B1379'
-        },
-        {
-            'name': 'Тинькофф 2R', 'ticker': 'TCSG-2R',
-            'price': 997.90, 'base_price': 997.90, 'change': 0.0,
-            'yield': 12.85, 'risk': 'Средний', 'volatility': 0.015,
-            'color': VTB_PURPLE, 'logo': 'TCSG-2R'
-        }
-    ],
-    'вклады': [
-        {
-            'name': 'Сбербанк «Ключевой»', 'ticker': 'SBER-DEP',
-            'price': 1.0, 'base_price': 1.0, 'change': 0.0,
-            'yield': 18.0, 'risk': 'Низкий', 'volatility': 0.0,
-            'color': VTB_GREEN, 'logo': 'SBER-DEP'
-        },
-        {
-            'name': 'ВТБ «Двойная выгода»', 'ticker': 'VTB-DEP',
-            'price': 1.0, 'base_price': 1.0, 'change': 0.0,
-            'yield': 26.0, 'risk': 'Низкий', 'volatility': 0.0,
-            'color': VTB_BLUE, 'logo': 'VTB-DEP'
-        },
-        {
-            'name': 'Тинькофф «СмартВклад»', 'ticker': 'TCSG-DEP',
-            'price': 1.0, 'base_price': 1.0, 'change': 0.0,
-            'yield': 15.0, 'risk': 'Низкий', 'volatility': 0.0,
-            'color': VTB_PURPLE, 'logo': 'TCSG-DEP'
-        }
-    ]
-}
+LOGOS: Dict[str, pygame.Surface] = {}
+
+
+def _ensure_logos_dir() -> None:
+    """Создает папку для логотипов, если её нет."""
+    if os.path.exists(LOGOS_DIR):
+        return
+    try:
+        os.makedirs(LOGOS_DIR)
+        print(f"Создана папка для логотипов: {LOGOS_DIR}")
+        print("Пожалуйста, добавьте в неё логотипы с именами: sber.png, vtb.png, tinkoff.png")
+        print(f"Рекомендуемый размер логотипов: {LOGO_SIZE[0]}x{LOGO_SIZE[1]} пикселей")
+    except OSError as e:
+        print(f"Ошибка при создании папки {LOGOS_DIR}: {e}")
+        sys.exit(1)
+
+
+def init_ui() -> None:
+    """
+    Инициализирует Pygame, окно, шрифты и логотипы.
+
+    Вызывается из main(), поэтому импорт модуля не открывает окно
+    и не требует дисплея. Повторный вызов ничего не делает.
+    """
+    global screen, clock, LOGOS
+    global title_font, header_font, normal_font, small_font, large_font, bold_font
+
+    if screen is not None:
+        return
+
+    pygame.init()
+    _ensure_logos_dir()
+
+    try:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("ВТБ Инвестиционный Симулятор")
+    except pygame.error as e:
+        print(f"Ошибка инициализации дисплея: {e}")
+        sys.exit(1)
+
+    clock = pygame.time.Clock()
+    (title_font, header_font, normal_font,
+     small_font, large_font, bold_font) = initialize_fonts()
+
+    if UNIVERSE_ASSETS_PATH is not None:
+        try:
+            load_universe(UNIVERSE_ASSETS_PATH, UNIVERSE_EVENTS_PATH).install()
+        except (OSError, ValueError) as e:
+            print(f"Ошибка загрузки набора активов: {e}")
+            sys.exit(1)
+
+    try:
+        LOGOS = load_all_logos()
+    except Exception as e:
+        print(f"Критическая ошибка при загрузке логотипов: {e}")
+        sys.exit(1)
 
 
 class Button:
@@ -269,7 +381,7 @@ class Button:
             color: Tuple[int, int, int] = BUTTON_COLOR,
             hover_color: Tuple[int, int, int] = BUTTON_HOVER_COLOR,
             text_color: Tuple[int, int, int] = VTB_WHITE,
-            font: Any = normal_font,
+            font: Any = None,
             corner_radius: int = BUTTON_RADIUS
     ):
         """
@@ -284,7 +396,7 @@ class Button:
             color: Цвет кнопки
             hover_color: Цвет при наведении
             text_color: Цвет текста
-            font: Шрифт текста
+            font: Шрифт текста (по умолчанию normal_font)
             corner_radius: Радиус скругления углов
         """
         self.rect = pygame.Rect(x, y, width, height)
@@ -292,7 +404,7 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.text_color = text_color
-        self.font = font
+        self.font = font if font is not None else normal_font
         self.is_hovered = False
         self.enabled = True
         self.corner_radius = corner_radius
@@ -307,7 +419,7 @@ class Button:
         pygame.draw.rect(
             surface, color, self.rect, border_radius=self.corner_radius
         )
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = text_cache.render(self.font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -337,7 +449,7 @@ class InputField:
             width: int,
             height: int,
             default_text: str = "10",
-            font: Any = normal_font,
+            font: Any = None,
             text_color: Tuple[int, int, int] = VTB_DARK_BLUE,
             bg_color: Tuple[int, int, int] = VTB_WHITE,
             border_color: Tuple[int, int, int] = VTB_BORDER_GRAY,
@@ -353,7 +465,7 @@ class InputField:
             width: Ширина поля
             height: Высота поля
             default_text: Текст по умолчанию
-            font: Шрифт текста
+            font: Шрифт текста (по умолчанию normal_font)
             text_color: Цвет текста
             bg_color: Цвет фона
             border_color: Цвет границы
@@ -362,7 +474,7 @@ class InputField:
         """
         self.rect = pygame.Rect(x, y, width, height)
         self.text = default_text
-        self.font = font
+        self.font = font if font is not None else normal_font
         self.text_color = text_color
         self.bg_color = bg_color
         self.border_color = border_color
@@ -385,7 +497,7 @@ class InputField:
             surface, border_color, self.rect, 2, border_radius=self.corner_radius
         )
 
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = text_cache.render(self.font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -460,7 +572,7 @@ class TabButton:
             surface, VTB_BORDER_GRAY, self.rect, 1, border_radius=BUTTON_RADIUS
         )
 
-        text_surf = small_font.render(self.text, True, text_color)
+        text_surf = text_cache.render(small_font, self.text, text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -508,9 +620,41 @@ class AssetCard:
         self.asset = asset
         self.rect = pygame.Rect(x, y, width, height)
         self.is_selected = False
+        self._surface: Optional[pygame.Surface] = None
+        self._surface_state: Optional[Tuple[Any, ...]] = None
 
     def draw(self, surface: pygame.Surface, portfolio_qty: int = 0) -> None:
-        """Отрисовывает карточку актива."""
+        """
+        Отрисовывает карточку актива.
+
+        Карточка растеризуется в собственную поверхность и перерисовывается
+        только при изменении цены, количества в портфеле или выделения.
+        """
+        state = self._render_state(portfolio_qty)
+        if self._surface is None or state != self._surface_state:
+            self._surface = self._render(portfolio_qty)
+            self._surface_state = state
+        surface.blit(self._surface, self.rect)
+
+    def _render_state(self, portfolio_qty: int) -> Tuple[Any, ...]:
+        """Возвращает данные, от которых зависит внешний вид карточки."""
+        return self.asset['price'], portfolio_qty, self.is_selected
+
+    def _render(self, portfolio_qty: int) -> pygame.Surface:
+        """Рисует карточку в отдельную поверхность её размера."""
+        card_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        screen_rect = self.rect
+        # Вспомогательные методы рисуют относительно self.rect,
+        # поэтому на время отрисовки переходим к локальным координатам
+        self.rect = card_surface.get_rect()
+        try:
+            self._draw_layers(card_surface, portfolio_qty)
+        finally:
+            self.rect = screen_rect
+        return card_surface
+
+    def _draw_layers(self, surface: pygame.Surface, portfolio_qty: int) -> None:
+        """Рисует все элементы карточки."""
         self._draw_card_background(surface)
         self._draw_card_header(surface)
         self._draw_card_content(surface, portfolio_qty)
@@ -699,16 +843,16 @@ class AssetCard:
 class VTBAssetCard(AssetCard):
     """Класс для карточек активов ВТБ с особым оформлением."""
 
-    def draw(
+    def _draw_layers(
             self,
             surface: pygame.Surface,
-            portfolio_qty: int = 0
+            portfolio_qty: int
     ) -> None:
-        """Отрисовывает карточку актива ВТБ с особым оформлением."""
+        """Рисует карточку актива ВТБ с особым оформлением."""
         if 'VTB' in self.asset['ticker']:
             self._draw_vtb_highlight(surface)
 
-        super().draw(surface, portfolio_qty)
+        super()._draw_layers(surface, portfolio_qty)
 
     def _draw_vtb_highlight(self, surface: pygame.Surface) -> None:
         """Отрисовывает выделение для активов ВТБ."""
@@ -734,6 +878,104 @@ class VTBAssetCard(AssetCard):
         )
 
 
+def create_asset_card(asset: Dict[str, Any], x: int, y: int) -> AssetCard:
+    """
+    Создает карточку подходящего типа для актива.
+
+    Args:
+        asset: Данные актива
+        x: Координата X
+        y: Координата Y
+
+    Returns:
+        Карточка актива
+    """
+    if 'VTB' in asset['ticker']:
+        return VTBAssetCard(asset, x, y, CARD_WIDTH, CARD_HEIGHT)
+    return AssetCard(asset, x, y, CARD_WIDTH, CARD_HEIGHT)
+
+
+class AssetCardPool:
+    """Набор карточек активов, создаваемый один раз для каждой вкладки."""
+
+    def __init__(
+            self,
+            x: int = CARDS_LEFT,
+            y: int = CARDS_TOP,
+            market: Optional[MarketState] = None
+    ):
+        """
+        Инициализация набора карточек.
+
+        Args:
+            x: Координата X колонки карточек
+            y: Координата Y первой карточки
+            market: Рыночное состояние, цены которого показывают карточки
+                    (по умолчанию базовые цены общего каталога)
+        """
+        self.x = x
+        self.y = y
+        self.market = market if market is not None else MarketState(get_catalog())
+        self._cards: Dict[str, List[AssetCard]] = {}
+        self._catalog = self.market.catalog
+
+    def bind(self, market: MarketState) -> None:
+        """
+        Привязывает карточки к рыночному состоянию игровой сессии.
+
+        Args:
+            market: Рыночное состояние сессии
+        """
+        self.market = market
+        self.invalidate()
+
+    def cards(self, asset_type: str) -> List[AssetCard]:
+        """
+        Возвращает карточки вкладки, создавая их при первом обращении.
+
+        Args:
+            asset_type: Тип активов вкладки
+
+        Returns:
+            Список карточек в порядке отображения
+        """
+        if self._catalog is not self.market.catalog:
+            # Сессия перешла на новый каталог - карточки создаются заново
+            self.invalidate()
+
+        if asset_type not in self._cards:
+            self._cards[asset_type] = [
+                create_asset_card(asset, self.x, self.y + i * CARD_SPACING)
+                for i, asset in enumerate(self.market.assets.get(asset_type, []))
+            ]
+        return self._cards[asset_type]
+
+    def card_at(
+            self,
+            asset_type: str,
+            pos: Tuple[int, int]
+    ) -> Optional[AssetCard]:
+        """
+        Находит карточку вкладки под указанной точкой.
+
+        Returns:
+            Карточка или None если точка вне карточек
+        """
+        for card in self.cards(asset_type):
+            if card.check_click(pos):
+                return card
+        return None
+
+    def invalidate(self) -> None:
+        """Сбрасывает карточки, чтобы пересоздать их по текущим активам."""
+        self._cards.clear()
+        self._catalog = self.market.catalog
+
+
+asset_card_pool = AssetCardPool()
+snapshot_writer = SnapshotWriter()
+
+
 def format_currency(value: float) -> str:
     """
     Форматирует валюту без лишних нулей.
@@ -766,6 +1008,8 @@ def draw_text(
     """
     Рисует текст на поверхности.
 
+    Растеризованный текст берётся из text_cache.
+
     Args:
         surface: Поверхность для отрисовки
         text: Текст для отрисовки
@@ -779,10 +1023,10 @@ def draw_text(
         Rect отрисованного текста
     """
     try:
-        text_surface = font.render(str(text), True, color)
+        text_surface = text_cache.render(font, str(text), color)
     except UnicodeEncodeError:
-        text_surface = font.render(
-            str(text).encode('utf-8', 'ignore').decode('utf-8'), True, color
+        text_surface = text_cache.render(
+            font, str(text).encode('utf-8', 'ignore').decode('utf-8'), color
         )
 
     if centered:
@@ -824,6 +1068,75 @@ def draw_card(
     return card_rect
 
 
+class HeaderRenderer:
+    """Кэширующий рендерер заголовка ВТБ с градиентом."""
+
+    def __init__(self, width: int = SCREEN_WIDTH, height: int = HEADER_HEIGHT):
+        """
+        Инициализация рендерера заголовка.
+
+        Args:
+            width: Ширина заголовка
+            height: Высота заголовка
+        """
+        self.rect = pygame.Rect(0, 0, width, height)
+        self._background: Optional[pygame.Surface] = None
+        self._week_text: Optional[str] = None
+        self._week_surface: Optional[pygame.Surface] = None
+        self._date_text: Optional[str] = None
+        self._date_surface: Optional[pygame.Surface] = None
+
+    def _render_background(self) -> pygame.Surface:
+        """Один раз рисует градиент и статичные надписи заголовка."""
+        background = pygame.Surface(self.rect.size)
+        specified_color = (12, 44, 118)
+        light_end = (40, 80, 160)
+
+        for i in range(self.rect.height):
+            ratio = i / self.rect.height
+            r = int(specified_color[0] * (1 - ratio) + light_end[0] * ratio)
+            g = int(specified_color[1] * (1 - ratio) + light_end[1] * ratio)
+            b = int(specified_color[2] * (1 - ratio) + light_end[2] * ratio)
+            color = (r, g, b)
+            pygame.draw.line(background, color, (0, i), (self.rect.width, i))
+
+        draw_text(background, "ВТБ", title_font, VTB_WHITE, 40, 35)
+        draw_text(
+            background, "ИНВЕСТИЦИОННЫЙ СИМУЛЯТОР", header_font, VTB_WHITE, 120, 35
+        )
+
+        marketing_text = " ВТБ - лидер по доходности! "
+        draw_text(background, marketing_text, small_font, VTB_WHITE, 120, 60)
+        return background
+
+    def draw(self, surface: pygame.Surface, week_text: Optional[str] = None) -> None:
+        """
+        Выводит заголовок, перерисовывая только изменившиеся надписи.
+
+        Args:
+            surface: Поверхность для отрисовки
+            week_text: Текст недели для отображения
+        """
+        if self._background is None:
+            self._background = self._render_background()
+        surface.blit(self._background, self.rect)
+
+        if week_text:
+            if week_text != self._week_text:
+                self._week_text = week_text
+                self._week_surface = small_font.render(week_text, True, VTB_WHITE)
+            surface.blit(self._week_surface, (self.rect.width - 120, 60))
+
+        current_date = datetime.now().strftime("%d.%m.%Y")
+        if current_date != self._date_text:
+            self._date_text = current_date
+            self._date_surface = small_font.render(current_date, True, VTB_WHITE)
+        surface.blit(self._date_surface, (self.rect.width - 120, 40))
+
+
+vtb_header = HeaderRenderer()
+
+
 def draw_vtb_header(
         surface: pygame.Surface,
         week_text: Optional[str] = None
@@ -831,39 +1144,14 @@ def draw_vtb_header(
     """
     Рисует заголовок ВТБ с градиентом.
 
+    Градиент и статичные надписи берутся из кэша, поэтому каждый кадр
+    выполняется лишь несколько операций blit.
+
     Args:
         surface: Поверхность для отрисовки
         week_text: Текст недели для отображения
     """
-    header_rect = pygame.Rect(0, 0, SCREEN_WIDTH, 100)
-    specified_color = (12, 44, 118)
-    light_end = (40, 80, 160)
-
-    for i in range(header_rect.height):
-        ratio = i / header_rect.height
-        r = int(specified_color[0] * (1 - ratio) + light_end[0] * ratio)
-        g = int(specified_color[1] * (1 - ratio) + light_end[1] * ratio)
-        b = int(specified_color[2] * (1 - ratio) + light_end[2] * ratio)
-        color = (r, g, b)
-        pygame.draw.line(surface, color, (0, i), (SCREEN_WIDTH, i))
-
-    draw_text(surface, "ВТБ", title_font, VTB_WHITE, 40, 35)
-    draw_text(
-        surface, "ИНВЕСТИЦИОННЫЙ СИМУЛЯТОР", header_font, VTB_WHITE, 120, 35
-    )
-
-    marketing_text = " ВТБ - лидер по доходности! "
-    draw_text(surface, marketing_text, small_font, VTB_WHITE, 120, 60)
-
-    if week_text:
-        draw_text(
-            surface, week_text, small_font, VTB_WHITE, SCREEN_WIDTH - 120, 60
-        )
-
-    current_date = datetime.now().strftime("%d.%m.%Y")
-    draw_text(
-        surface, current_date, small_font, VTB_WHITE, SCREEN_WIDTH - 120, 40
-    )
+    vtb_header.draw(surface, week_text)
 
 
 def draw_pie_chart(
@@ -910,340 +1198,205 @@ def draw_pie_chart(
     pygame.draw.circle(surface, VTB_DARK_BLUE, (x, y), radius, 2)
 
 
-# Рыночные события - расширенный список
-MARKET_EVENTS = [
-    {
-        'name': 'Рост нефтяных цен',
-        'description': 'Цены на нефть выросли на мировых рынках',
-        'effects': {'VTBR': 0.08, 'SBER': 0.02},
-        'volatility_effect': 0.05
-    },
-    {
-        'name': 'Снижение ключевой ставки',
-        'description': 'Центральный банк снизил ключевую ставку',
-        'effects': {'облигации': 0.03, 'вклады': -0.02},
-        'volatility_effect': -0.02
-    },
-    {
-        'name': 'Волатильность на рынке',
-        'description': 'Повышенная волатильность на финансовых рынках',
-        'effects': {'акции': 0.05},
-        'volatility_effect': 0.1
-    },
-    {
-        'name': 'Стабильность в экономике',
-        'description': 'Экономическая стабильность положительно влияет на рынок',
-        'effects': {'облигации': 0.02, 'акции': 0.03},
-        'volatility_effect': -0.05
-    },
-    {
-        'name': 'Рост инфляции',
-        'description': 'Уровень инфляции'
-                       ' превысил ожидания',
-        'effects': {'облигации': -0.03, 'акции': -0.02},
-        'volatility_effect': 0.04
-    },
-    {
-        'name': 'Укрепление рубля',
-        'description': 'Рубль укрепился по отношению к мировым валютам',
-        'effects': {'VTBR': -0.04, 'SBER': 0.01},
-        'volatility_effect': -0.03
-    },
-    {
-        'name': 'Новые санкции',
-        'description': 'Введены новые экономические санкции',
-        'effects': {'акции': -0.06, 'облигации': -0.02},
-        'volatility_effect': 0.08
-    },
-    {
-        'name': 'Позитивные корпоративные новости',
-        'description': 'Крупные компании сообщили о росте прибыли',
-        'effects': {'акции': 0.04},
-        'volatility_effect': 0.02
-    }
-]
-
-
-class GameState:
-    """Класс для управления состоянием игры."""
+class Panel:
+    """Область экрана, которая перерисовывается при изменении своего состояния."""
 
-    def __init__(self):
-        """Инициализация состояния игры."""
-        self.current_week = 1
-        self.total_weeks = TOTAL_WEEKS
-        self.initial_balance = INITIAL_BALANCE
-        self.player = {
-            'balance': INITIAL_BALANCE,
-            'portfolio': {},
-            'total_value': INITIAL_BALANCE,
-            'total_profit': 0.0,
-            'trades_today': 0,
-            'max_trades_per_day': MAX_TRADES_PER_DAY,
-            'history': [INITIAL_BALANCE] * TOTAL_WEEKS,
-            'dividends_earned': 0.0,
-            'interest_earned': 0.0
-        }
-        self.current_event = None
-        self.selected_asset_ticker = None
-        self.selected_asset_type = 'акции'
-        self.operation_type = 'buy'
-        self.quantity_input = "10"
-        self.game_finished = False
-        self.message = ""
-        self.message_timer = 0
-        self.message_type = ""
-        self.market_news = []
-        self.used_events = []  # Список использованных событий для исключения повторений
-        self.market_volatility = 1.0  # Множитель волатильности рынка
-
-    def reset_game(self) -> None:
-        """Сбрасывает игру в начальное состояние."""
-        self.__init__()
-        for asset_type in ASSETS.values():
-            for asset in asset_type:
-                asset['price'] = asset['base_price']
-                asset['change'] = 0.0
-
-    def next_week(self) -> bool:
+    def __init__(
+            self,
+            rect: pygame.Rect,
+            draw: Callable[[], None],
+            state: Callable[[], Any]
+    ):
         """
-        Переход к следующей неделе.
+        Инициализация панели.
 
-        Returns:
-            True если игра продолжается, False если игра завершена
+        Args:
+            rect: Область экрана, в пределах которой рисует панель
+            draw: Функция отрисовки панели
+            state: Функция, возвращающая данные, от которых зависит вид панели
         """
-        if self.current_week < self.total_weeks:
-            self.current_week += 1
-            self.player['trades_today'] = 0
-            self.market_news = []
+        self.rect = pygame.Rect(rect)
+        self.draw = draw
+        self.state = state
+        self.dirty = True
+        self._last_state: Any = None
 
-            if random.random() < 0.6:
-                self.apply_market_event()
+    def check_dirty(self) -> bool:
+        """
+        Сравнивает текущее состояние с отрисованным.
 
-            self.update_prices()
-            self.apply_dividends_and_interest()
-            self.update_portfolio_value()
+        Returns:
+            True если панель нужно перерисовать, иначе False
+        """
+        state = self.state()
+        if state != self._last_state:
+            self._last_state = state
+            self.dirty = True
+        return self.dirty
 
-            if self.current_week <= self.total_weeks:
-                self.player['history'][self.current_week - 1] = (
-                    self.player['total_value']
-                )
 
-            return True
-        else:
-            self.game_finished = True
-            return False
-
-    def apply_market_event(self) -> None:
-        """Применяет случайное рыночное событие."""
-        # Исключаем повторяющиеся события
-        available_events = [
-            e for e in MARKET_EVENTS if e not in self.used_events
-        ]
-
-        # Если все события уже использовались, сбрасываем список
-        if not available_events:
-            available_events = MARKET_EVENTS.copy()
-            self.used_events = []
-
-        event = random.choice(available_events)
-        self.current_event = event
-        self.used_events.append(event)
-
-        # Добавляем новость о событии
-        self.market_news.append(
-            f"📈 {event['name']}: {event['description']}"
-        )
+class DirtyRectRenderer:
+    """Рендерер экрана, перерисовывающий только изменившиеся панели."""
 
-        # Применяем эффект волатильности
-        self.market_volatility *= (1 + event.get('volatility_effect', 0))
-        # Ограничиваем волатильность
-        self.market_volatility = max(0.5, min(2.0, self.market_volatility))
+    def __init__(
+            self,
+            surface: pygame.Surface,
+            background: Tuple[int, int, int] = BACKGROUND_COLOR
+    ):
+        """
+        Инициализация рендерера.
 
-        # Применяем эффекты к активам
-        for effect_key, effect_value in event['effects'].items():
-            if effect_key in ['акции', 'облигации', 'вклады']:
-                for asset in ASSETS[effect_key]:
-                    self._apply_price_effect(asset, effect_value)
-            else:
-                self._apply_ticker_effect(effect_key, effect_value)
+        Args:
+            surface: Поверхность экрана
+            background: Цвет фона под панелями
+        """
+        self.surface = surface
+        self.background = background
+        self.panels: List[Panel] = []
+        self._full_redraw = True
 
-    def _apply_price_effect(
+    def add_panel(
             self,
-            asset: Dict[str, Any],
-            effect_value: float
-    ) -> None:
-        """Применяет эффект цены к активу."""
-        old_price = asset['price']
-        asset['price'] = max(0.01, asset['price'] * (1 + effect_value))
-        asset['change'] = ((asset['price'] - old_price) / old_price) * 100
+            rect: pygame.Rect,
+            draw: Callable[[], None],
+            state: Callable[[], Any]
+    ) -> Panel:
+        """
+        Добавляет панель. Панели рисуются в порядке добавления.
 
-    def _apply_ticker_effect(
-            self,
-            ticker: str,
-            effect_value: float
-    ) -> None:
-        """Применяет эффект к активу по тикеру."""
-        for asset_type in ASSETS.values():
-            for asset in asset_type:
-                if asset['ticker'] == ticker:
-                    self._apply_price_effect(asset, effect_value)
-                    break
-
-    def update_prices(self) -> None:
-        """Обновляет цены активов с учетом волатильности."""
-        for asset_type in ASSETS.values():
-            for asset in asset_type:
-                if asset['volatility'] > 0:
-                    self._update_asset_price(asset)
-
-    def _update_asset_price(self, asset: Dict[str, Any]) -> None:
-        """Обновляет цену конкретного актива."""
-        # Учитываем текущую волатильность рынка
-        adjusted_volatility = asset['volatility'] * self.market_volatility
-        change = random.uniform(-adjusted_volatility, adjusted_volatility)
-        old_price = asset['price']
-        asset['price'] = max(0.01, asset['price'] * (1 + change))
-        asset['change'] = ((asset['price'] - old_price) / old_price) * 100
-
-        if abs(change) > adjusted_volatility * 0.8:
-            direction = "рост" if change > 0 else "падение"
-            news_text = (
-                f"📊 {asset['name']}: {direction} на {abs(change * 100):.1f}%"
-            )
-            if news_text not in self.market_news:
-                self.market_news.append(news_text)
-
-    def apply_dividends_and_interest(self) -> None:
-        """Начисляет дивиденды и проценты по активам."""
-        self._apply_dividends()
-        self._apply_bond_interest()
-        self._apply_deposit_interest()
-
-    def _apply_dividends(self) -> None:
-        """Начисляет дивиденды по акциям."""
-        for asset in ASSETS['акции']:
-            ticker = asset['ticker']
-            if (ticker in self.player['portfolio'] and
-                    self.player['portfolio'][ticker] > 0):
-                dividend_amount = (
-                        asset['price'] * self.player['portfolio'][ticker] *
-                        asset['dividend'] / 100 / 52
-                )
-                self.player['balance'] += dividend_amount
-                self.player['dividends_earned'] += dividend_amount
-
-    def _apply_bond_interest(self) -> None:
-        """Начисляет купоны по облигациям."""
-        for asset in ASSETS['облигации']:
-            ticker = asset['ticker']
-            if (ticker in self.player['portfolio'] and
-                    self.player['portfolio'][ticker] > 0):
-                interest_amount = (
-                        asset['price'] * self.player['portfolio'][ticker] *
-                        asset['yield'] / 100 / 52
-                )
-                self.player['balance'] += interest_amount
-                self.player['interest_earned'] += interest_amount
-
-    def _apply_deposit_interest(self) -> None:
-        """Начисляет проценты по вкладам."""
-        for asset in ASSETS['вклады']:
-            ticker = asset['ticker']
-            if (ticker in self.player['portfolio'] and
-                    self.player['portfolio'][ticker] > 0):
-                interest_amount = (
-                        self.player['portfolio'][ticker] * asset['yield'] / 100 / 52
-                )
-                self.player['balance'] += interest_amount
-                self.player['interest_earned'] += interest_amount
-
-    def update_portfolio_value(self) -> None:
-        """Обновляет общую стоимость портфеля."""
-        total = self.player['balance']
-        for ticker, quantity in self.player['portfolio'].items():
-            asset = self.find_asset_by_ticker(ticker)
-            if asset:
-                total += asset['price'] * quantity
+        Returns:
+            Созданная панель
+        """
+        panel = Panel(rect, draw, state)
+        self.panels.append(panel)
+        return panel
 
-        self.player['total_value'] = total
-        self.player['total_profit'] = total - self.initial_balance
+    def invalidate(self) -> None:
+        """Помечает весь экран для полной перерисовки."""
+        self._full_redraw = True
+        for panel in self.panels:
+            panel.dirty = True
 
-    def find_asset_by_ticker(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def render(self) -> List[pygame.Rect]:
         """
-        Находит актив по тикеру.
-
-        Args:
-            ticker: Тикер актива
+        Перерисовывает изменившиеся панели.
 
         Returns:
-            Данные актива или None если не найден
+            Список областей экрана, которые нужно обновить на дисплее
         """
-        for asset_type in ASSETS.values():
-            for asset in asset_type:
-                if asset['ticker'] == ticker:
-                    return asset
-        return None
+        dirty_panels = [panel for panel in self.panels if panel.check_dirty()]
+
+        if self._full_redraw:
+            self._full_redraw = False
+            self.surface.fill(self.background)
+            dirty_rects = [self.surface.get_rect()]
+        elif not dirty_panels:
+            return []
+        else:
+            dirty_rects = [panel.rect for panel in dirty_panels]
+            # Панели, пересекающие перерисовываемые области, рисуются заново,
+            # чтобы сохранить порядок наложения
+            expanded = True
+            while expanded:
+                expanded = False
+                for panel in self.panels:
+                    if not panel.dirty and panel.rect.collidelist(dirty_rects) != -1:
+                        panel.dirty = True
+                        dirty_rects.append(panel.rect)
+                        expanded = True
 
-    def execute_trade(self) -> Tuple[bool, str]:
-        """
-        Выполняет торговую операцию.
+            for rect in dirty_rects:
+                self.surface.fill(self.background, rect)
 
-        Returns:
-            Кортеж (успех, сообщение)
+        for panel in self.panels:
+            if panel.dirty:
+                panel.draw()
+                panel.dirty = False
+
+        return dirty_rects
+
+
+class FrameScheduler:
+    """Планировщик кадров главного цикла."""
+
+    def __init__(
+            self,
+            clock: pygame.time.Clock,
+            mode: str = FRAME_MODE_POWER_SAVING,
+            fps: int = FPS,
+            idle_timeout: int = IDLE_WAIT_TIMEOUT,
+            active_period: int = ACTIVE_PERIOD
+    ):
         """
-        if self.player['trades_today'] >= self.player['max_trades_per_day']:
-            return False, "Достигнут лимит сделок на сегодня"
+        Инициализация планировщика.
 
-        try:
-            quantity = int(self.quantity_input)
-            if quantity <= 0:
-                return False, "Количество должно быть больше 0"
-        except ValueError:
-            return False, "Неверное количество"
-
-        if not self.selected_asset_ticker:
-            return False, "Выберите актив"
-
-        asset = self.find_asset_by_ticker(self.selected_asset_ticker)
-        if not asset:
-            return False, "Актив не найден"
-
-        total_cost = asset['price'] * quantity
-        if self.player['balance'] >= total_cost:
-            self.player['balance'] -= total_cost
-            if self.selected_asset_ticker in self.player['portfolio']:
-                self.player['portfolio'][self.selected_asset_ticker] += quantity
-            else:
-                self.player['portfolio'][self.selected_asset_ticker] = quantity
-            self.player['trades_today'] += 1
-            self.update_portfolio_value()
-            return True, f"Куплено {quantity} {asset['name']}"
-        else:
-            return False, "Недостаточно средств"
+        Args:
+            clock: Часы Pygame для ограничения частоты кадров
+            mode: Режим работы: FRAME_MODE_RESPONSIVE - постоянные FPS кадров
+                  в секунду, FRAME_MODE_POWER_SAVING - ожидание событий в простое
+            fps: Частота кадров при активности пользователя
+            idle_timeout: Максимальное время ожидания события в простое, мс
+            active_period: Время после последнего ввода, в течение которого
+                           сохраняется полная частота кадров, мс
+        """
+        if mode not in (FRAME_MODE_RESPONSIVE, FRAME_MODE_POWER_SAVING):
+            raise ValueError(f"Неизвестный режим планировщика кадров: {mode}")
+
+        self.clock = clock
+        self.mode = mode
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.active_period = active_period
+        self._last_activity = pygame.time.get_ticks()
+
+    def is_idle(self, current_time: int) -> bool:
+        """Проверяет, можно ли ожидать события вместо отрисовки кадров."""
+        return (
+                self.mode == FRAME_MODE_POWER_SAVING and
+                current_time - self._last_activity >= self.active_period
+        )
 
-    def get_portfolio_distribution(self) -> Tuple[Dict[str, float], float]:
+    def wait_for_events(
+            self,
+            wake_time: Optional[int] = None
+    ) -> List[pygame.event.Event]:
         """
-        Возвращает распределение портфеля.
+        Ожидает следующий кадр и возвращает накопившиеся события.
+
+        В простое цикл блокируется в pygame.event.wait до прихода события,
+        наступления wake_time или истечения idle_timeout.
+
+        Args:
+            wake_time: Момент (pygame.time.get_ticks), к которому нужно
+                       проснуться, например окончание показа сообщения
 
         Returns:
-            Кортеж (распределение, общая стоимость)
+            Список событий Pygame
         """
-        distribution = {}
-        total_value = 0
+        current_time = pygame.time.get_ticks()
+        if self.is_idle(current_time):
+            timeout = self.idle_timeout
+            if wake_time is not None:
+                timeout = max(1, min(timeout, wake_time - current_time))
+
+            event = pygame.event.wait(timeout)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+            # Сбрасываем часы, чтобы ожидание не учитывалось как долгий кадр
+            self.clock.tick()
+        else:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
 
-        for ticker, quantity in self.player['portfolio'].items():
-            asset = self.find_asset_by_ticker(ticker)
-            if asset:
-                value = asset['price'] * quantity
-                distribution[ticker] = value
-                total_value += value
+        if any(event.type in ACTIVITY_EVENTS for event in events):
+            self._last_activity = pygame.time.get_ticks()
+        return events
 
-        return distribution, total_value
 
 
 def initialize_game_objects(
         game_state: GameState
-) -> Tuple[Button, Button, Button, InputField, List[TabButton]]:
+) -> Tuple[Button, Button, Button, Button, InputField, List[TabButton]]:
     """
     Инициализирует игровые объекты.
 
@@ -1271,18 +1424,24 @@ def initialize_game_objects(
         "КУПИТЬ", BUTTON_COLOR, BUTTON_HOVER_COLOR
     )
 
+    sell_btn = Button(
+        710, 510, BUTTON_WIDTH_LARGE, 35,
+        "ПРОДАТЬ", BUTTON_COLOR, BUTTON_HOVER_COLOR
+    )
+
     quantity_input_field = InputField(
         690, 470, INPUT_FIELD_WIDTH, INPUT_FIELD_HEIGHT, "10"  # Выровнено по тексту "Количество"
     )
 
+    selected_type = game_state.selected_asset_type
     tab_buttons = [
-        TabButton(50, 160, 120, 40, "АКЦИИ", True),
-        TabButton(180, 160, 120, 40, "ОБЛИГАЦИИ"),
-        TabButton(310, 160, 120, 40, "ВКЛАДЫ")
+        TabButton(50, 180, 120, 40, "АКЦИИ", selected_type == 'акции'),
+        TabButton(180, 180, 120, 40, "ОБЛИГАЦИИ", selected_type == 'облигации'),
+        TabButton(310, 180, 120, 40, "ВКЛАДЫ", selected_type == 'вклады')
     ]
 
     return (
-        new_game_btn, next_week_btn, execute_trade_btn,
+        new_game_btn, next_week_btn, execute_trade_btn, sell_btn,
         quantity_input_field, tab_buttons
     )
 
@@ -1295,6 +1454,7 @@ def handle_user_input(
         new_game_btn: Button,
         next_week_btn: Button,
         execute_trade_btn: Button,
+        sell_btn: Button,
         quantity_input_field: InputField
 ) -> None:
     """
@@ -1307,13 +1467,14 @@ def handle_user_input(
         tab_buttons: Список вкладок
         new_game_btn: Кнопка новой игры
         next_week_btn: Кнопка следующей недели
-        execute_trade_btn: Кнопка выполнения сделки
+        execute_trade_btn: Кнопка покупки
+        sell_btn: Кнопка продажи
         quantity_input_field: Поле ввода количества
     """
     if event.type == pygame.MOUSEBUTTONDOWN:
         _handle_mouse_click(
             event, mouse_pos, game_state, tab_buttons,
-            new_game_btn, next_week_btn, execute_trade_btn
+            new_game_btn, next_week_btn, execute_trade_btn, sell_btn
         )
 
         quantity_input_field.handle_event(event)
@@ -1329,7 +1490,8 @@ def _handle_mouse_click(
         tab_buttons: List[TabButton],
         new_game_btn: Button,
         next_week_btn: Button,
-        execute_trade_btn: Button
+        execute_trade_btn: Button,
+        sell_btn: Button
 ) -> None:
     """
     Обрабатывает клик мыши.
@@ -1348,6 +1510,8 @@ def _handle_mouse_click(
 
     if new_game_btn.is_clicked(mouse_pos, event):
         game_state.reset_game()
+        # Брошенная игра не должна вернуться при следующем запуске
+        discard_autosave()
         next_week_btn.text = (
             f"СЛЕДУЮЩАЯ НЕДЕЛЯ ({game_state.current_week}/{game_state.total_weeks})"
         )
@@ -1359,6 +1523,8 @@ def _handle_mouse_click(
             not game_state.game_finished):
 
         if game_state.next_week():
+            if AUTOSAVE_PATH:
+                snapshot_writer.submit(game_state, AUTOSAVE_PATH)
             next_week_btn.text = (
                 f"СЛЕДУЮЩАЯ НЕДЕЛЯ ({game_state.current_week}/{game_state.total_weeks})"
             )
@@ -1370,50 +1536,71 @@ def _handle_mouse_click(
             game_state.message_type = "success"
             game_state.message_timer = current_time
 
-    if execute_trade_btn.is_clicked(mouse_pos, event):
-        game_state.quantity_input = game_state.quantity_input
-        success, msg = game_state.execute_trade()
-        game_state.message = msg
-        game_state.message_type = "success" if success else "error"
-        game_state.message_timer = current_time
+    for trade_btn, operation_type in (
+            (execute_trade_btn, 'buy'), (sell_btn, 'sell')
+    ):
+        if trade_btn.is_clicked(mouse_pos, event):
+            game_state.operation_type = operation_type
+            success, msg = game_state.execute_trade()
+            game_state.message = msg
+            game_state.message_type = "success" if success else "error"
+            game_state.message_timer = current_time
 
     # Выбор актива
-    y_pos = 210
-    for asset in ASSETS[game_state.selected_asset_type]:
-        card_rect = pygame.Rect(50, y_pos, CARD_WIDTH, CARD_HEIGHT)
-        if card_rect.collidepoint(mouse_pos):
-            game_state.selected_asset_ticker = asset['ticker']
-            break
-        y_pos += CARD_SPACING
+    card = asset_card_pool.card_at(game_state.selected_asset_type, mouse_pos)
+    if card:
+        game_state.selected_asset_ticker = card.asset['ticker']
 
 
-def main() -> None:
-    """Основная функция игры."""
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Основная функция игры.
+
+    Args:
+        argv: Аргументы командной строки (по умолчанию sys.argv[1:]);
+              RESUME_FLAG продолжает игру из автосохранения
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    init_ui()
     try:
         game_state = GameState()
+        if RESUME_FLAG in argv:
+            restore_autosave(game_state)
+        asset_card_pool.bind(game_state.market)
         game_objects = initialize_game_objects(game_state)
-        new_game_btn, next_week_btn, execute_trade_btn = game_objects[:3]
-        quantity_input_field, tab_buttons = game_objects[3:]
+        new_game_btn, next_week_btn, execute_trade_btn, sell_btn = game_objects[:4]
+        quantity_input_field, tab_buttons = game_objects[4:]
+
+        main_screen = _create_main_screen_renderer(
+            game_state, new_game_btn, next_week_btn, execute_trade_btn,
+            sell_btn, quantity_input_field, tab_buttons
+        )
+        final_screen = _create_final_screen_renderer(game_state, new_game_btn)
+        active_screen = None
+        scheduler = FrameScheduler(clock, FRAME_SCHEDULER_MODE)
 
         running = True
         while running:
+            events = scheduler.wait_for_events(_next_wake_time(game_state))
             current_time = pygame.time.get_ticks()
             mouse_pos = pygame.mouse.get_pos()
 
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 else:
                     handle_user_input(
                         event, mouse_pos, game_state, tab_buttons,
                         new_game_btn, next_week_btn, execute_trade_btn,
-                        quantity_input_field
+                        sell_btn, quantity_input_field
                     )
 
             # Обновление состояний
             new_game_btn.check_hover(mouse_pos)
             next_week_btn.check_hover(mouse_pos)
             execute_trade_btn.check_hover(mouse_pos)
+            sell_btn.check_hover(mouse_pos)
             quantity_input_field.check_hover(mouse_pos)
 
             for tab in tab_buttons:
@@ -1421,67 +1608,235 @@ def main() -> None:
 
             game_state.quantity_input = quantity_input_field.text
             game_state.update_portfolio_value()
+            next_week_btn.enabled = not game_state.game_finished
 
-            # Отрисовка
-            if game_state.game_finished:
-                _draw_final_screen(game_state, new_game_btn)
-            else:
-                _draw_main_screen(
-                    game_state, new_game_btn, next_week_btn,
-                    execute_trade_btn, quantity_input_field,
-                    tab_buttons, current_time
-                )
+            # Отрисовка: обновляются только изменившиеся области экрана
+            renderer = final_screen if game_state.game_finished else main_screen
+            if renderer is not active_screen or not DIRTY_RECT_RENDERING:
+                renderer.invalidate()
+                active_screen = renderer
 
-            pygame.display.flip()
-            clock.tick(FPS)
+            dirty_rects = renderer.render()
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
 
     except Exception as e:
         print(f"Критическая ошибка в игре: {e}")
     finally:
+        snapshot_writer.close()
         pygame.quit()
         sys.exit()
 
 
-def _draw_final_screen(game_state: GameState, new_game_btn: Button) -> None:
-    """Отрисовывает финальный экран игры."""
-    screen.fill(BACKGROUND_COLOR)
-    draw_vtb_header(screen, f"Неделя: {game_state.current_week}/{game_state.total_weeks}")
+def restore_autosave(game_state: GameState) -> bool:
+    """
+    Продолжает незавершенную игру из файла автосохранения.
 
-    final_text = f"Финальный результат: {format_currency(game_state.player['total_value'])}"
-    draw_text(
-        screen, final_text, large_font, VTB_DARK_BLUE,
-        SCREEN_WIDTH // 2, 200, centered=True
-    )
+    Args:
+        game_state: Состояние игры, в которое загружается снимок
+
+    Returns:
+        True если игра восстановлена
+    """
+    if not AUTOSAVE_PATH or not os.path.exists(AUTOSAVE_PATH):
+        return False
+    try:
+        read_snapshot(AUTOSAVE_PATH, game_state)
+    except (OSError, ValueError) as e:
+        print(f"Не удалось загрузить автосохранение: {e}")
+        game_state.reset_game()
+        return False
+    if game_state.game_finished:
+        game_state.reset_game()
+        return False
+    return True
+
+
+def discard_autosave() -> None:
+    """Удаляет автосохранение, дождавшись записей в фоновом потоке."""
+    if not AUTOSAVE_PATH:
+        return
+    snapshot_writer.flush()
+    try:
+        os.remove(AUTOSAVE_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Не удалось удалить автосохранение: {e}")
 
-    new_game_btn.draw(screen)
 
+def _next_wake_time(game_state: GameState) -> Optional[int]:
+    """Возвращает момент, когда скроется текущее сообщение, если оно показано."""
+    hide_time = game_state.message_timer + MESSAGE_DISPLAY_TIME
+    if pygame.time.get_ticks() < hide_time:
+        return hide_time
+    return None
 
-def _draw_main_screen(
+
+def _create_final_screen_renderer(
+        game_state: GameState,
+        new_game_btn: Button
+) -> DirtyRectRenderer:
+    """Создает рендерер финального экрана игры."""
+    renderer = DirtyRectRenderer(screen)
+    renderer.add_panel(
+        vtb_header.rect,
+        lambda: draw_vtb_header(screen, _week_text(game_state)),
+        lambda: (_week_text(game_state), datetime.now().date())
+    )
+    renderer.add_panel(
+        pygame.Rect(0, 150, SCREEN_WIDTH, 100),
+        lambda: _draw_final_result(game_state),
+        lambda: game_state.player['total_value']
+    )
+    renderer.add_panel(
+        new_game_btn.rect,
+        lambda: new_game_btn.draw(screen),
+        lambda: _widget_state(new_game_btn)
+    )
+    return renderer
+
+
+def _create_main_screen_renderer(
         game_state: GameState,
         new_game_btn: Button,
         next_week_btn: Button,
         execute_trade_btn: Button,
+        sell_btn: Button,
         quantity_input_field: InputField,
-        tab_buttons: List[TabButton],
-        current_time: int
-) -> None:
-    """Отрисовывает основной игровой экран."""
-    screen.fill(BACKGROUND_COLOR)
-    week_text = f"Неделя: {game_state.current_week}/{game_state.total_weeks}"
-    draw_vtb_header(screen, week_text)
+        tab_buttons: List[TabButton]
+) -> DirtyRectRenderer:
+    """Создает рендерер основного игрового экрана."""
+    renderer = DirtyRectRenderer(screen)
+    renderer.add_panel(
+        vtb_header.rect,
+        lambda: draw_vtb_header(screen, _week_text(game_state)),
+        lambda: (_week_text(game_state), datetime.now().date())
+    )
+    renderer.add_panel(
+        pygame.Rect(50, 110, 800, 60),
+        lambda: _draw_portfolio_info(game_state),
+        lambda: (game_state.player['total_value'], game_state.player['balance'])
+    )
+    renderer.add_panel(
+        tab_buttons[0].rect.unionall([tab.rect for tab in tab_buttons]),
+        lambda: _draw_tabs(tab_buttons),
+        lambda: tuple(_widget_state(tab) for tab in tab_buttons)
+    )
+    max_cards = max(len(assets) for assets in game_state.market.assets.values())
+    renderer.add_panel(
+        pygame.Rect(
+            CARDS_LEFT, CARDS_TOP, CARD_WIDTH,
+            CARD_SPACING * (max_cards - 1) + CARD_HEIGHT
+        ),
+        lambda: _draw_asset_cards(game_state),
+        lambda: _asset_cards_state(game_state)
+    )
+    renderer.add_panel(
+        pygame.Rect(570, 210, 580, 150),
+        lambda: _draw_portfolio_panel(game_state),
+        lambda: _portfolio_panel_state(game_state)
+    )
+    renderer.add_panel(
+        pygame.Rect(570, 370, 580, 200),
+        lambda: _draw_trading_panel(
+            game_state, quantity_input_field, execute_trade_btn, sell_btn
+        ),
+        lambda: _trading_panel_state(
+            game_state, quantity_input_field, execute_trade_btn, sell_btn
+        )
+    )
+    renderer.add_panel(
+        pygame.Rect(570, 580, 580, 150),
+        lambda: _draw_news_window(game_state),
+        lambda: tuple(game_state.market_news[-3:])
+    )
+    for button in (new_game_btn, next_week_btn):
+        renderer.add_panel(
+            button.rect,
+            lambda button=button: button.draw(screen),
+            lambda button=button: _widget_state(button)
+        )
+    renderer.add_panel(
+        pygame.Rect(SCREEN_WIDTH // 2 - 200, 170, 400, 40),
+        lambda: _draw_message(game_state, pygame.time.get_ticks()),
+        lambda: _message_state(game_state, pygame.time.get_ticks())
+    )
+    return renderer
 
-    _draw_portfolio_info(game_state)
-    _draw_tabs(tab_buttons)
-    _draw_asset_cards(game_state)
-    _draw_portfolio_panel(game_state)
-    _draw_trading_panel(game_state, quantity_input_field, execute_trade_btn)
-    _draw_news_window(game_state)  # Перемещено после торговой панели
 
-    new_game_btn.draw(screen)
-    next_week_btn.enabled = not game_state.game_finished
-    next_week_btn.draw(screen)
+def _week_text(game_state: GameState) -> str:
+    """Возвращает текст текущей недели для заголовка."""
+    return f"Неделя: {game_state.current_week}/{game_state.total_weeks}"
 
-    _draw_message(game_state, current_time)
+
+def _widget_state(widget: Any) -> Tuple[Any, ...]:
+    """Возвращает данные, от которых зависит вид кнопки, вкладки или поля ввода."""
+    return (
+        getattr(widget, 'text', None),
+        getattr(widget, 'is_hovered', False),
+        getattr(widget, 'enabled', True),
+        getattr(widget, 'active', False),
+        getattr(widget, 'is_active', False)
+    )
+
+
+def _asset_cards_state(game_state: GameState) -> Tuple[Any, ...]:
+    """Возвращает данные, от которых зависит вид карточек активов."""
+    portfolio = game_state.player['portfolio']
+    assets = game_state.market.assets.get(game_state.selected_asset_type, [])
+    return (
+        game_state.selected_asset_type,
+        game_state.selected_asset_ticker,
+        tuple(
+            (asset['price'], portfolio.get(asset['ticker'], 0)) for asset in assets
+        )
+    )
+
+
+def _portfolio_panel_state(game_state: GameState) -> Tuple[Any, ...]:
+    """Возвращает данные, от которых зависит вид панели портфеля."""
+    return (
+        game_state.player['trades_today'],
+        game_state.player['balance'],
+        game_state.valuation_version
+    )
+
+
+def _trading_panel_state(
+        game_state: GameState,
+        quantity_input_field: InputField,
+        execute_trade_btn: Button,
+        sell_btn: Button
+) -> Tuple[Any, ...]:
+    """Возвращает данные, от которых зависит вид панели торговли."""
+    asset = None
+    if game_state.selected_asset_ticker:
+        asset = game_state.find_asset_by_ticker(game_state.selected_asset_ticker)
+    return (
+        game_state.selected_asset_ticker,
+        asset['price'] if asset else None,
+        game_state.player['portfolio'].get(game_state.selected_asset_ticker, 0),
+        _widget_state(quantity_input_field),
+        _widget_state(execute_trade_btn),
+        _widget_state(sell_btn)
+    )
+
+
+def _message_state(game_state: GameState, current_time: int) -> Tuple[Any, ...]:
+    """Возвращает данные, от которых зависит вид сообщения."""
+    if current_time - game_state.message_timer >= MESSAGE_DISPLAY_TIME:
+        return ()
+    return game_state.message, game_state.message_type, game_state.message_timer
+
+
+def _draw_final_result(game_state: GameState) -> None:
+    """Отрисовывает финальный результат игры."""
+    final_text = f"Финальный результат: {format_currency(game_state.player['total_value'])}"
+    draw_text(
+        screen, final_text, large_font, VTB_DARK_BLUE,
+        SCREEN_WIDTH // 2, 200, centered=True
+    )
 
 
 def _draw_portfolio_info(game_state: GameState) -> None:
@@ -1526,22 +1881,17 @@ def _draw_news_window(game_state: GameState) -> None:
     pygame.draw.rect(screen, VTB_LIGHT_BLUE, header_rect, border_radius=8)
     pygame.draw.rect(screen, VTB_BORDER_GRAY, header_rect, 1, border_radius=8)
 
-    # Загрузка и отрисовка вашего изображения как иконки в заголовке
-    try:
-        # Используем английское имя файла
-        news_icon = pygame.image.load("news_icon.png")
-        # Масштабируем до маленького размера для заголовка
-        icon_size = (20, 20)  # Маленький размер для заголовка
-        news_icon = pygame.transform.smoothscale(news_icon, icon_size)
+    # Иконка новостей берётся из кэша изображений
+    news_icon = image_cache.get(NEWS_ICON_PATH, NEWS_ICON_SIZE)
+    if news_icon is not None:
         # Позиционируем иконку ближе к тексту (сдвигаем ближе к центру)
         icon_rect = news_icon.get_rect(midleft=(window_rect.x + 200, window_rect.y + 15))
         screen.blit(news_icon, icon_rect)
 
         # Текст заголовка сдвигаем правее иконки
         header_text_x = window_rect.centerx + 20
-    except (pygame.error, FileNotFoundError) as e:
-        print(f"Ошибка загрузки иконки новостей: {e}")
-        # Если изображение не найдено, используем эмодзи как запасной вариант
+    else:
+        # Если изображение не найдено, центрируем заголовок
         header_text_x = window_rect.centerx
 
     draw_text(
@@ -1572,24 +1922,16 @@ def _draw_news_window(game_state: GameState) -> None:
 def _draw_tabs(tab_buttons: List[TabButton]) -> None:
     """Отрисовывает вкладки."""
     for tab in tab_buttons:
-        tab.rect.y = 180
         tab.draw(screen)
 
 
 def _draw_asset_cards(game_state: GameState) -> None:
     """Отрисовывает карточки активов."""
-    y_pos = 210
-    for asset in ASSETS[game_state.selected_asset_type]:
-        portfolio_qty = game_state.player['portfolio'].get(asset['ticker'], 0)
-
-        if 'VTB' in asset['ticker']:
-            card = VTBAssetCard(asset, 50, y_pos, CARD_WIDTH, CARD_HEIGHT)
-        else:
-            card = AssetCard(asset, 50, y_pos, CARD_WIDTH, CARD_HEIGHT)
-
-        card.is_selected = (asset['ticker'] == game_state.selected_asset_ticker)
+    for card in asset_card_pool.cards(game_state.selected_asset_type):
+        ticker = card.asset['ticker']
+        portfolio_qty = game_state.player['portfolio'].get(ticker, 0)
+        card.is_selected = (ticker == game_state.selected_asset_ticker)
         card.draw(screen, portfolio_qty)
-        y_pos += CARD_SPACING
 
 
 def _draw_portfolio_panel(game_state: GameState) -> None:
@@ -1635,7 +1977,8 @@ def _draw_portfolio_panel(game_state: GameState) -> None:
 def _draw_trading_panel(
         game_state: GameState,
         quantity_input_field: InputField,
-        execute_trade_btn: Button
+        execute_trade_btn: Button,
+        sell_btn: Button
 ) -> None:
     """Отрисовывает панель торговли."""
     trade_card = draw_card(screen, 570, 370, 580, 200)
@@ -1650,6 +1993,11 @@ def _draw_trading_panel(
                 screen, f"Актив: {asset['name']}", normal_font,
                 VTB_DARK_BLUE, 590, 430
             )
+            held = game_state.player['portfolio'].get(asset['ticker'], 0)
+            draw_text(
+                screen, f"В портфеле: {held} шт.", normal_font,
+                VTB_DARK_BLUE, 850, 430
+            )
 
     # Выравнивание поля ввода с текстом "Количество"
     quantity_text_y = 470
@@ -1680,6 +2028,10 @@ def _draw_trading_panel(
     execute_trade_btn.rect.y = 510  # Опущена ниже
     execute_trade_btn.draw(screen)
 
+    sell_btn.rect.x = 710
+    sell_btn.rect.y = 510
+    sell_btn.draw(screen)
+
 
 def _draw_message(game_state: GameState, current_time: int) -> None:
     """Отрисовывает сообщение для пользователя."""
@@ -0,0 +1,210 @@
+"""
+Журнал действий игры и воспроизведение по нему.
+
+Журнал - это файл JSON-строк, в который GameState дописывает все действия,
+меняющие состояние: начало игры, сделки, переходы недель, рыночные события,
+контрольные суммы цен и начисления. Запись буферизуется.
+
+Игра детерминирована зерном, поэтому для восстановления достаточно повторить
+действия игрока ('game', 'trade', 'order', 'cancel', 'week', 'tick',
+'finish').
+Остальные записи ('event', 'prices', 'accrual', а также сделки по сработавшим
+лимитным и стоп-поручениям - 'trade' с полем 'order') служат для аудита: при
+воспроизведении они сверяются с тем, что получается заново.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from simulation_core import TICKS_PER_WEEK, GameState
+
+JOURNAL_VERSION = 1
+# Размер буфера файла журнала
+JOURNAL_BUFFER_SIZE = 64 * 1024
+# Записи, которые воспроизводятся действием над GameState
+ACTION_RECORDS = ('game', 'trade', 'order', 'cancel', 'week', 'tick', 'finish')
+
+
+class Journal:
+    """Журнал действий игры с буферизованной записью JSON-строк."""
+
+    def __init__(self, stream: TextIO):
+        """
+        Инициализация журнала.
+
+        Args:
+            stream: Текстовый поток для дозаписи
+        """
+        self.stream = stream
+
+    def record(self, record_type: str, **fields: Any) -> None:
+        """
+        Дописывает запись в журнал.
+
+        Args:
+            record_type: Тип записи
+            **fields: Поля записи
+        """
+        record = {'type': record_type, **fields}
+        if record_type == 'game':
+            record['version'] = JOURNAL_VERSION
+        self.stream.write(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        )
+        self.stream.write('\n')
+
+    def flush(self) -> None:
+        """Сбрасывает буфер на диск."""
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Сбрасывает буфер и закрывает поток."""
+        self.stream.close()
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def open_journal(path: str) -> Journal:
+    """
+    Открывает файл журнала для дозаписи.
+
+    Args:
+        path: Путь к файлу журнала
+
+    Returns:
+        Журнал, дописывающий в конец файла
+    """
+    return Journal(open(path, 'a', encoding='utf-8', buffering=JOURNAL_BUFFER_SIZE))
+
+
+def read_journal(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Читает записи журнала.
+
+    Последняя строка, оборванная при аварийном завершении, пропускается.
+
+    Args:
+        lines: Строки журнала (например, открытый файл)
+
+    Yields:
+        Записи журнала
+
+    Raises:
+        ValueError: Если повреждена строка в середине журнала
+    """
+    pending = None
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if pending is not None:
+            raise ValueError(f"Журнал поврежден в строке {pending}")
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            pending = number
+
+
+class _RecordingJournal:
+    """Журнал, собирающий записи в список (для сверки при воспроизведении)."""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def record(self, record_type: str, **fields: Any) -> None:
+        record = {'type': record_type, **fields}
+        if record_type == 'game':
+            record['version'] = JOURNAL_VERSION
+        self.records.append(record)
+
+
+def replay_journal(
+        records: Iterable[Dict[str, Any]],
+        game_state: Optional[GameState] = None,
+        verify: bool = True
+) -> GameState:
+    """
+    Восстанавливает состояние игры, повторяя действия из журнала.
+
+    Args:
+        records: Записи журнала (например, из read_journal)
+        game_state: Состояние, в котором повторяются действия (движок цен
+                    должен совпадать с исходной игрой); по умолчанию
+                    создается новое
+        verify: Сверять ли каждую запись журнала с полученной заново
+
+    Returns:
+        Восстановленное состояние игры (без подключенного журнала)
+
+    Raises:
+        ValueError: Если журнал не начинается с игры, содержит неизвестную
+                    запись или расходится с воспроизведением
+    """
+    if game_state is None:
+        game_state = GameState()
+    recorder = _RecordingJournal()
+    game_state.journal = recorder if verify else None
+    replayed = 0
+    started = False
+
+    try:
+        for position, record in enumerate(records):
+            kind = record.get('type')
+            # Сделка по сработавшему поручению повторяется сама при изменении
+            # цены и только сверяется
+            triggered_fill = kind == 'trade' and 'order' in record
+            if kind in ACTION_RECORDS and not triggered_fill:
+                if kind != 'game' and not started:
+                    raise ValueError("Журнал должен начинаться с записи 'game'")
+                _apply_action(game_state, record)
+                started = True
+            elif kind not in ('event', 'prices', 'accrual', 'trade'):
+                raise ValueError(f"Неизвестная запись журнала: {kind}")
+
+            if verify:
+                if (replayed >= len(recorder.records) or
+                        recorder.records[replayed] != record):
+                    raise ValueError(
+                        f"Расхождение при воспроизведении в записи {position + 1}: "
+                        f"{record}"
+                    )
+            replayed += 1
+    finally:
+        game_state.journal = None
+
+    return game_state
+
+
+def _apply_action(game_state: GameState, record: Dict[str, Any]) -> None:
+    """Повторяет одно действие игрока."""
+    kind = record['type']
+    if kind == 'game':
+        if record.get('version') != JOURNAL_VERSION:
+            raise ValueError(
+                f"Неподдерживаемая версия журнала: {record.get('version')}"
+            )
+        game_state.ticks_per_week = record.get('ticks', TICKS_PER_WEEK)
+        game_state.reset_game(record['seed'])
+    elif kind == 'trade':
+        game_state.operation_type = record.get('side', 'buy')
+        game_state.selected_asset_ticker = record['ticker']
+        game_state.quantity_input = str(record['quantity'])
+        success, message = game_state.execute_trade()
+        if not success:
+            raise ValueError(f"Сделка из журнала не выполнена: {message}")
+    elif kind == 'order':
+        order = game_state.place_order(
+            record['side'], record['ticker'], record['quantity'],
+            record['allow_partial'], record['kind'], record['trigger_price']
+        )
+        if order.id != record['id']:
+            raise ValueError(f"Поручение из журнала не принято: {order.message}")
+    elif kind == 'cancel':
+        if not game_state.cancel_order(record['id']):
+            raise ValueError(f"Поручение {record['id']} из журнала не найдено")
+    else:
+        # 'week' начинает неделю первым тиком, 'tick' - следующие тики
+        game_state.next_tick()
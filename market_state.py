@@ -0,0 +1,587 @@
+"""
+Рыночное состояние игровой сессии.
+
+Статические параметры активов хранятся в неизменяемом каталоге, общем для
+всех сессий процесса, по схеме "структура массивов": тикер, название и
+логотип - кортежами строк (запись AssetRecord со __slots__ собирается по
+запросу), числовые поля - столбцами float64, повторяющиеся значения (риск,
+цвет) - столбцами кодов uint16 со словарем значений, индекс тикеров -
+отсортированным кортежем с массивом позиций, без объекта int на актив.
+Каждая сессия владеет только массивами цен и изменений, которые до первой
+записи ссылаются на массивы каталога (копирование при записи), поэтому
+новая сессия почти не занимает памяти. Привычный доступ вида
+asset['price'] дает представление AssetView.
+"""
+
+import math
+import zlib
+from bisect import bisect_left
+from collections.abc import Mapping as MappingABC, MutableMapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Текстовые поля актива: кортежи строк, отсутствующее поле - None
+TEXT_FIELDS = ('ticker', 'name', 'logo')
+# Числовые поля актива: столбцы float64, отсутствующее поле - NaN
+NUMERIC_FIELDS = ('base_price', 'dividend', 'yield', 'volatility')
+# Поля с небольшим набором значений: столбцы кодов, код 0 - поле отсутствует
+CATEGORY_FIELDS = ('risk', 'color', 'logo_file')
+# Поля сессии: хранятся в массивах MarketState
+SESSION_FIELDS = ('price', 'change')
+# Порядок полей актива при обходе представления
+FIELD_ORDER = (
+    'name', 'ticker', 'price', 'base_price', 'change', 'dividend', 'yield',
+    'risk', 'volatility', 'color', 'logo', 'logo_file'
+)
+# Сколько недавно запрошенных тикеров индекс помнит без двоичного поиска
+RECENT_TICKERS = 256
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    """Запрещает запись в массив и возвращает его."""
+    values.flags.writeable = False
+    return values
+
+
+class AssetRecord:
+    """
+    Неизменяемые текстовые метаданные актива.
+
+    Поля хранятся в __slots__ без словаря экземпляра; отсутствующее поле
+    равно None, нестандартные поля источника лежат в extra.
+    """
+
+    __slots__ = ('ticker', 'name', 'logo', 'extra')
+
+    def __init__(
+            self,
+            ticker: str,
+            name: Optional[str] = None,
+            logo: Optional[str] = None,
+            extra: Optional[Mapping[str, Any]] = None
+    ):
+        """
+        Инициализация записи.
+
+        Args:
+            ticker: Тикер актива
+            name: Название
+            logo: Ключ логотипа
+            extra: Прочие поля актива (только для чтения)
+        """
+        object.__setattr__(self, 'ticker', ticker)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'logo', logo)
+        object.__setattr__(self, 'extra', extra)
+
+    def __setattr__(self, field: str, value: Any) -> None:
+        raise AttributeError("Запись каталога активов неизменяема")
+
+    def __reduce__(self):
+        return AssetRecord, (self.ticker, self.name, self.logo, self.extra)
+
+    def __repr__(self) -> str:
+        return f"AssetRecord({self.ticker!r}, {self.name!r})"
+
+
+class TickerIndex(MappingABC):
+    """
+    Позиции активов по тикеру.
+
+    Словарь тикеров держал бы объект int на каждую позицию; индекс хранит
+    тикеры отсортированным кортежем, а позиции - массивом, и ищет тикер
+    двоичным поиском. Позиции недавно запрошенных тикеров (обычно это
+    активы портфелей) запоминаются в небольшом словаре, поэтому повторный
+    поиск стоит как обращение к словарю. Обход идет в порядке позиций.
+    """
+
+    __slots__ = ('_tickers', '_sorted', '_order', '_recent')
+
+    def __init__(self, tickers: Tuple[str, ...]):
+        """
+        Инициализация индекса.
+
+        Args:
+            tickers: Тикеры в порядке позиций
+        """
+        order = sorted(range(len(tickers)), key=tickers.__getitem__)
+        self._tickers = tickers
+        self._sorted = tuple(tickers[position] for position in order)
+        self._order = _read_only(np.array(order, dtype=np.intp))
+        self._recent: Dict[str, int] = {}
+
+    def _find(self, ticker: str) -> Optional[int]:
+        """Ищет позицию тикера двоичным поиском и запоминает ее."""
+        try:
+            index = bisect_left(self._sorted, ticker)
+        except TypeError:
+            return None
+        if index == len(self._sorted) or self._sorted[index] != ticker:
+            return None
+        if len(self._recent) >= RECENT_TICKERS:
+            self._recent.clear()
+        position = self._recent[ticker] = int(self._order[index])
+        return position
+
+    def __getitem__(self, ticker: str) -> int:
+        position = self._recent.get(ticker)
+        if position is None:
+            position = self._find(ticker)
+            if position is None:
+                raise KeyError(ticker)
+        return position
+
+    def get(self, ticker: str, default: Any = None) -> Any:
+        position = self._recent.get(ticker)
+        if position is None:
+            position = self._find(ticker)
+            if position is None:
+                return default
+        return position
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tickers)
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+    def __reduce__(self):
+        return TickerIndex, (self._tickers,)
+
+    def __repr__(self) -> str:
+        return f"TickerIndex({len(self._tickers)} активов)"
+
+
+class AssetCatalog:
+    """Неизменяемый снимок каталога активов, общий для всех сессий."""
+
+    def __init__(self, assets: Mapping[str, List[Mapping[str, Any]]]):
+        """
+        Инициализация каталога.
+
+        Каталог не хранит ссылок на исходные словари активов, после сборки
+        они не нужны.
+
+        Args:
+            assets: Активы по категориям в формате ASSETS
+        """
+        self._compile(
+            (asset_class, asset)
+            for asset_class, group in assets.items() for asset in group
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, Mapping[str, Any]]]) -> 'AssetCatalog':
+        """
+        Собирает каталог из потока пар (категория, актив).
+
+        Словари активов разбираются по одному и не накапливаются, поэтому
+        каталог из тысяч инструментов можно строить прямо при чтении файла.
+
+        Args:
+            rows: Пары (категория, актив в формате ASSETS)
+        """
+        catalog = cls.__new__(cls)
+        catalog._compile(rows)
+        return catalog
+
+    @classmethod
+    def from_columns(
+            cls,
+            texts: Mapping[str, Iterable[Optional[str]]],
+            extras: Mapping[int, Mapping[str, Any]],
+            class_positions: Mapping[str, Iterable[int]],
+            columns: Mapping[str, Any],
+            codes: Mapping[str, Any],
+            categories: Mapping[str, Iterable[Any]]
+    ) -> 'AssetCatalog':
+        """
+        Собирает каталог из готовых столбцов (например, из кэша) без
+        словарей активов.
+
+        Args:
+            texts: Столбцы TEXT_FIELDS в порядке позиций
+            extras: Прочие поля активов по позиции (только у тех активов,
+                    где они есть)
+            class_positions: Позиции активов по категориям
+            columns: Столбцы NUMERIC_FIELDS (массивы становятся только
+                     для чтения)
+            codes: Столбцы кодов CATEGORY_FIELDS
+            categories: Значения CATEGORY_FIELDS по коду, код 0 - None
+
+        Raises:
+            ValueError: Если столбцы не согласованы между собой или тикеры
+                        повторяются
+        """
+        try:
+            catalog_texts = {field: tuple(texts[field]) for field in TEXT_FIELDS}
+            catalog_columns = {
+                field: np.asarray(columns[field], dtype=np.float64)
+                for field in NUMERIC_FIELDS
+            }
+            catalog_codes = {
+                field: np.asarray(codes[field], dtype=np.uint16)
+                for field in CATEGORY_FIELDS
+            }
+            catalog_categories = {
+                field: tuple(categories[field]) for field in CATEGORY_FIELDS
+            }
+        except KeyError as e:
+            raise ValueError(f"Столбцы каталога не согласованы: {e}") from e
+        for field, values in catalog_codes.items():
+            if len(values) and values.max() >= len(catalog_categories[field]):
+                raise ValueError(f"Неизвестный код значения поля {field}")
+
+        catalog = cls.__new__(cls)
+        catalog._assign(
+            catalog_texts, extras, class_positions,
+            catalog_columns, catalog_codes, catalog_categories
+        )
+        return catalog
+
+    def _compile(self, rows: Iterable[Tuple[str, Mapping[str, Any]]]) -> None:
+        """Собирает столбцы каталога из пар (категория, актив)."""
+        texts: Dict[str, List[Optional[str]]] = {field: [] for field in TEXT_FIELDS}
+        tickers = texts['ticker']
+        extras: Dict[int, Mapping[str, Any]] = {}
+        columns: Dict[str, List[float]] = {field: [] for field in NUMERIC_FIELDS}
+        codes: Dict[str, List[int]] = {field: [] for field in CATEGORY_FIELDS}
+        # Код значения в столбце: номер в словаре значений поля
+        value_codes: Dict[str, Dict[Any, int]] = {
+            field: {} for field in CATEGORY_FIELDS
+        }
+        class_positions: Dict[str, List[int]] = {}
+        for asset_class, asset in rows:
+            position = len(tickers)
+            class_positions.setdefault(asset_class, []).append(position)
+            ticker = asset['ticker']
+            logo = asset.get('logo')
+            tickers.append(ticker)
+            texts['name'].append(asset.get('name'))
+            # Ключ логотипа обычно совпадает с тикером
+            texts['logo'].append(ticker if logo == ticker else logo)
+            extra = {
+                key: value for key, value in asset.items()
+                if key not in FIELD_ORDER
+            }
+            if extra:
+                extras[position] = MappingProxyType(extra)
+            columns['base_price'].append(asset['base_price'])
+            for field in NUMERIC_FIELDS[1:]:
+                columns[field].append(asset.get(field, math.nan))
+            for field in CATEGORY_FIELDS:
+                codes[field].append(
+                    self._value_code(value_codes[field], asset.get(field))
+                )
+
+        self._assign(
+            texts, extras, class_positions,
+            {
+                field: np.array(values, dtype=np.float64)
+                for field, values in columns.items()
+            },
+            {
+                field: np.array(values, dtype=np.uint16)
+                for field, values in codes.items()
+            },
+            {
+                field: (None,) + tuple(value_codes[field])
+                for field in CATEGORY_FIELDS
+            }
+        )
+
+    def _assign(
+            self,
+            texts: Mapping[str, Iterable[Optional[str]]],
+            extras: Mapping[int, Mapping[str, Any]],
+            class_positions: Mapping[str, Iterable[int]],
+            columns: Dict[str, np.ndarray],
+            codes: Dict[str, np.ndarray],
+            categories: Dict[str, Tuple[Any, ...]]
+    ) -> None:
+        """Заполняет атрибуты каталога из собранных столбцов."""
+        self.texts = MappingProxyType({
+            field: tuple(values) for field, values in texts.items()
+        })
+        self.tickers: Tuple[str, ...] = self.texts['ticker']
+        self.names: Tuple[Optional[str], ...] = self.texts['name']
+        self.logos: Tuple[Optional[str], ...] = self.texts['logo']
+        size = len(self.tickers)
+        for field, values in (
+                list(self.texts.items()) + list(columns.items()) + list(codes.items())
+        ):
+            if len(values) != size:
+                raise ValueError(f"Размер столбца {field} не совпадает с каталогом")
+        if len(set(self.tickers)) != size:
+            raise ValueError("Тикеры активов каталога повторяются")
+
+        self.extras: Mapping[int, Mapping[str, Any]] = MappingProxyType(dict(extras))
+        self.class_positions = MappingProxyType({
+            asset_class: _read_only(np.array(positions, dtype=np.intp))
+            for asset_class, positions in class_positions.items()
+        })
+        for asset_class, positions in self.class_positions.items():
+            if len(positions) and (positions.min() < 0 or positions.max() >= size):
+                raise ValueError(f"Позиции категории {asset_class} вне каталога")
+        self.positions = TickerIndex(self.tickers)
+        self.columns = MappingProxyType({
+            field: _read_only(values) for field, values in columns.items()
+        })
+        self.codes = MappingProxyType({
+            field: _read_only(values) for field, values in codes.items()
+        })
+        # Значения полей по коду; код 0 означает, что поля у актива нет
+        self.categories: Mapping[str, Tuple[Any, ...]] = MappingProxyType(categories)
+        self.base_prices = self.columns['base_price']
+        volatilities = self.columns['volatility']
+        if np.isnan(volatilities).any():
+            volatilities = _read_only(np.nan_to_num(volatilities))
+        self.volatilities = volatilities
+        # Позиции активов, цены которых меняются каждую неделю
+        self.moving_positions = _read_only(np.flatnonzero(self.volatilities > 0))
+        # Нулевые изменения без выделения памяти под каждый актив
+        self.zero_changes = np.broadcast_to(np.zeros(1), size)
+        # Отпечаток состава каталога для проверки сохраненных данных
+        self.fingerprint = zlib.crc32(
+            '\n'.join(self.tickers).encode('utf-8')
+        )
+
+    @staticmethod
+    def _value_code(value_codes: Dict[Any, int], value: Any) -> int:
+        """Возвращает код значения поля, добавляя новое значение в словарь."""
+        if value is None:
+            return 0
+        if isinstance(value, list):
+            value = tuple(value)
+        code = value_codes.get(value)
+        if code is None:
+            code = value_codes[value] = len(value_codes) + 1
+            if code > np.iinfo(np.uint16).max:
+                raise ValueError("Слишком много различных значений поля актива")
+        return code
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def record(self, position: int) -> AssetRecord:
+        """
+        Возвращает текстовые метаданные актива одной записью.
+
+        Args:
+            position: Позиция актива в каталоге
+        """
+        return AssetRecord(
+            self.tickers[position], self.names[position], self.logos[position],
+            self.extras.get(position)
+        )
+
+    def value(self, position: int, key: str) -> Any:
+        """
+        Возвращает статическое поле актива.
+
+        Args:
+            position: Позиция актива в каталоге
+            key: Поле в формате ASSETS
+
+        Raises:
+            KeyError: Если у актива нет такого поля
+        """
+        column = self.columns.get(key)
+        if column is not None:
+            value = float(column[position])
+            if math.isnan(value):
+                raise KeyError(key)
+            return value
+        codes = self.codes.get(key)
+        if codes is not None:
+            value = self.categories[key][codes[position]]
+        elif key in self.texts:
+            value = self.texts[key][position]
+        else:
+            extra = self.extras.get(position)
+            value = None if extra is None else extra.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def fields(self, position: int) -> List[str]:
+        """Возвращает поля актива (включая поля сессии) в порядке ASSETS."""
+        fields = []
+        for field in FIELD_ORDER:
+            if field in self.columns:
+                present = not math.isnan(self.columns[field][position])
+            elif field in self.codes:
+                present = self.codes[field][position] != 0
+            elif field in SESSION_FIELDS:
+                present = True
+            else:
+                present = self.texts[field][position] is not None
+            if present:
+                fields.append(field)
+        extra = self.extras.get(position)
+        if extra is not None:
+            fields.extend(extra)
+        return fields
+
+
+class AssetView(MutableMapping):
+    """
+    Актив сессии в виде словаря.
+
+    Статические поля читаются из записи и столбцов каталога, 'price' и
+    'change' - из массивов рыночного состояния сессии. Изменять можно только
+    цену и изменение.
+    """
+
+    __slots__ = ('_market', '_position')
+
+    def __init__(self, market: 'MarketState', position: int):
+        """
+        Инициализация представления.
+
+        Args:
+            market: Рыночное состояние сессии
+            position: Позиция актива в каталоге
+        """
+        self._market = market
+        self._position = position
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'price':
+            return float(self._market.prices[self._position])
+        if key == 'change':
+            return float(self._market.changes[self._position])
+        return self._market.catalog.value(self._position, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == 'price':
+            self._market.set_price(self._position, value)
+        elif key == 'change':
+            self._market.set_change(self._position, value)
+        else:
+            raise TypeError(f"Поле '{key}' каталога активов неизменяемо")
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Поля каталога активов нельзя удалять")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._market.catalog.fields(self._position))
+
+    def __len__(self) -> int:
+        return len(self._market.catalog.fields(self._position))
+
+    def __repr__(self) -> str:
+        return f"AssetView({dict(self)!r})"
+
+
+class MarketState:
+    """Цены активов одной игровой сессии."""
+
+    def __init__(self, catalog: AssetCatalog):
+        """
+        Инициализация рыночного состояния.
+
+        Args:
+            catalog: Общий каталог активов
+        """
+        self.catalog = catalog
+        self.version = 0
+        self._assets: Optional[Dict[str, List[AssetView]]] = None
+        self.reset()
+
+    def reset(self, catalog: Optional[AssetCatalog] = None) -> None:
+        """
+        Возвращает цены к базовым без копирования массивов.
+
+        Args:
+            catalog: Новый каталог (по умолчанию остается текущий)
+        """
+        if catalog is not None and catalog is not self.catalog:
+            self.catalog = catalog
+            self._assets = None
+        self.prices = self.catalog.base_prices
+        self.changes = self.catalog.zero_changes
+        self.version += 1
+
+    @property
+    def assets(self) -> Dict[str, List[AssetView]]:
+        """Активы сессии по категориям в формате ASSETS."""
+        if self._assets is None:
+            self._assets = {
+                asset_class: [AssetView(self, position) for position in positions]
+                for asset_class, positions in self.catalog.class_positions.items()
+            }
+        return self._assets
+
+    def get(self, ticker: str) -> Optional[AssetView]:
+        """Возвращает актив сессии по тикеру или None."""
+        position = self.catalog.positions.get(ticker)
+        if position is None:
+            return None
+        return AssetView(self, position)
+
+    def checksum(self) -> int:
+        """Возвращает CRC32 цен сессии для сверки журналов."""
+        return zlib.crc32(np.ascontiguousarray(self.prices).tobytes())
+
+    @property
+    def owns_prices(self) -> bool:
+        """True, если сессия уже скопировала массивы цен каталога."""
+        return self.prices.flags.writeable
+
+    def set_price(self, position: int, price: float) -> None:
+        """Записывает цену актива, копируя массивы каталога при первой записи."""
+        self._ensure_owned()
+        self.prices[position] = price
+        self.version += 1
+
+    def set_change(self, position: int, change: float) -> None:
+        """Записывает изменение цены актива в процентах."""
+        self._ensure_owned()
+        self.changes[position] = change
+        self.version += 1
+
+    def update_prices(
+            self,
+            positions: np.ndarray,
+            prices: np.ndarray,
+            changes: np.ndarray
+    ) -> None:
+        """
+        Записывает цены и изменения части активов.
+
+        Args:
+            positions: Позиции активов в каталоге
+            prices: Новые цены
+            changes: Изменения в процентах
+        """
+        self._ensure_owned()
+        self.prices[positions] = prices
+        self.changes[positions] = changes
+        self.version += 1
+
+    def set_prices(self, prices: np.ndarray, changes: np.ndarray) -> None:
+        """
+        Заменяет цены и изменения всех активов.
+
+        Args:
+            prices: Цены в порядке каталога (копируются)
+            changes: Изменения в процентах в порядке каталога (копируются)
+
+        Raises:
+            ValueError: Если размер массивов не совпадает с каталогом
+        """
+        if len(prices) != len(self.catalog) or len(changes) != len(self.catalog):
+            raise ValueError("Размер массивов не совпадает с каталогом")
+        self.prices = np.array(prices, dtype=np.float64)
+        self.changes = np.array(changes, dtype=np.float64)
+        self.version += 1
+
+    def _ensure_owned(self) -> None:
+        """Копирует общие массивы каталога перед записью."""
+        if not self.prices.flags.writeable:
+            self.prices = self.prices.copy()
+        if not self.changes.flags.writeable:
+            self.changes = self.changes.copy()
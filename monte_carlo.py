@@ -0,0 +1,263 @@
+"""
+Пакетный прогон игр методом Монте-Карло.
+
+Запускает N независимых полных игр (все недели, события, дивиденды и
+проценты) без интерфейса, распределяя их по процессам, и возвращает
+распределения итоговой стоимости портфеля, дивидендов и процентов.
+Используется для калибровки доходностей активов и эффектов событий.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from price_history import PriceHistory
+from simulation_core import TICKS_PER_WEEK, GameState
+
+# Стратегия игрока: вызывается перед каждым переходом к следующей неделе;
+# True означает, что дальше стратегия только держит портфель, и игра
+# доигрывается через GameState.fast_forward
+Strategy = Callable[[GameState], Optional[bool]]
+
+# Перцентили, которые попадают в сводку распределения
+SUMMARY_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def equal_weight_strategy(game_state: GameState) -> Optional[bool]:
+    """
+    В первую неделю распределяет баланс поровну между всеми активами
+    каталога и дальше держит портфель. Поручения исполняются пачкой при
+    переходе к следующей неделе.
+
+    Args:
+        game_state: Состояние игры
+
+    Returns:
+        True после покупки: дальше портфель только держится
+    """
+    if game_state.current_week != 1 or game_state.player['portfolio']:
+        return
+
+    assets = [
+        asset for group in game_state.market.assets.values() for asset in group
+    ]
+    assets = assets[:game_state.player['max_trades_per_day']]
+    budget = game_state.player['balance'] / len(assets)
+    for asset in assets:
+        quantity = int(budget // asset['price'])
+        if quantity <= 0:
+            continue
+        game_state.place_order('buy', asset['ticker'], quantity)
+    return True
+
+
+def hold_cash_strategy(game_state: GameState) -> bool:
+    """Ничего не покупает: весь баланс остается в деньгах."""
+    return True
+
+
+def deposit_strategy(game_state: GameState) -> bool:
+    """
+    Кладет весь баланс на вклад с наибольшей ставкой и держит его до конца
+    игры. Итог такой игры не зависит от ценового шума и считается без
+    пошагового расчета недель.
+
+    Args:
+        game_state: Состояние игры
+
+    Returns:
+        True: дальше вклад только держится
+    """
+    deposit = max(game_state.market.assets['вклады'], key=lambda asset: asset['yield'])
+    quantity = int(game_state.player['balance'] // deposit['price'])
+    if quantity > 0:
+        game_state.place_order('buy', deposit['ticker'], quantity)
+    return True
+
+
+def play_game(
+        seed: int,
+        strategy: Strategy = equal_weight_strategy,
+        game_state: Optional[GameState] = None
+) -> GameState:
+    """
+    Проводит одну полную игру с заданным зерном.
+
+    Args:
+        seed: Зерно игры
+        strategy: Стратегия игрока
+        game_state: Переиспользуемое состояние игры (создается, если не
+                    задано)
+
+    Returns:
+        Состояние игры после последней недели
+    """
+    if game_state is None:
+        game_state = GameState()
+    game_state.reset_game(seed)
+
+    while True:
+        if strategy(game_state):
+            game_state.fast_forward()
+            break
+        if not game_state.next_week():
+            break
+
+    return game_state
+
+
+def _run_chunk(
+        seeds: Sequence[int],
+        strategy: Strategy,
+        ticks_per_week: int = TICKS_PER_WEEK,
+        price_history: Optional[PriceHistory] = None
+) -> np.ndarray:
+    """
+    Прогоняет пачку игр в текущем процессе.
+
+    Returns:
+        Массив формы (len(seeds), 3): итоговая стоимость, дивиденды, проценты
+    """
+    results = np.empty((len(seeds), 3), dtype=np.float64)
+    game_state = GameState(
+        ticks_per_week=ticks_per_week, price_history=price_history
+    )
+    for row, seed in enumerate(seeds):
+        play_game(seed, strategy, game_state)
+        player = game_state.player
+        results[row] = (
+            player['total_value'],
+            player['dividends_earned'],
+            player['interest_earned']
+        )
+    return results
+
+
+class MonteCarloResult:
+    """Распределения итогов пакетного прогона игр."""
+
+    def __init__(
+            self,
+            seeds: np.ndarray,
+            total_value: np.ndarray,
+            dividends: np.ndarray,
+            interest: np.ndarray
+    ):
+        """
+        Инициализация результата.
+
+        Args:
+            seeds: Зерна игр (по ним любую игру можно повторить через
+                   play_game)
+            total_value: Итоговая стоимость портфеля по играм
+            dividends: Полученные дивиденды по играм
+            interest: Полученные проценты и купоны по играм
+        """
+        self.seeds = seeds
+        self.total_value = total_value
+        self.dividends = dividends
+        self.interest = interest
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Возвращает сводку распределений.
+
+        Returns:
+            Для каждой метрики: среднее, стандартное отклонение, минимум,
+            максимум и перцентили SUMMARY_PERCENTILES (ключи вида 'p50')
+        """
+        summary = {}
+        for name in ('total_value', 'dividends', 'interest'):
+            values = getattr(self, name)
+            stats = {
+                'mean': float(values.mean()),
+                'std': float(values.std()),
+                'min': float(values.min()),
+                'max': float(values.max())
+            }
+            for percentile, value in zip(
+                    SUMMARY_PERCENTILES,
+                    np.percentile(values, SUMMARY_PERCENTILES).tolist()
+            ):
+                stats[f'p{percentile}'] = value
+            summary[name] = stats
+        return summary
+
+
+def make_seeds(n_games: int, seed: int = 0) -> np.ndarray:
+    """
+    Порождает независимые зерна игр из одного базового зерна.
+
+    Args:
+        n_games: Количество игр
+        seed: Базовое зерно пакета
+
+    Returns:
+        Массив из n_games 64-битных зерен
+    """
+    return np.random.SeedSequence(seed).generate_state(
+        n_games, dtype=np.uint64
+    )
+
+
+def run_batch(
+        n_games: int,
+        seed: int = 0,
+        strategy: Strategy = equal_weight_strategy,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        ticks_per_week: int = TICKS_PER_WEEK,
+        price_history: Optional[PriceHistory] = None
+) -> MonteCarloResult:
+    """
+    Прогоняет n_games независимых полных игр.
+
+    Args:
+        n_games: Количество игр
+        seed: Базовое зерно пакета; одинаковое зерно дает одинаковый
+              результат при любом числе процессов
+        strategy: Стратегия игрока (функция уровня модуля, чтобы ее можно
+                  было передать в другой процесс)
+        workers: Число процессов (по умолчанию — число ядер); при 1 игры
+                 идут в текущем процессе
+        chunk_size: Число игр в одной задаче процесса
+        ticks_per_week: Число тиков цен в неделе
+        price_history: История цен вместо случайных изменений; процессы
+                       получают только путь к файлу и отображают его сами
+
+    Returns:
+        Распределения итогов игр
+    """
+    if n_games <= 0:
+        raise ValueError("Количество игр должно быть больше 0")
+
+    seeds = make_seeds(n_games, seed)
+    seed_list = seeds.tolist()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, n_games))
+    if chunk_size is None:
+        chunk_size = math.ceil(n_games / (workers * 4))
+
+    if workers == 1:
+        results = _run_chunk(seed_list, strategy, ticks_per_week, price_history)
+    else:
+        chunks: List[List[int]] = [
+            seed_list[start:start + chunk_size]
+            for start in range(0, n_games, chunk_size)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = np.concatenate(list(executor.map(
+                _run_chunk, chunks, [strategy] * len(chunks),
+                [ticks_per_week] * len(chunks), [price_history] * len(chunks)
+            )))
+
+    return MonteCarloResult(
+        seeds, results[:, 0], results[:, 1], results[:, 2]
+    )
@@ -0,0 +1,348 @@
+"""
+Исполнение торговых поручений.
+
+Поручения на покупку и продажу ставятся в очередь и исполняются пачкой в
+конце шага игры: каждое исполнение меняет портфель и кэш оценки за O(1),
+а полная переоценка портфеля выполняется один раз на всю пачку. Поручение
+может исполниться частично - в пределах баланса при покупке и позиции в
+портфеле при продаже.
+
+Лимитные и стоп-поручения ждут в индексе срабатывания: для каждого тикера
+две кучи по цене срабатывания, поэтому после изменения цены проверяется
+только вершина кучи, а срабатывание k поручений стоит O(k log n).
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Стороны поручения
+ORDER_BUY = 'buy'
+ORDER_SELL = 'sell'
+ORDER_SIDES = (ORDER_BUY, ORDER_SELL)
+
+# Виды поручения
+ORDER_MARKET = 'market'
+ORDER_LIMIT = 'limit'
+ORDER_STOP = 'stop'
+ORDER_KINDS = (ORDER_MARKET, ORDER_LIMIT, ORDER_STOP)
+
+# Статусы поручения
+ORDER_PENDING = 'pending'
+ORDER_FILLED = 'filled'
+ORDER_PARTIAL = 'partial'
+ORDER_REJECTED = 'rejected'
+ORDER_CANCELLED = 'cancelled'
+
+
+class Order:
+    """Торговое поручение игрока."""
+
+    def __init__(
+            self,
+            side: str,
+            ticker: str,
+            quantity: int,
+            allow_partial: bool = True,
+            kind: str = ORDER_MARKET,
+            trigger_price: Optional[float] = None
+    ):
+        """
+        Инициализация поручения.
+
+        Args:
+            side: Сторона сделки (ORDER_BUY или ORDER_SELL)
+            ticker: Тикер актива
+            quantity: Запрошенное количество
+            allow_partial: Разрешено ли частичное исполнение
+            kind: Вид поручения (ORDER_MARKET, ORDER_LIMIT или ORDER_STOP)
+            trigger_price: Лимитная или стоп-цена; лимитная покупка и
+                           стоп-продажа срабатывают, когда цена опускается до
+                           нее, лимитная продажа и стоп-покупка - когда
+                           поднимается
+        """
+        self.side = side
+        self.ticker = ticker
+        self.quantity = quantity
+        self.allow_partial = allow_partial
+        self.kind = kind
+        self.trigger_price = trigger_price
+        # Номер ожидающего поручения в движке (только лимитные и стоп)
+        self.id: Optional[int] = None
+        self.filled = 0
+        self.price: Optional[float] = None
+        self.status = ORDER_PENDING
+        self.message = ""
+
+    @property
+    def is_filled(self) -> bool:
+        """True, если поручение исполнено полностью или частично."""
+        return self.status in (ORDER_FILLED, ORDER_PARTIAL)
+
+    @property
+    def triggers_on_fall(self) -> bool:
+        """True, если поручение срабатывает при снижении цены до trigger_price."""
+        return (self.kind == ORDER_LIMIT) == (self.side == ORDER_BUY)
+
+    def is_triggered(self, price: float) -> bool:
+        """Проверяет, срабатывает ли ожидающее поручение при цене price."""
+        if self.triggers_on_fall:
+            return price <= self.trigger_price
+        return price >= self.trigger_price
+
+    def reject(self, message: str) -> None:
+        """Отклоняет поручение с указанным сообщением."""
+        self.status = ORDER_REJECTED
+        self.message = message
+
+    def __repr__(self) -> str:
+        return (
+            f"Order({self.side!r}, {self.ticker!r}, {self.quantity}, "
+            f"kind={self.kind!r}, status={self.status!r}, filled={self.filled})"
+        )
+
+
+class TriggerIndex:
+    """
+    Ожидающие поручения по тикерам, упорядоченные по цене срабатывания.
+
+    Поручения, срабатывающие при снижении цены, лежат в куче с наибольшей
+    ценой срабатывания на вершине, при росте - с наименьшей. Отмененные
+    поручения удаляются из куч лениво, при выталкивании.
+    """
+
+    def __init__(self):
+        """Инициализация пустого индекса."""
+        self._on_fall: Dict[str, List[Tuple[float, int, Order]]] = {}
+        self._on_rise: Dict[str, List[Tuple[float, int, Order]]] = {}
+
+    def add(self, order: Order) -> None:
+        """Добавляет ожидающее поручение в индекс."""
+        if order.triggers_on_fall:
+            heap = self._on_fall.setdefault(order.ticker, [])
+            heapq.heappush(heap, (-order.trigger_price, order.id, order))
+        else:
+            heap = self._on_rise.setdefault(order.ticker, [])
+            heapq.heappush(heap, (order.trigger_price, order.id, order))
+
+    def tickers(self) -> List[str]:
+        """Возвращает тикеры, по которым есть поручения в индексе."""
+        return list(self._on_fall.keys() | self._on_rise.keys())
+
+    def pop_triggered(self, ticker: str, price: float) -> List[Order]:
+        """
+        Извлекает поручения тикера, сработавшие при цене price.
+
+        Args:
+            ticker: Тикер актива
+            price: Текущая цена
+
+        Returns:
+            Сработавшие ожидающие поручения
+        """
+        fired = []
+        heap = self._on_fall.get(ticker)
+        while heap and -heap[0][0] >= price:
+            fired.append(heapq.heappop(heap)[2])
+        if heap is not None and not heap:
+            del self._on_fall[ticker]
+
+        heap = self._on_rise.get(ticker)
+        while heap and heap[0][0] <= price:
+            fired.append(heapq.heappop(heap)[2])
+        if heap is not None and not heap:
+            del self._on_rise[ticker]
+
+        return [order for order in fired if order.status == ORDER_PENDING]
+
+
+class OrderEngine:
+    """Очередь поручений с пакетным исполнением."""
+
+    def __init__(self):
+        """Инициализация движка с пустой очередью."""
+        self.pending: List[Order] = []
+        # Ожидающие лимитные и стоп-поручения по номерам
+        self.resting: Dict[int, Order] = {}
+        self.triggers = TriggerIndex()
+        self.next_id = 1
+
+    def submit(self, order: Order) -> Order:
+        """
+        Проверяет поручение и ставит его в очередь.
+
+        Рыночное поручение ждет пакетного исполнения, лимитное и
+        стоп-поручение получает номер и ждет срабатывания в индексе.
+        Некорректное поручение сразу отклоняется и в очередь не попадает.
+
+        Args:
+            order: Поручение
+
+        Returns:
+            То же поручение
+        """
+        error = _validate(order)
+        if error:
+            order.reject(error)
+        elif order.kind == ORDER_MARKET:
+            self.pending.append(order)
+        else:
+            if order.id is None:
+                order.id = self.next_id
+            self.next_id = max(self.next_id, order.id + 1)
+            self.resting[order.id] = order
+            self.triggers.add(order)
+        return order
+
+    def cancel(self, order_id: int) -> bool:
+        """
+        Отменяет ожидающее поручение.
+
+        Args:
+            order_id: Номер поручения
+
+        Returns:
+            True если поручение было отменено
+        """
+        order = self.resting.pop(order_id, None)
+        if order is None:
+            return False
+        order.status = ORDER_CANCELLED
+        order.message = "Поручение отменено"
+        return True
+
+    def trigger(
+            self,
+            game_state: Any,
+            tickers: Optional[Iterable[str]] = None
+    ) -> List[Order]:
+        """
+        Исполняет ожидающие поручения, сработавшие при текущих ценах.
+
+        Сработавшие поручения исполняются по текущей цене в порядке подачи.
+
+        Args:
+            game_state: Состояние игры (simulation_core.GameState)
+            tickers: Тикеры, цены которых изменились (по умолчанию все
+                     тикеры с ожидающими поручениями)
+
+        Returns:
+            Сработавшие поручения с результатами исполнения
+        """
+        if not self.resting:
+            return []
+        if tickers is None:
+            tickers = self.triggers.tickers()
+
+        market = game_state.market
+        fired = []
+        for ticker in tickers:
+            asset = market.get(ticker)
+            if asset is not None:
+                fired.extend(self.triggers.pop_triggered(ticker, asset['price']))
+
+        fired.sort(key=lambda order: order.id)
+        for order in fired:
+            del self.resting[order.id]
+            self.execute(game_state, order)
+        return fired
+
+    def settle(self, game_state: Any) -> List[Order]:
+        """
+        Исполняет все поручения очереди в порядке поступления.
+
+        Переоценку портфеля после пачки выполняет вызывающий код
+        (GameState.settle_orders).
+
+        Args:
+            game_state: Состояние игры (simulation_core.GameState)
+
+        Returns:
+            Исполненные и отклоненные поручения пачки
+        """
+        orders, self.pending = self.pending, []
+        for order in orders:
+            self.execute(game_state, order)
+        return orders
+
+    def execute(self, game_state: Any, order: Order) -> Order:
+        """
+        Исполняет одно поручение по текущей цене актива.
+
+        Args:
+            game_state: Состояние игры (simulation_core.GameState)
+            order: Поручение
+
+        Returns:
+            То же поручение с заполненными статусом, объемом и сообщением
+        """
+        error = _validate(order)
+        if error:
+            order.reject(error)
+            return order
+
+        player = game_state.player
+        if player['trades_today'] >= player['max_trades_per_day']:
+            order.reject("Достигнут лимит сделок на сегодня")
+            return order
+
+        asset = game_state.market.get(order.ticker)
+        if asset is None:
+            order.reject("Актив не найден")
+            return order
+
+        price = asset['price']
+        if order.side == ORDER_BUY:
+            if price * order.quantity <= player['balance']:
+                fill = order.quantity
+            else:
+                fill = _affordable_quantity(player['balance'], price)
+            if fill == 0 or (fill < order.quantity and not order.allow_partial):
+                order.reject("Недостаточно средств")
+                return order
+            verb = "Куплено"
+        else:
+            fill = min(order.quantity, player['portfolio'].get(order.ticker, 0))
+            if fill == 0:
+                order.reject("Нет актива в портфеле")
+                return order
+            if fill < order.quantity and not order.allow_partial:
+                order.reject("Недостаточно актива в портфеле")
+                return order
+            verb = "Продано"
+
+        game_state.apply_fill(order.side, order.ticker, fill, price, order.id)
+        order.filled = fill
+        order.price = price
+        if fill == order.quantity:
+            order.status = ORDER_FILLED
+            order.message = f"{verb} {fill} {asset['name']}"
+        else:
+            order.status = ORDER_PARTIAL
+            order.message = f"{verb} {fill} из {order.quantity} {asset['name']}"
+        return order
+
+
+def _validate(order: Order) -> Optional[str]:
+    """Возвращает ошибку в параметрах поручения или None."""
+    if order.side not in ORDER_SIDES:
+        return "Неизвестный тип операции"
+    if not isinstance(order.quantity, int) or order.quantity <= 0:
+        return "Количество должно быть больше 0"
+    if order.kind not in ORDER_KINDS:
+        return "Неизвестный вид поручения"
+    if order.kind != ORDER_MARKET and not (
+            order.trigger_price is not None and order.trigger_price > 0
+    ):
+        return "Цена срабатывания должна быть больше 0"
+    return None
+
+
+def _affordable_quantity(balance: float, price: float) -> int:
+    """Возвращает наибольшее количество, стоимость которого не превышает баланс."""
+    if balance <= 0:
+        return 0
+    quantity = int(balance // price)
+    # Округление при делении может дать на единицу больше допустимого
+    while quantity > 0 and price * quantity > balance:
+        quantity -= 1
+    return quantity
@@ -0,0 +1,110 @@
+"""
+Векторизованный движок цен на NumPy.
+
+Параметры всех активов хранятся в непрерывных массивах, поэтому недельное
+обновление цен выполняется одной операцией над массивами независимо от
+количества инструментов.
+"""
+
+from typing import List, Optional, Any
+
+import numpy as np
+
+from market_state import AssetCatalog
+from return_model import correlated_changes
+
+# Минимальная цена актива
+PRICE_FLOOR = 0.01
+# Доля коридора волатильности, после которой изменение попадает в новости
+NEWS_THRESHOLD = 0.8
+
+
+class VectorPriceEngine:
+    """Движок цен, хранящий цены и волатильности активов в массивах."""
+
+    def __init__(self, catalog: AssetCatalog, seed: Optional[int] = None):
+        """
+        Инициализация движка.
+
+        Цены и изменения сессии движок получает через set_prices, до этого
+        цены равны базовым, изменения нулевые.
+
+        Args:
+            catalog: Каталог активов сессии
+            seed: Зерно генератора случайных чисел
+        """
+        self.names = catalog.names
+        self.base_prices = catalog.base_prices
+        self.volatilities = catalog.volatilities
+        self.prices = np.array(self.base_prices, dtype=np.float64)
+        self.changes = np.zeros_like(self.prices)
+        self.rng = np.random.default_rng(seed)
+
+    def set_prices(self, prices: np.ndarray, changes: np.ndarray) -> None:
+        """
+        Загружает цены и изменения из массивов рыночного состояния.
+
+        Args:
+            prices: Цены в порядке активов движка
+            changes: Изменения в процентах в порядке активов движка
+
+        Raises:
+            ValueError: Если размер массивов не совпадает с числом активов
+        """
+        if len(prices) != len(self.prices) or len(changes) != len(self.changes):
+            raise ValueError("Размер массивов не совпадает с числом активов")
+        self.prices = np.array(prices, dtype=np.float64)
+        self.changes = np.array(changes, dtype=np.float64)
+
+    def step(
+            self,
+            market_volatility: float,
+            rng: Optional[np.random.Generator] = None,
+            return_model: Optional[Any] = None
+    ) -> List[str]:
+        """
+        Обновляет цены всех активов за одну неделю.
+
+        Семантика совпадает с GameState._update_moving_prices: изменение
+        равномерно распределено в коридоре волатильности актива, умноженной
+        на market_volatility (или задано моделью доходности с той же
+        дисперсией), цена не опускается ниже PRICE_FLOOR, активы с нулевой
+        волатильностью не меняются.
+
+        Args:
+            market_volatility: Множитель волатильности рынка
+            rng: Генератор ценового шума (по умолчанию собственный
+                 генератор движка)
+            return_model: Модель коррелированной доходности; по умолчанию
+                          шоки независимы и равномерны
+
+        Returns:
+            Новости о сильных изменениях цен
+        """
+        adjusted = self.volatilities * market_volatility
+        if rng is None:
+            rng = self.rng
+        if return_model is None:
+            shocks = rng.uniform(-adjusted, adjusted)
+        else:
+            shocks = correlated_changes(
+                return_model, rng, adjusted, np.arange(len(adjusted))
+            )
+        moving = self.volatilities > 0
+
+        old_prices = self.prices
+        new_prices = np.maximum(PRICE_FLOOR, old_prices * (1 + shocks))
+        self.changes = np.where(
+            moving, (new_prices - old_prices) / old_prices * 100, self.changes
+        )
+        self.prices = np.where(moving, new_prices, old_prices)
+
+        news_mask = moving & (np.abs(shocks) > adjusted * NEWS_THRESHOLD)
+        news = []
+        for index in np.flatnonzero(news_mask).tolist():
+            change = shocks[index]
+            direction = "рост" if change > 0 else "падение"
+            news.append(
+                f"📊 {self.names[index]}: {direction} на {abs(change * 100):.1f}%"
+            )
+        return news
@@ -0,0 +1,209 @@
+"""
+Исторические ряды цен в файле, отображенном в память.
+
+Файл хранит матрицу цен (строки - тики, столбцы - тикеры) сырыми числами
+после заголовка со списком тикеров. Матрица открывается через np.memmap
+только для чтения: в память попадают лишь прочитанные строки, поэтому
+история в несколько гигабайт не загружается целиком, а все сессии (и все
+процессы) с одним файлом читают одни и те же страницы кэша ОС без копий.
+
+Строки идут подряд по времени, так что цены одного тика - одна непрерывная
+строка файла.
+"""
+
+import json
+import os
+import struct
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from market_state import AssetCatalog
+
+HISTORY_MAGIC = b'VTBH'
+HISTORY_VERSION = 1
+# Начало матрицы выравнивается по странице памяти
+DATA_ALIGNMENT = 4096
+# Допустимые типы чисел матрицы
+HISTORY_DTYPES = ('<f8', '<f4')
+
+_HEADER = struct.Struct('<4sHHQQQ')
+
+
+class PriceHistory:
+    """Ряды цен активов из файла истории, отображенного в память."""
+
+    def __init__(self, path: str):
+        """
+        Открывает файл истории.
+
+        Args:
+            path: Путь к файлу истории (см. write_history)
+
+        Raises:
+            ValueError: Если файл не является файлом истории
+            OSError: Если файл не читается
+        """
+        with open(path, 'rb') as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path}: файл истории поврежден")
+            magic, version, dtype_code, rows, width, meta_size = _HEADER.unpack(header)
+            if magic != HISTORY_MAGIC:
+                raise ValueError(f"{path}: это не файл истории цен")
+            if version != HISTORY_VERSION or dtype_code >= len(HISTORY_DTYPES):
+                raise ValueError(f"{path}: неподдерживаемая версия файла истории")
+            try:
+                tickers = json.loads(file.read(meta_size).decode('utf-8'))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                raise ValueError(f"{path}: файл истории поврежден") from None
+        if len(tickers) != width:
+            raise ValueError(f"{path}: файл истории поврежден")
+
+        dtype = np.dtype(HISTORY_DTYPES[dtype_code])
+        offset = _data_offset(meta_size)
+        if os.path.getsize(path) < offset + rows * width * dtype.itemsize:
+            raise ValueError(f"{path}: файл истории обрезан")
+
+        self.path = path
+        self.tickers: Tuple[str, ...] = tuple(tickers)
+        self.columns: Dict[str, int] = {
+            ticker: column for column, ticker in enumerate(self.tickers)
+        }
+        self.prices = np.memmap(
+            path, dtype=dtype, mode='r', offset=offset, shape=(rows, width)
+        ) if rows and width else np.empty((rows, width), dtype=dtype)
+        self._binding: Optional[Tuple[AssetCatalog, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self.prices.shape[0]
+
+    def __reduce__(self):
+        # В другой процесс передается только путь: там файл отображается
+        # заново и страницы делятся через кэш ОС
+        return open_history, (self.path,)
+
+    def bind(self, catalog: AssetCatalog) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Сопоставляет столбцы истории активам каталога.
+
+        Args:
+            catalog: Каталог активов
+
+        Returns:
+            (позиции активов в каталоге, столбцы истории) для тикеров,
+            которые есть и там, и там
+        """
+        binding = self._binding
+        if binding is None or binding[0] is not catalog:
+            pairs = sorted(
+                (position, self.columns[ticker])
+                for ticker, position in catalog.positions.items()
+                if ticker in self.columns
+            )
+            positions = np.array([pair[0] for pair in pairs], dtype=np.intp)
+            columns = np.array([pair[1] for pair in pairs], dtype=np.intp)
+            positions.flags.writeable = False
+            columns.flags.writeable = False
+            binding = self._binding = (catalog, positions, columns)
+        return binding[1], binding[2]
+
+    def row(self, row: int, columns: np.ndarray) -> np.ndarray:
+        """
+        Читает цены столбцов на строке истории.
+
+        Читается только эта строка файла; результат - новый массив float64.
+        """
+        return np.array(self.prices[row, columns], dtype=np.float64)
+
+
+def _data_offset(meta_size: int) -> int:
+    """Возвращает начало матрицы: после заголовка, с выравниванием."""
+    end = _HEADER.size + meta_size
+    return (end + DATA_ALIGNMENT - 1) // DATA_ALIGNMENT * DATA_ALIGNMENT
+
+
+def write_history(
+        path: str,
+        tickers: Sequence[str],
+        chunks: Iterable[Any],
+        dtype: str = '<f8'
+) -> int:
+    """
+    Записывает файл истории по частям, не собирая матрицу в памяти.
+
+    Args:
+        path: Путь к файлу истории
+        tickers: Тикеры столбцов
+        chunks: Части матрицы (массивы строк x тикеры) или отдельные строки
+                по порядку времени
+        dtype: Тип чисел из HISTORY_DTYPES
+
+    Returns:
+        Число записанных строк
+
+    Raises:
+        ValueError: Если тикеры повторяются, тип не поддерживается, размер
+                    части не совпадает с числом тикеров или цена не
+                    положительна
+    """
+    if dtype not in HISTORY_DTYPES:
+        raise ValueError(f"Неподдерживаемый тип чисел истории: {dtype}")
+    if len(set(tickers)) != len(tickers):
+        raise ValueError("Тикеры истории повторяются")
+    meta = json.dumps(list(tickers), ensure_ascii=False).encode('utf-8')
+    offset = _data_offset(len(meta))
+
+    rows = 0
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(b'\0' * offset)
+            for chunk in chunks:
+                block = np.atleast_2d(np.asarray(chunk, dtype=np.float64))
+                if block.shape[1] != len(tickers):
+                    raise ValueError(
+                        "Размер строки истории не совпадает с числом тикеров"
+                    )
+                if not (np.isfinite(block).all() and (block > 0).all()):
+                    raise ValueError(
+                        f"Цены истории должны быть больше 0 (строка {rows + 1})"
+                    )
+                file.write(block.astype(dtype).tobytes())
+                rows += len(block)
+            file.seek(0)
+            file.write(_HEADER.pack(
+                HISTORY_MAGIC, HISTORY_VERSION, HISTORY_DTYPES.index(dtype),
+                rows, len(tickers), len(meta)
+            ))
+            file.write(meta)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return rows
+
+
+# Открытые истории процесса: (размер, время изменения, история) по пути
+_histories: Dict[str, Tuple[int, int, PriceHistory]] = {}
+
+
+def open_history(path: str) -> PriceHistory:
+    """
+    Возвращает историю файла, открывая его не больше одного раза.
+
+    Все сессии процесса с одним файлом получают один объект и одно
+    отображение; после перезаписи файла он открывается заново.
+
+    Args:
+        path: Путь к файлу истории
+    """
+    key = os.path.realpath(path)
+    stat = os.stat(key)
+    cached = _histories.get(key)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    history = PriceHistory(path)
+    _histories[key] = (stat.st_size, stat.st_mtime_ns, history)
+    return history
@@ -0,0 +1,178 @@
+"""
+Модели коррелированной доходности активов.
+
+Модель за один вызов порождает стандартные нормальные шоки всех активов
+каталога с заданной корреляцией. GameState умножает их на коридор
+волатильности актива так, чтобы дисперсия изменения цены совпадала с
+равномерным шоком в том же коридоре.
+
+CholeskyReturnModel разлагает полную матрицу корреляций один раз при
+создании, шаг стоит O(n^2). FactorReturnModel задает корреляцию через k
+общих факторов и стоит O(n*k) по времени и памяти, поэтому подходит для
+каталогов из тысяч инструментов.
+"""
+
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Стандартное отклонение равномерного шока в коридоре [-1, 1]
+CORRIDOR_STD = 1 / math.sqrt(3)
+
+
+class CholeskyReturnModel:
+    """Шоки с полной матрицей корреляций через разложение Холецкого."""
+
+    def __init__(self, correlation: Any):
+        """
+        Инициализация модели.
+
+        Args:
+            correlation: Матрица корреляций n x n в порядке каталога
+
+        Raises:
+            ValueError: Если матрица не квадратная, не симметричная, имеет
+                        не единичную диагональ или не положительно определена
+        """
+        correlation = np.array(correlation, dtype=np.float64)
+        if correlation.ndim != 2 or correlation.shape[0] != correlation.shape[1]:
+            raise ValueError("Матрица корреляций должна быть квадратной")
+        if not np.allclose(correlation, correlation.T):
+            raise ValueError("Матрица корреляций должна быть симметричной")
+        if not np.allclose(np.diag(correlation), 1.0):
+            raise ValueError("На диагонали матрицы корреляций должны быть единицы")
+        try:
+            self.factor = np.linalg.cholesky(correlation)
+        except np.linalg.LinAlgError as e:
+            raise ValueError(
+                "Матрица корреляций должна быть положительно определенной"
+            ) from e
+        self.size = len(correlation)
+
+    def correlation(self) -> np.ndarray:
+        """Возвращает матрицу корреляций модели."""
+        return self.factor @ self.factor.T
+
+    def draw(self, rng: np.random.Generator, count: int = 1) -> np.ndarray:
+        """
+        Порождает коррелированные шоки.
+
+        Args:
+            rng: Генератор случайных чисел
+            count: Число шагов
+
+        Returns:
+            Массив (count, size) стандартных нормальных шоков
+        """
+        return rng.standard_normal((count, self.size)) @ self.factor.T
+
+
+class FactorReturnModel:
+    """Шоки из k общих факторов и собственного шума каждого актива."""
+
+    def __init__(self, loadings: Any):
+        """
+        Инициализация модели.
+
+        Args:
+            loadings: Нагрузки активов на факторы, массив n x k (или n для
+                      одного фактора); корреляция активов i и j равна
+                      скалярному произведению их строк нагрузок
+
+        Raises:
+            ValueError: Если сумма квадратов нагрузок актива больше 1
+        """
+        loadings = np.array(loadings, dtype=np.float64)
+        if loadings.ndim == 1:
+            loadings = loadings.reshape(-1, 1)
+        if loadings.ndim != 2:
+            raise ValueError("Нагрузки должны быть массивом n x k")
+        common = (loadings ** 2).sum(axis=1)
+        if (common > 1 + 1e-12).any():
+            raise ValueError("Сумма квадратов нагрузок актива не может быть больше 1")
+        self.loadings = loadings
+        self.specific = np.sqrt(np.clip(1 - common, 0.0, None))
+        self.size, self.factors = loadings.shape
+
+    def correlation(self) -> np.ndarray:
+        """Возвращает матрицу корреляций модели (n x n, для проверки)."""
+        correlation = self.loadings @ self.loadings.T
+        np.fill_diagonal(correlation, 1.0)
+        return correlation
+
+    def draw(self, rng: np.random.Generator, count: int = 1) -> np.ndarray:
+        """
+        Порождает коррелированные шоки.
+
+        Факторы и собственный шум шага берутся одной строкой, поэтому
+        count шагов за вызов расходуют поток так же, как count вызовов.
+
+        Args:
+            rng: Генератор случайных чисел
+            count: Число шагов
+
+        Returns:
+            Массив (count, size) стандартных нормальных шоков
+        """
+        normals = rng.standard_normal((count, self.factors + self.size))
+        return (
+            normals[:, :self.factors] @ self.loadings.T +
+            normals[:, self.factors:] * self.specific
+        )
+
+
+def correlation_from_pairs(
+        positions: Dict[str, int],
+        pairs: Dict[Tuple[str, str], float],
+        default: float = 0.0
+) -> np.ndarray:
+    """
+    Строит матрицу корреляций каталога по парам тикеров.
+
+    Args:
+        positions: Позиции активов по тикеру (AssetCatalog.positions)
+        pairs: Корреляции пар тикеров, например {('SBER', 'VTBR'): 0.6}
+        default: Корреляция остальных пар
+
+    Returns:
+        Матрица корреляций в порядке каталога
+
+    Raises:
+        ValueError: Если тикер пары не найден в каталоге
+    """
+    size = len(positions)
+    correlation = np.full((size, size), default, dtype=np.float64)
+    for (first, second), value in pairs.items():
+        if first not in positions or second not in positions:
+            raise ValueError(f"Актив пары {first}-{second} не найден в каталоге")
+        i, j = positions[first], positions[second]
+        correlation[i, j] = correlation[j, i] = value
+    np.fill_diagonal(correlation, 1.0)
+    return correlation
+
+
+def correlated_changes(
+        model: Any,
+        rng: np.random.Generator,
+        adjusted: np.ndarray,
+        positions: Sequence[int],
+        count: Optional[int] = None
+) -> np.ndarray:
+    """
+    Возвращает изменения цен активов по модели доходности.
+
+    Args:
+        model: Модель доходности
+        rng: Генератор ценового шума
+        adjusted: Коридоры волатильности активов positions
+        positions: Позиции активов в каталоге
+        count: Число тиков (по умолчанию один тик и одномерный результат)
+
+    Returns:
+        Изменения в долях: массив len(positions) или (count, len(positions))
+    """
+    shocks = model.draw(rng, 1 if count is None else count)[:, positions]
+    if count is None:
+        shocks = shocks[0]
+    return adjusted * CORRIDOR_STD * shocks
@@ -141,13 +141,11 @@ class TestGameState(unittest.TestCase):
                 self.assertIn('name', asset)
                 self.assertIn('price', asset)
 
-    @patch('investment_simulator.random.random')
-    @patch('investment_simulator.random.choice')
-    def test_next_week_progression(self, mock_choice, mock_random):
+    def test_next_week_progression(self):
         """Тест перехода к следующей неделе."""
         # Гарантируем что события не применяются
-        mock_random.return_value = 1.0  # Вероятность 0% для события
-        mock_choice.return_value = {'name': 'Test', 'description': 'Test'}  # Безопасное событие
+        self.game_state.event_rng = Mock()
+        self.game_state.event_rng.random.return_value = 1.0  # Вероятность 0% для события
 
         initial_week = self.game_state.current_week
 
@@ -0,0 +1,1111 @@
+"""
+Ядро симуляции инвестиционной игры без зависимости от Pygame.
+
+Модуль содержит данные активов, рыночные события и GameState. Его можно
+импортировать в пакетных расчетах и тестах без дисплея и без инициализации
+графического интерфейса.
+
+ASSETS служит исходным каталогом и во время игры не изменяется: цены каждой
+сессии хранятся в ее MarketState.
+"""
+
+import math
+from typing import Dict, List, Sequence, Tuple, Optional, Any
+
+import numpy as np
+
+from accrual import get_accrual_table
+from event_table import EventTable
+from market_state import AssetCatalog, MarketState
+from order_engine import ORDER_BUY, ORDER_MARKET, Order, OrderEngine
+from return_model import correlated_changes
+
+# Константы игры
+MAX_TRADES_PER_DAY = 10
+TOTAL_WEEKS = 12
+INITIAL_BALANCE = 10000.0
+# Число тиков (шагов цен и начислений) в неделе: 5 - торговые дни,
+# больше - внутридневные шаги. Лимит сделок действует на один тик.
+TICKS_PER_WEEK = 1
+WEEKS_PER_YEAR = 52
+
+# Цветовая палитра
+VTB_DARK_BLUE = (13, 37, 72)
+VTB_BLUE = (25, 68, 142)
+VTB_LIGHT_BLUE = (232, 240, 254)
+VTB_WHITE = (255, 255, 255)
+VTB_GREEN = (0, 168, 107)
+VTB_RED = (227, 58, 61)
+VTB_GRAY = (245, 247, 250)
+VTB_DARK_GRAY = (102, 112, 133)
+VTB_BORDER_GRAY = (226, 230, 238)
+VTB_ACCENT_BLUE = (56, 119, 237)
+VTB_YELLOW = (255, 184, 0)
+VTB_PURPLE = (121, 97, 225)
+
+# Данные активов
+ASSETS = {
+    'акции': [
+        {
+            'name': 'Сбербанк', 'ticker': 'SBER', 'price': 297.17,
+            'base_price': 297.17, 'change': 0.0, 'dividend': 6.8,
+            'risk': 'Низкий', 'volatility': 0.03, 'color': VTB_GREEN,
+            'logo': 'SBER', 'logo_file': 'sber.png'
+        },
+        {
+            'name': 'ВТБ', 'ticker': 'VTBR', 'price': 69.96,
+            'base_price': 69.96, 'change': 0.0, 'dividend': 7.5,
+            'risk': 'Средний', 'volatility': 0.05, 'color': VTB_BLUE,
+            'logo': 'VTBR', 'logo_file': 'vtb.png'
+        },
+        {
+            'name': 'Тинькофф', 'ticker': 'TCSG', 'price': 2920.20,
+            'base_price': 2920.20, 'change': 0.0, 'dividend': 5.2,
+            'risk': 'Высокий', 'volatility': 0.07, 'color': VTB_PURPLE,
+            'logo': 'TCSG', 'logo_file': 'tinkoff.png'
+        }
+    ],
+    'облигации': [
+        {
+            'name': 'Сбер Sb29R', 'ticker': 'SBER-SB29R',
+            'price': 964.50, 'base_price': 964.50, 'change': 0.0,
+            'yield': 13.26, 'risk': 'Низкий', 'volatility': 0.01,
+            'color': VTB_GREEN, 'logo': 'SBER-SB29R', 'logo_file': 'sber.png'
+        },
+        {
+            'name': 'ВТБ Б1-379', 'ticker': 'VTB-B1379',
+            'price': 1001.10, 'base_price': 1001.10, 'change': 0.0,
+            'yield': 14.25, 'risk': 'Низкий', 'volatility': 0.01,
+            'color': VTB_BLUE, 'logo': 'VTB-B1379', 'logo_file': 'vtb.png'
+        },
+        {
+            'name': 'Тинькофф 2R', 'ticker': 'TCSG-2R',
+            'price': 997.90, 'base_price': 997.90, 'change': 0.0,
+            'yield': 12.85, 'risk': 'Средний', 'volatility': 0.015,
+            'color': VTB_PURPLE, 'logo': 'TCSG-2R', 'logo_file': 'tinkoff.png'
+        }
+    ],
+    'вклады': [
+        {
+            'name': 'Сбербанк «Ключевой»', 'ticker': 'SBER-DEP',
+            'price': 1.0, 'base_price': 1.0, 'change': 0.0,
+            'yield': 18.0, 'risk': 'Низкий', 'volatility': 0.0,
+            'color': VTB_GREEN, 'logo': 'SBER-DEP', 'logo_file': 'sber.png'
+        },
+        {
+            'name': 'ВТБ «Двойная выгода»', 'ticker': 'VTB-DEP',
+            'price': 1.0, 'base_price': 1.0, 'change': 0.0,
+            'yield': 26.0, 'risk': 'Низкий', 'volatility': 0.0,
+            'color': VTB_BLUE, 'logo': 'VTB-DEP', 'logo_file': 'vtb.png'
+        },
+        {
+            'name': 'Тинькофф «СмартВклад»', 'ticker': 'TCSG-DEP',
+            'price': 1.0, 'base_price': 1.0, 'change': 0.0,
+            'yield': 15.0, 'risk': 'Низкий', 'volatility': 0.0,
+            'color': VTB_PURPLE, 'logo': 'TCSG-DEP', 'logo_file': 'tinkoff.png'
+        }
+    ]
+}
+
+
+# Версия состава ASSETS: растет при register_asset, по ней каталог
+# пересобирается
+_assets_version = 0
+
+
+def register_asset(asset_class: str, asset: Dict[str, Any]) -> None:
+    """
+    Добавляет новый актив в ASSETS.
+
+    Args:
+        asset_class: Категория актива
+        asset: Данные актива
+
+    Raises:
+        ValueError: Если актив с таким тикером уже есть
+    """
+    global _assets_version
+    for group in ASSETS.values():
+        for existing in group:
+            if existing['ticker'] == asset['ticker']:
+                raise ValueError(f"Актив с тикером {asset['ticker']} уже существует")
+    ASSETS.setdefault(asset_class, []).append(asset)
+    _assets_version += 1
+
+
+_catalog: Optional[AssetCatalog] = None
+_catalog_version: Optional[int] = None
+# Каталог, подключенный через use_universe (None - каталог из ASSETS)
+_universe_catalog: Optional[AssetCatalog] = None
+
+
+def get_catalog() -> AssetCatalog:
+    """
+    Возвращает общий неизменяемый каталог активов.
+
+    Если через use_universe подключен каталог из файлов данных, возвращается
+    он. Иначе каталог собирается из ASSETS и пересобирается только после его
+    изменения через register_asset; новые активы попадают в сессию при ее
+    сбросе.
+    """
+    global _catalog, _catalog_version
+    if _universe_catalog is not None:
+        return _universe_catalog
+    if _catalog_version != _assets_version:
+        _catalog = AssetCatalog(ASSETS)
+        _catalog_version = _assets_version
+    return _catalog
+
+
+# Рыночные события - расширенный список
+MARKET_EVENTS = [
+    {
+        'name': 'Рост нефтяных цен',
+        'description': 'Цены на нефть выросли на мировых рынках',
+        'effects': {'VTBR': 0.08, 'SBER': 0.02},
+        'volatility_effect': 0.05
+    },
+    {
+        'name': 'Снижение ключевой ставки',
+        'description': 'Центральный банк снизил ключевую ставку',
+        'effects': {'облигации': 0.03, 'вклады': -0.02},
+        'volatility_effect': -0.02
+    },
+    {
+        'name': 'Волатильность на рынке',
+        'description': 'Повышенная волатильность на финансовых рынках',
+        'effects': {'акции': 0.05},
+        'volatility_effect': 0.1
+    },
+    {
+        'name': 'Стабильность в экономике',
+        'description': 'Экономическая стабильность положительно влияет на рынок',
+        'effects': {'облигации': 0.02, 'акции': 0.03},
+        'volatility_effect': -0.05
+    },
+    {
+        'name': 'Рост инфляции',
+        'description': 'Уровень инфляции'
+                       ' превысил ожидания',
+        'effects': {'облигации': -0.03, 'акции': -0.02},
+        'volatility_effect': 0.04
+    },
+    {
+        'name': 'Укрепление рубля',
+        'description': 'Рубль укрепился по отношению к мировым валютам',
+        'effects': {'VTBR': -0.04, 'SBER': 0.01},
+        'volatility_effect': -0.03
+    },
+    {
+        'name': 'Новые санкции',
+        'description': 'Введены новые экономические санкции',
+        'effects': {'акции': -0.06, 'облигации': -0.02},
+        'volatility_effect': 0.08
+    },
+    {
+        'name': 'Позитивные корпоративные новости',
+        'description': 'Крупные компании сообщили о росте прибыли',
+        'effects': {'акции': 0.04},
+        'volatility_effect': 0.02
+    }
+]
+
+
+# Встроенные события, которые возвращает use_universe(None)
+_BUILTIN_EVENTS = list(MARKET_EVENTS)
+
+_event_table: Optional[EventTable] = None
+_event_table_source: Optional[List[Dict[str, Any]]] = None
+
+
+def get_event_table(catalog: Optional[AssetCatalog] = None) -> EventTable:
+    """
+    Возвращает таблицу MARKET_EVENTS, скомпилированную под каталог.
+
+    Таблица компилируется заново, если сменился каталог или список событий
+    (заменен или дополнен).
+
+    Args:
+        catalog: Каталог активов (по умолчанию общий каталог)
+    """
+    global _event_table, _event_table_source
+    if catalog is None:
+        catalog = get_catalog()
+    table = _event_table
+    if (table is None or table.catalog is not catalog or
+            _event_table_source is not MARKET_EVENTS or
+            len(table) != len(MARKET_EVENTS)):
+        _event_table = EventTable(MARKET_EVENTS, catalog)
+        _event_table_source = MARKET_EVENTS
+    return _event_table
+
+
+def use_universe(
+        catalog: Optional[AssetCatalog],
+        events: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """
+    Подключает набор активов и событий, загруженный из файлов данных
+    (например, universe.load_universe).
+
+    Список MARKET_EVENTS заменяется на месте, поэтому модули, которые
+    импортировали его, видят новые события. Сессии переходят на новый
+    каталог при сбросе игры.
+
+    Args:
+        catalog: Каталог активов; None возвращает каталог из ASSETS и
+                 встроенные события
+        events: События в формате MARKET_EVENTS (по умолчанию остаются
+                текущие)
+    """
+    global _universe_catalog, _event_table
+    _universe_catalog = catalog
+    if catalog is None:
+        events = _BUILTIN_EVENTS
+    if events is not None:
+        MARKET_EVENTS[:] = events
+    _event_table = None
+
+
+def make_seed() -> int:
+    """Возвращает новое случайное зерно игры из энтропии ОС."""
+    return int(np.random.SeedSequence().entropy)
+
+
+def make_rng_streams(
+        seed: int
+) -> Tuple[np.random.Generator, np.random.Generator]:
+    """
+    Создает независимые генераторы событий и ценового шума из зерна игры.
+
+    Args:
+        seed: Зерно игры
+
+    Returns:
+        Кортеж (генератор событий, генератор цен)
+    """
+    event_sequence, price_sequence = np.random.SeedSequence(seed).spawn(2)
+    return (
+        np.random.Generator(np.random.PCG64(event_sequence)),
+        np.random.Generator(np.random.PCG64(price_sequence))
+    )
+
+
+class GameState:
+    """Класс для управления состоянием игры."""
+
+    def __init__(
+            self,
+            price_engine: Optional[Any] = None,
+            market: Optional[MarketState] = None,
+            seed: Optional[int] = None,
+            journal: Optional[Any] = None,
+            ticks_per_week: int = TICKS_PER_WEEK,
+            return_model: Optional[Any] = None,
+            price_history: Optional[Any] = None,
+            history_start: int = 0
+    ):
+        """
+        Инициализация состояния игры.
+
+        Args:
+            price_engine: Движок цен с массивами (например,
+                          price_engine.VectorPriceEngine). Если не задан,
+                          цены обновляются по активам сессии поштучно.
+            market: Рыночное состояние сессии (по умолчанию создается
+                    новое по общему каталогу)
+            seed: Зерно игры; одинаковое зерно дает одинаковую игру
+                  (по умолчанию выбирается случайно)
+            journal: Журнал действий (например, journal.Journal), в который
+                     записываются сделки, недели, события и начисления
+            ticks_per_week: Число тиков в неделе; за тик цены меняются
+                            на волатильность, деленную на корень из числа
+                            тиков, а начисляется доля годовой ставки за тик
+            return_model: Модель коррелированной доходности (например,
+                          return_model.CholeskyReturnModel); по умолчанию
+                          шоки активов независимы и равномерны
+            price_history: История цен (price_history.PriceHistory): цены
+                           активов, которые в ней есть, читаются по строке
+                           на тик вместо случайных изменений
+            history_start: Строка истории, с которой начинается игра
+
+        Raises:
+            ValueError: Если ticks_per_week меньше 1, история задана вместе
+                        с движком цен или в ней не хватает строк на игру
+        """
+        if ticks_per_week < 1:
+            raise ValueError("Число тиков в неделе должно быть больше 0")
+        if price_history is not None:
+            if price_engine is not None:
+                raise ValueError("История цен не совмещается с движком цен")
+            needed = history_start + (TOTAL_WEEKS - 1) * ticks_per_week + 1
+            if history_start < 0 or len(price_history) < needed:
+                raise ValueError(
+                    f"В истории цен {len(price_history)} строк, для игры "
+                    f"со строки {history_start} нужно {needed}"
+                )
+        self.price_engine = price_engine
+        self.return_model = return_model
+        self.price_history = price_history
+        self.history_start = history_start
+        self.journal = journal
+        self.seed = seed if seed is not None else make_seed()
+        self.event_rng, self.price_rng = make_rng_streams(self.seed)
+        self.market = market if market is not None else MarketState(get_catalog())
+        self.current_week = 1
+        self.ticks_per_week = ticks_per_week
+        # Сколько тиков текущей недели уже прошло (0 - неделя завершена)
+        self.tick_in_week = 0
+        # Делитель волатильности за тик: за неделю дисперсия та же
+        self._tick_scale = math.sqrt(ticks_per_week)
+        self.periods_per_year = WEEKS_PER_YEAR * ticks_per_week
+        self.total_weeks = TOTAL_WEEKS
+        self.initial_balance = INITIAL_BALANCE
+        self.player = {
+            'balance': INITIAL_BALANCE,
+            'portfolio': {},
+            'total_value': INITIAL_BALANCE,
+            'total_profit': 0.0,
+            'trades_today': 0,
+            'max_trades_per_day': MAX_TRADES_PER_DAY,
+            'history': [INITIAL_BALANCE] * TOTAL_WEEKS,
+            'dividends_earned': 0.0,
+            'interest_earned': 0.0
+        }
+        self.current_event = None
+        self.selected_asset_ticker = None
+        # Вкладка по умолчанию - акции, а если их нет в каталоге - первая
+        # категория каталога
+        classes = self.market.catalog.class_positions
+        self.selected_asset_type = (
+            'акции' if 'акции' in classes or not classes else next(iter(classes))
+        )
+        self.operation_type = 'buy'
+        self.quantity_input = "10"
+        self.game_finished = False
+        self.message = ""
+        self.message_timer = 0
+        self.message_type = ""
+        self.market_news = []
+        # Биты использованных событий (номера в MARKET_EVENTS) для исключения повторений
+        self.used_event_mask = 0
+        self.market_volatility = 1.0  # Множитель волатильности рынка
+        # Версия состава портфеля для инкрементальной оценки
+        self.holdings_version = 0
+        self._valuation_key = None
+        self._distribution = {}
+        self._holdings_value = 0.0
+        # Очередь поручений, исполняемых пачкой в конце недели
+        self.order_engine = OrderEngine()
+        self._apply_history_start()
+        if ticks_per_week == TICKS_PER_WEEK:
+            self._record(
+                'game', seed=self.seed, weeks=self.total_weeks,
+                balance=self.initial_balance
+            )
+        else:
+            self._record(
+                'game', seed=self.seed, weeks=self.total_weeks,
+                balance=self.initial_balance, ticks=ticks_per_week
+            )
+
+    def _record(self, record_type: str, **fields: Any) -> None:
+        """Записывает действие в журнал, если он подключен."""
+        if self.journal is not None:
+            self.journal.record(record_type, **fields)
+
+    def reset_game(self, seed: Optional[int] = None) -> None:
+        """
+        Сбрасывает игру в начальное состояние.
+
+        Args:
+            seed: Зерно новой игры (по умолчанию выбирается случайно)
+        """
+        self.__init__(
+            self.price_engine, self.market, seed, self.journal,
+            self.ticks_per_week, self.return_model,
+            self.price_history, self.history_start
+        )
+        self.market.reset(get_catalog())
+        self._apply_history_start()
+
+    def _apply_history_start(self) -> None:
+        """Ставит цены активов истории на ее начальную строку."""
+        if self.price_history is None:
+            return
+        positions, columns = self.price_history.bind(self.market.catalog)
+        self.market.update_prices(
+            positions, self.price_history.row(self.history_start, columns),
+            np.zeros(len(positions))
+        )
+
+    def next_week(self) -> bool:
+        """
+        Переход к следующей неделе: проводит все ее тики.
+
+        Если неделя уже начата тиками, доводит ее до конца. Когда после
+        первого тика ничего не может сработать внутри недели (нет журнала,
+        поручений и движка цен), оставшиеся тики считаются одним
+        векторизованным проходом.
+
+        Returns:
+            True если игра продолжается, False если игра завершена
+        """
+        if not self.next_tick():
+            return False
+
+        remaining = (self.ticks_per_week - self.tick_in_week) % self.ticks_per_week
+        if remaining and self._can_fast_forward():
+            self._fast_forward_ticks(remaining)
+        else:
+            for _ in range(remaining):
+                self.next_tick()
+        return True
+
+    def next_tick(self) -> bool:
+        """
+        Переход к следующему тику; первый тик недели начинает новую неделю.
+
+        Returns:
+            True если игра продолжается, False если игра завершена
+        """
+        # Поручения, поданные за тик, исполняются до его завершения
+        if self.order_engine.pending:
+            self.settle_orders()
+
+        if self.tick_in_week == 0:
+            if self.current_week >= self.total_weeks:
+                self.game_finished = True
+                self._record('finish', week=self.current_week)
+                return False
+            self._start_week()
+        else:
+            self._record(
+                'tick', week=self.current_week, tick=self.tick_in_week + 1
+            )
+            self.player['trades_today'] = 0
+
+        self.update_prices()
+        self.apply_dividends_and_interest()
+        self.update_portfolio_value()
+        self._end_tick()
+        return True
+
+    def _start_week(self) -> None:
+        """Начинает новую неделю: сбрасывает новости и применяет событие."""
+        self.current_week += 1
+        self._record('week', week=self.current_week)
+        self.player['trades_today'] = 0
+        self.market_news = []
+
+        if self.event_rng.random() < 0.6:
+            self.apply_market_event()
+
+    def _end_tick(self) -> None:
+        """Завершает тик и записывает итог недели в историю после последнего."""
+        self.tick_in_week = (self.tick_in_week + 1) % self.ticks_per_week
+        if self.tick_in_week == 0 and self.current_week <= self.total_weeks:
+            self.player['history'][self.current_week - 1] = (
+                self.player['total_value']
+            )
+
+    def _can_fast_forward(self) -> bool:
+        """Проверяет, можно ли пропустить тики без пошаговой симуляции."""
+        engine = self.order_engine
+        return (
+            self.journal is None and self.price_engine is None and
+            self.price_history is None and
+            not engine.pending and not engine.resting
+        )
+
+    def _fast_forward_ticks(self, count: int) -> None:
+        """
+        Проводит count тиков текущей недели одним проходом по массивам.
+
+        Ценовой шум берется из того же потока и в том же порядке, что и при
+        пошаговых тиках, поэтому цены совпадают бит в бит; начисления
+        суммируются за все тики сразу и могут отличаться на ошибку
+        округления.
+
+        Args:
+            count: Число тиков (не больше оставшихся в неделе)
+        """
+        market = self.market
+        catalog = market.catalog
+        positions = catalog.moving_positions
+        adjusted = catalog.volatilities[positions] * (
+            self.market_volatility / self._tick_scale
+        )
+        changes = self._price_changes(adjusted, positions, count)
+
+        # Строки пути: цена до тиков и после каждого тика
+        path = np.empty((count + 1, len(positions)))
+        path[0] = market.prices[positions]
+        path[1:] = 1 + changes
+        np.cumprod(path, axis=0, out=path)
+        if path.min() < 0.01:
+            # Пол цены меняет траекторию, считаем его по тикам
+            for row in range(1, count + 1):
+                path[row] = np.maximum(0.01, path[row - 1] * (1 + changes[row - 1]))
+
+        price_sums = market.prices * count
+        price_sums[positions] = path[1:].sum(axis=0)
+        market.update_prices(
+            positions, path[-1], (path[-1] - path[-2]) / path[-2] * 100
+        )
+
+        rows, columns = np.nonzero(np.abs(changes) > adjusted * 0.8)
+        moves = changes[rows, columns]
+        # Текст новости определяется активом, направлением и десятыми долями
+        # процента, поэтому форматируется только первое вхождение каждой
+        # тройки; значения у границы округления форматируются все
+        scaled = np.abs(moves) * 1000
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        keys = (
+            ((columns << 1) + (moves > 0)) << 32
+        ) + np.rint(scaled).astype(np.int64)
+        _, first = np.unique(keys, return_index=True)
+        for entry in np.union1d(first, np.flatnonzero(near_tie)).tolist():
+            change = float(moves[entry])
+            direction = "рост" if change > 0 else "падение"
+            name = catalog.names[positions[columns[entry]]]
+            news_text = f"📊 {name}: {direction} на {abs(change * 100):.1f}%"
+            if news_text not in self.market_news:
+                self.market_news.append(news_text)
+
+        self.player['trades_today'] = 0
+        self.apply_dividends_and_interest(price_sums, count)
+        self.update_portfolio_value()
+        self.tick_in_week = (self.tick_in_week + count - 1) % self.ticks_per_week
+        self._end_tick()
+
+    def _can_settle_analytically(self) -> bool:
+        """
+        Проверяет, определен ли итог игры без ценового шума: портфель
+        состоит только из денег и активов с нулевой волатильностью.
+        """
+        if self.tick_in_week != 0 or not self._can_fast_forward():
+            return False
+        catalog = self.market.catalog
+        for ticker, quantity in self.player['portfolio'].items():
+            position = catalog.positions.get(ticker)
+            if position is None or catalog.volatilities[position] != 0:
+                return False
+        return True
+
+    def _settle_analytically(self) -> None:
+        """
+        Проводит оставшиеся недели без расчета тиков.
+
+        Цены активов портфеля меняются только рыночными событиями, поэтому
+        разыгрываются лишь события недель; начисления за все недели и
+        история стоимости считаются одной операцией над матрицей цен
+        (недели x активы). Ценовой шум остальных активов не моделируется:
+        на итог портфеля он не влияет.
+        """
+        market = self.market
+        weeks = self.total_weeks - self.current_week
+        if weeks <= 0:
+            return
+
+        # Цены после события каждой недели; внутри недели они не меняются
+        prices = np.empty((weeks, len(market.catalog)))
+        for row in range(weeks):
+            self.current_week += 1
+            self.market_news = []
+            if self.event_rng.random() < 0.6:
+                self.apply_market_event()
+            prices[row] = market.prices
+
+        table = get_accrual_table(market.catalog)
+        holdings = table.holdings(self.player['portfolio'])
+        ticks = self.ticks_per_week
+        dividends, interest = table.totals(
+            table.accrue(holdings, prices * ticks, self.periods_per_year, ticks)
+        )
+        balances = self.player['balance'] + np.cumsum(dividends + interest)
+        history = self.player['history']
+        first = self.current_week - weeks
+        history[first:self.current_week] = (balances + prices @ holdings).tolist()
+
+        self.player['balance'] = float(balances[-1])
+        self.player['dividends_earned'] += float(dividends.sum())
+        self.player['interest_earned'] += float(interest.sum())
+        self.player['trades_today'] = 0
+        self.update_portfolio_value()
+
+    def fast_forward(self) -> None:
+        """
+        Доигрывает игру до конца без пошагового расчета тиков, где это возможно.
+
+        Если итог портфеля не зависит от ценового шума (только деньги и
+        вклады), оставшиеся недели считаются сразу, иначе - по неделям.
+        """
+        while True:
+            if self._can_settle_analytically():
+                self._settle_analytically()
+            if not self.next_week():
+                break
+
+    @property
+    def used_events(self) -> List[Dict[str, Any]]:
+        """Использованные события в порядке MARKET_EVENTS."""
+        return get_event_table(self.market.catalog).events_in(self.used_event_mask)
+
+    @used_events.setter
+    def used_events(self, events: List[Dict[str, Any]]) -> None:
+        self.used_event_mask = get_event_table(self.market.catalog).mask_of(events)
+
+    def apply_market_event(self) -> None:
+        """Применяет случайное рыночное событие."""
+        table = get_event_table(self.market.catalog)
+        if not table:
+            return
+
+        # Исключаем повторяющиеся события; если все уже были, начинаем заново
+        if self.used_event_mask == table.full_mask:
+            self.used_event_mask = 0
+        available = table.free_indices(self.used_event_mask)
+
+        index = available[self.event_rng.integers(len(available))]
+        event = table.events[index]
+        self.current_event = event
+        self.used_event_mask |= 1 << index
+        self._record('event', index=index, name=event['name'])
+
+        # Добавляем новость о событии
+        self.market_news.append(
+            f"📈 {event['name']}: {event['description']}"
+        )
+
+        # Применяем эффект волатильности
+        self.market_volatility *= (1 + table.volatility_effects[index])
+        # Ограничиваем волатильность
+        self.market_volatility = max(0.5, min(2.0, self.market_volatility))
+
+        # Применяем эффекты к активам одним умножением
+        positions = table.positions[index]
+        if len(positions):
+            market = self.market
+            old_prices = market.prices[positions]
+            new_prices = np.maximum(0.01, old_prices * table.multipliers[index])
+            market.update_prices(
+                positions, new_prices, (new_prices - old_prices) / old_prices * 100
+            )
+
+        if self.order_engine.resting:
+            self.trigger_orders()
+
+    def update_prices(self) -> None:
+        """Обновляет цены активов с учетом волатильности."""
+        if self.price_history is not None:
+            self._update_historical_prices()
+        elif self.price_engine is not None:
+            self._update_prices_vectorized()
+        else:
+            self._update_moving_prices()
+
+        if self.journal is not None:
+            self._record('prices', checksum=self.market.checksum())
+
+        if self.order_engine.resting:
+            self.trigger_orders()
+
+    def _update_prices_vectorized(self) -> None:
+        """Обновляет цены всех активов одним шагом движка цен."""
+        # Рыночное событие могло изменить цены сессии
+        self.price_engine.set_prices(self.market.prices, self.market.changes)
+        news = self.price_engine.step(
+            self.market_volatility / self._tick_scale, self.price_rng,
+            self._checked_return_model()
+        )
+        self.market.set_prices(self.price_engine.prices, self.price_engine.changes)
+
+        for news_text in news:
+            if news_text not in self.market_news:
+                self.market_news.append(news_text)
+
+    def _update_historical_prices(self) -> None:
+        """
+        Читает цены тика из истории.
+
+        Новая цена - цена истории на строке тика, умноженная на отношение
+        текущей цены к цене истории на прошлой строке: без рыночных событий
+        цены повторяют историю точно, а сдвиг от события сохраняется.
+        Активы, которых нет в истории, не меняются.
+        """
+        market = self.market
+        history = self.price_history
+        positions, columns = history.bind(market.catalog)
+        row = (
+            self.history_start + (self.current_week - 2) * self.ticks_per_week +
+            self.tick_in_week + 1
+        )
+        old_prices = market.prices[positions]
+        new_prices = np.maximum(0.01, history.row(row, columns) * (
+            old_prices / history.row(row - 1, columns)
+        ))
+        changes = new_prices / old_prices - 1
+        market.update_prices(positions, new_prices, changes * 100)
+
+        # Новости о движениях сильнее 80% коридора волатильности за тик
+        thresholds = market.catalog.volatilities[positions] * 0.8 / self._tick_scale
+        for index in np.flatnonzero(np.abs(changes) > thresholds).tolist():
+            change = float(changes[index])
+            direction = "рост" if change > 0 else "падение"
+            name = market.catalog.names[positions[index]]
+            news_text = f"📊 {name}: {direction} на {abs(change * 100):.1f}%"
+            if news_text not in self.market_news:
+                self.market_news.append(news_text)
+
+    def _update_moving_prices(self) -> None:
+        """
+        Обновляет цены активов с ненулевой волатильностью.
+
+        Изменение каждого актива равномерно распределено в коридоре его
+        волатильности, умноженной на волатильность рынка (за тик - деленной
+        на корень из числа тиков в неделе); изменения берутся из потока цен
+        по одному на актив в порядке каталога.
+        """
+        market = self.market
+        catalog = market.catalog
+        positions = catalog.moving_positions
+        adjusted = catalog.volatilities[positions] * (
+            self.market_volatility / self._tick_scale
+        )
+        changes = self._price_changes(adjusted, positions)
+        old_prices = market.prices[positions]
+        new_prices = np.maximum(0.01, old_prices * (1 + changes))
+        market.update_prices(
+            positions, new_prices, (new_prices - old_prices) / old_prices * 100
+        )
+
+        for index in np.flatnonzero(np.abs(changes) > adjusted * 0.8).tolist():
+            change = float(changes[index])
+            direction = "рост" if change > 0 else "падение"
+            name = catalog.names[positions[index]]
+            news_text = f"📊 {name}: {direction} на {abs(change * 100):.1f}%"
+            if news_text not in self.market_news:
+                self.market_news.append(news_text)
+
+    def _price_changes(
+            self,
+            adjusted: np.ndarray,
+            positions: np.ndarray,
+            count: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Порождает изменения цен активов за один тик или count тиков.
+
+        Args:
+            adjusted: Коридоры волатильности активов за тик
+            positions: Позиции активов в каталоге
+            count: Число тиков (по умолчанию один тик)
+
+        Returns:
+            Изменения в долях: массив len(positions) или (count, len(positions))
+        """
+        model = self._checked_return_model()
+        if model is not None:
+            return correlated_changes(
+                model, self.price_rng, adjusted, positions, count
+            )
+        shape = len(positions) if count is None else (count, len(positions))
+        # То же, что uniform(-adjusted, adjusted), без проверок аргументов,
+        # которые на маленьком каталоге дороже самого расчета
+        return (adjusted + adjusted) * self.price_rng.random(shape) - adjusted
+
+    def _checked_return_model(self) -> Optional[Any]:
+        """Возвращает модель доходности, проверив ее размер по каталогу."""
+        model = self.return_model
+        if model is not None and model.size != len(self.market.catalog):
+            raise ValueError("Размер модели доходности не совпадает с каталогом")
+        return model
+
+    def apply_dividends_and_interest(
+            self,
+            price_sums: Optional[Sequence[float]] = None,
+            ticks: int = 1
+    ) -> None:
+        """
+        Начисляет дивиденды и проценты по активам за ticks тиков.
+
+        Все начисления считаются одной операцией над вектором количеств
+        портфеля и векторами ставок каталога (accrual.AccrualTable).
+
+        Args:
+            price_sums: Суммы цен активов за эти тики в порядке каталога
+                        (по умолчанию текущие цены - один тик)
+            ticks: Число тиков
+        """
+        if not self.player['portfolio']:
+            return
+        if price_sums is None:
+            price_sums = self.market.prices
+        table = get_accrual_table(self.market.catalog)
+        amounts = table.accrue(
+            table.holdings(self.player['portfolio']), price_sums,
+            self.periods_per_year, ticks
+        )
+        dividends, interest = table.totals(amounts)
+        self.player['balance'] += float(dividends + interest)
+        self.player['dividends_earned'] += float(dividends)
+        self.player['interest_earned'] += float(interest)
+
+        if self.journal is not None:
+            tickers = self.market.catalog.tickers
+            for position in np.flatnonzero(amounts).tolist():
+                self._record(
+                    'accrual', kind=table.kinds[position],
+                    ticker=tickers[position],
+                    amount=float(amounts[position])
+                )
+
+    @property
+    def price_version(self) -> int:
+        """Версия цен сессии, растет при каждом изменении цен."""
+        return self.market.version
+
+    @property
+    def valuation_version(self) -> Tuple[int, int]:
+        """Версия оценки портфеля: (версия цен, версия состава портфеля)."""
+        return self.price_version, self.holdings_version
+
+    def _refresh_valuation(self) -> None:
+        """
+        Пересчитывает стоимость позиций, только если изменились цены
+        или состав портфеля.
+        """
+        key = self.valuation_version
+        if self._valuation_key == key:
+            return
+
+        positions = self.market.catalog.positions
+        prices = self.market.prices.tolist()
+        distribution = {}
+        holdings_value = 0
+        for ticker, quantity in self.player['portfolio'].items():
+            position = positions.get(ticker)
+            if position is not None:
+                value = prices[position] * quantity
+                distribution[ticker] = value
+                holdings_value += value
+
+        self._distribution = distribution
+        self._holdings_value = holdings_value
+        self._valuation_key = key
+
+    def _apply_holdings_delta(
+            self,
+            ticker: str,
+            quantity: int,
+            price: float
+    ) -> None:
+        """
+        Учитывает сделку в кэше оценки без полного пересчета портфеля.
+
+        Args:
+            ticker: Тикер актива
+            quantity: Изменение количества (отрицательное при продаже)
+            price: Цена сделки
+        """
+        cache_valid = self._valuation_key == self.valuation_version
+        self.holdings_version += 1
+        if not cache_valid:
+            return
+
+        value = self._distribution.get(ticker, 0) + price * quantity
+        if ticker in self.player['portfolio']:
+            self._distribution[ticker] = value
+        else:
+            self._distribution.pop(ticker, None)
+        self._holdings_value += price * quantity
+        self._valuation_key = self.valuation_version
+
+    def update_portfolio_value(self) -> None:
+        """Обновляет общую стоимость портфеля."""
+        self._refresh_valuation()
+        total = self.player['balance'] + self._holdings_value
+
+        self.player['total_value'] = total
+        self.player['total_profit'] = total - self.initial_balance
+
+    def find_asset_by_ticker(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Находит актив по тикеру.
+
+        Args:
+            ticker: Тикер актива
+
+        Returns:
+            Данные актива или None если не найден
+        """
+        return self.market.get(ticker)
+
+    def place_order(
+            self,
+            side: str,
+            ticker: str,
+            quantity: int,
+            allow_partial: bool = True,
+            kind: str = ORDER_MARKET,
+            trigger_price: Optional[float] = None
+    ) -> Order:
+        """
+        Подает поручение.
+
+        Рыночное поручение исполняется в settle_orders или при переходе к
+        следующей неделе. Лимитное и стоп-поручение ждет, пока цена не
+        дойдет до trigger_price, и исполняется по текущей цене сразу после
+        ее изменения; если цена уже дошла, исполняется немедленно.
+
+        Args:
+            side: Сторона сделки ('buy' или 'sell')
+            ticker: Тикер актива
+            quantity: Количество
+            allow_partial: Разрешено ли частичное исполнение
+            kind: Вид поручения ('market', 'limit' или 'stop')
+            trigger_price: Лимитная или стоп-цена
+
+        Returns:
+            Поручение (отклоненное сразу, если оно некорректно)
+        """
+        order = self.order_engine.submit(
+            Order(side, ticker, quantity, allow_partial, kind, trigger_price)
+        )
+        if order.id is not None:
+            self._record(
+                'order', id=order.id, side=side, ticker=ticker,
+                quantity=quantity, kind=kind, trigger_price=trigger_price,
+                allow_partial=allow_partial
+            )
+            self.trigger_orders([ticker])
+        return order
+
+    def cancel_order(self, order_id: int) -> bool:
+        """
+        Отменяет ожидающее лимитное или стоп-поручение.
+
+        Args:
+            order_id: Номер поручения
+
+        Returns:
+            True если поручение было отменено
+        """
+        cancelled = self.order_engine.cancel(order_id)
+        if cancelled:
+            self._record('cancel', id=order_id)
+        return cancelled
+
+    def trigger_orders(self, tickers: Optional[List[str]] = None) -> List[Order]:
+        """
+        Исполняет лимитные и стоп-поручения, сработавшие при текущих ценах.
+
+        Args:
+            tickers: Тикеры для проверки (по умолчанию все с поручениями)
+
+        Returns:
+            Сработавшие поручения с результатами исполнения
+        """
+        fired = self.order_engine.trigger(self, tickers)
+        if fired:
+            self.update_portfolio_value()
+        return fired
+
+    def settle_orders(self) -> List[Order]:
+        """
+        Исполняет очередь поручений и один раз переоценивает портфель.
+
+        Returns:
+            Поручения пачки с результатами исполнения
+        """
+        orders = self.order_engine.settle(self)
+        self.update_portfolio_value()
+        return orders
+
+    def apply_fill(
+            self,
+            side: str,
+            ticker: str,
+            quantity: int,
+            price: float,
+            order_id: Optional[int] = None
+    ) -> None:
+        """
+        Учитывает исполненную сделку в балансе, портфеле и кэше оценки.
+
+        Args:
+            side: Сторона сделки ('buy' или 'sell')
+            ticker: Тикер актива
+            quantity: Исполненное количество
+            price: Цена исполнения
+            order_id: Номер сработавшего лимитного или стоп-поручения
+        """
+        portfolio = self.player['portfolio']
+        if side == ORDER_BUY:
+            self.player['balance'] -= price * quantity
+            portfolio[ticker] = portfolio.get(ticker, 0) + quantity
+            delta = quantity
+        else:
+            self.player['balance'] += price * quantity
+            remaining = portfolio[ticker] - quantity
+            if remaining > 0:
+                portfolio[ticker] = remaining
+            else:
+                del portfolio[ticker]
+            delta = -quantity
+
+        self._apply_holdings_delta(ticker, delta, price)
+        if order_id is None:
+            self._record(
+                'trade', side=side, ticker=ticker, quantity=quantity, price=price
+            )
+        else:
+            self._record(
+                'trade', side=side, ticker=ticker, quantity=quantity,
+                price=price, order=order_id
+            )
+        self.player['trades_today'] += 1
+
+    def execute_trade(self) -> Tuple[bool, str]:
+        """
+        Сразу выполняет торговую операцию operation_type по выбранному
+        активу.
+
+        Returns:
+            Кортеж (успех, сообщение)
+        """
+        if self.player['trades_today'] >= self.player['max_trades_per_day']:
+            return False, "Достигнут лимит сделок на сегодня"
+
+        try:
+            quantity = int(self.quantity_input)
+            if quantity <= 0:
+                return False, "Количество должно быть больше 0"
+        except ValueError:
+            return False, "Неверное количество"
+
+        if not self.selected_asset_ticker:
+            return False, "Выберите актив"
+
+        order = Order(
+            self.operation_type, self.selected_asset_ticker, quantity,
+            allow_partial=False
+        )
+        self.order_engine.execute(self, order)
+        if order.is_filled:
+            self.update_portfolio_value()
+        return order.is_filled, order.message
+
+    def get_portfolio_distribution(self) -> Tuple[Dict[str, float], float]:
+        """
+        Возвращает распределение портфеля.
+
+        Результат кэшируется до изменения цен или состава портфеля;
+        словарь распределения не следует изменять.
+
+        Returns:
+            Кортеж (распределение, общая стоимость)
+        """
+        self._refresh_valuation()
+        return self._distribution, self._holdings_value
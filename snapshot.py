@@ -0,0 +1,470 @@
+"""
+Компактные бинарные снимки состояния игры.
+
+Снимок содержит все, что нужно для продолжения сессии: данные игрока,
+портфель, историю, цены сессии, множитель волатильности, использованные
+события, состояние генераторов случайных чисел и ожидающие лимитные и
+стоп-поручения. Формат версионируется:
+заголовок (сигнатура, версия, CRC32) и сжатое zlib тело из полей struct.
+"""
+
+import os
+import queue
+import struct
+import threading
+import zlib
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from order_engine import Order
+from simulation_core import MARKET_EVENTS, TICKS_PER_WEEK, GameState, get_catalog
+
+SNAPSHOT_MAGIC = b'VTBS'
+# Версия 2 добавила ожидающие поручения, версия 3 - тики внутри недели;
+# снимки прежних версий читаются без этих данных
+SNAPSHOT_VERSION = 3
+# Уровень сжатия zlib: снимки маленькие, важнее скорость
+COMPRESSION_LEVEL = 6
+
+_HEADER = struct.Struct('<4sHI')
+_SCALARS = struct.Struct('<4H?7dh')
+_COUNT = struct.Struct('<H')
+_SIZE = struct.Struct('<I')
+_QUANTITY = struct.Struct('<q')
+_RNG_TAIL = struct.Struct('<BI')
+_ORDER = struct.Struct('<Iqd?')
+_TICKS = struct.Struct('<II')
+# Отсутствующая строка (None) кодируется этой длиной
+_NONE_LENGTH = 0xFFFF
+
+
+def _pack_str(value: Optional[str]) -> bytes:
+    """Кодирует строку с префиксом длины (None допускается)."""
+    if value is None:
+        return _COUNT.pack(_NONE_LENGTH)
+    data = value.encode('utf-8')
+    return _COUNT.pack(len(data)) + data
+
+
+def _pack_int(value: int) -> bytes:
+    """Кодирует неотрицательное целое произвольной длины."""
+    data = value.to_bytes((value.bit_length() + 7) // 8 or 1, 'little')
+    return bytes([len(data)]) + data
+
+
+def _pack_rng(rng: np.random.Generator) -> bytes:
+    """Кодирует состояние генератора PCG64."""
+    state = rng.bit_generator.state
+    if state['bit_generator'] != 'PCG64':
+        raise ValueError(
+            f"Неподдерживаемый генератор {state['bit_generator']}"
+        )
+    return (
+            state['state']['state'].to_bytes(16, 'little') +
+            state['state']['inc'].to_bytes(16, 'little') +
+            _RNG_TAIL.pack(state['has_uint32'], state['uinteger'])
+    )
+
+
+def _event_index(event: Any) -> int:
+    """Возвращает индекс события в MARKET_EVENTS."""
+    for index, known_event in enumerate(MARKET_EVENTS):
+        if known_event is event:
+            return index
+    raise ValueError(f"Событие {event.get('name')} не найдено в MARKET_EVENTS")
+
+
+def encode_game_state(game_state: GameState) -> bytes:
+    """
+    Кодирует состояние игры в несжатое тело снимка.
+
+    Args:
+        game_state: Состояние игры
+
+    Returns:
+        Тело снимка без заголовка
+    """
+    player = game_state.player
+    current_event = (
+        -1 if game_state.current_event is None
+        else _event_index(game_state.current_event)
+    )
+    market = game_state.market
+
+    parts = [
+        _SCALARS.pack(
+            game_state.current_week, game_state.total_weeks,
+            player['trades_today'], player['max_trades_per_day'],
+            game_state.game_finished,
+            game_state.initial_balance, player['balance'],
+            player['total_value'], player['total_profit'],
+            player['dividends_earned'], player['interest_earned'],
+            game_state.market_volatility, current_event
+        ),
+        _pack_int(game_state.seed),
+        _pack_str(game_state.selected_asset_type),
+        _pack_str(game_state.selected_asset_ticker),
+        _pack_str(game_state.operation_type),
+        _pack_str(game_state.quantity_input),
+        _COUNT.pack(len(game_state.used_events)),
+    ]
+    parts.extend(
+        _COUNT.pack(_event_index(event)) for event in game_state.used_events
+    )
+
+    parts.append(_COUNT.pack(len(player['portfolio'])))
+    for ticker, quantity in player['portfolio'].items():
+        parts.append(_pack_str(ticker))
+        parts.append(_QUANTITY.pack(quantity))
+
+    parts.append(_COUNT.pack(len(player['history'])))
+    parts.append(np.asarray(player['history'], dtype='<f8').tobytes())
+
+    parts.append(_COUNT.pack(len(game_state.market_news)))
+    parts.extend(_pack_str(news) for news in game_state.market_news)
+
+    parts.append(_SIZE.pack(len(market.catalog)))
+    parts.append(_SIZE.pack(market.catalog.fingerprint))
+    parts.append(np.asarray(market.prices, dtype='<f8').tobytes())
+    parts.append(np.asarray(market.changes, dtype='<f8').tobytes())
+
+    parts.append(_pack_rng(game_state.event_rng))
+    parts.append(_pack_rng(game_state.price_rng))
+
+    engine = game_state.order_engine
+    parts.append(_SIZE.pack(engine.next_id))
+    parts.append(_SIZE.pack(len(engine.resting)))
+    for order_id in sorted(engine.resting):
+        order = engine.resting[order_id]
+        parts.append(_pack_str(order.side))
+        parts.append(_pack_str(order.ticker))
+        parts.append(_pack_str(order.kind))
+        parts.append(_ORDER.pack(
+            order.id, order.quantity, order.trigger_price, order.allow_partial
+        ))
+
+    parts.append(_TICKS.pack(game_state.ticks_per_week, game_state.tick_in_week))
+    return b''.join(parts)
+
+
+def compress_snapshot(payload: bytes) -> bytes:
+    """
+    Сжимает тело снимка и добавляет заголовок формата.
+
+    Args:
+        payload: Тело снимка из encode_game_state
+
+    Returns:
+        Готовый снимок
+    """
+    return (
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(payload)) +
+        zlib.compress(payload, COMPRESSION_LEVEL)
+    )
+
+
+def dump_snapshot(game_state: GameState) -> bytes:
+    """
+    Сохраняет состояние игры в бинарный снимок.
+
+    Args:
+        game_state: Состояние игры
+
+    Returns:
+        Снимок в бинарном формате
+    """
+    return compress_snapshot(encode_game_state(game_state))
+
+
+class _Reader:
+    """Последовательное чтение полей из тела снимка."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> Tuple[Any, ...]:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def count(self) -> int:
+        return self.unpack(_COUNT)[0]
+
+    def take(self, size: int) -> bytes:
+        if self.offset + size > len(self.data):
+            raise ValueError("Снимок поврежден: неожиданный конец данных")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def string(self) -> Optional[str]:
+        length = self.count()
+        if length == _NONE_LENGTH:
+            return None
+        return self.take(length).decode('utf-8')
+
+    def integer(self) -> int:
+        length = self.take(1)[0]
+        return int.from_bytes(self.take(length), 'little')
+
+    def floats(self, count: int) -> np.ndarray:
+        return np.frombuffer(self.take(count * 8), dtype='<f8')
+
+    def rng_state(self) -> dict:
+        state = int.from_bytes(self.take(16), 'little')
+        inc = int.from_bytes(self.take(16), 'little')
+        has_uint32, uinteger = self.unpack(_RNG_TAIL)
+        return {
+            'bit_generator': 'PCG64',
+            'state': {'state': state, 'inc': inc},
+            'has_uint32': has_uint32,
+            'uinteger': uinteger
+        }
+
+
+def load_snapshot(
+        data: bytes,
+        game_state: Optional[GameState] = None
+) -> GameState:
+    """
+    Восстанавливает состояние игры из бинарного снимка.
+
+    Args:
+        data: Снимок из dump_snapshot
+        game_state: Состояние, в которое восстанавливается снимок (движок
+                    цен и рыночное состояние сохраняются); по умолчанию
+                    создается новое
+
+    Returns:
+        Восстановленное состояние игры
+
+    Raises:
+        ValueError: Если снимок поврежден, имеет другую версию или сделан
+                    для другого каталога активов
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Снимок поврежден: нет заголовка")
+    magic, version, checksum = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Данные не являются снимком игры")
+    if not 1 <= version <= SNAPSHOT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+    try:
+        payload = zlib.decompress(data[_HEADER.size:])
+    except zlib.error as e:
+        raise ValueError(f"Снимок поврежден: {e}") from e
+    if zlib.crc32(payload) != checksum:
+        raise ValueError("Снимок поврежден: неверная контрольная сумма")
+
+    reader = _Reader(payload)
+    try:
+        (current_week, total_weeks, trades_today, max_trades_per_day,
+         game_finished, initial_balance, balance, total_value, total_profit,
+         dividends_earned, interest_earned, market_volatility,
+         current_event) = reader.unpack(_SCALARS)
+        seed = reader.integer()
+        selected_asset_type = reader.string()
+        selected_asset_ticker = reader.string()
+        operation_type = reader.string()
+        quantity_input = reader.string()
+
+        used_events_count = reader.count()
+        used_events = [
+            MARKET_EVENTS[reader.count()] for _ in range(used_events_count)
+        ]
+        if current_event >= 0:
+            current_event = MARKET_EVENTS[current_event]
+        else:
+            current_event = None
+
+        portfolio = {}
+        for _ in range(reader.count()):
+            ticker = reader.string()
+            portfolio[ticker] = reader.unpack(_QUANTITY)[0]
+
+        history = reader.floats(reader.count()).tolist()
+        news_count = reader.count()
+        market_news: List[str] = [reader.string() for _ in range(news_count)]
+
+        catalog_size, = reader.unpack(_SIZE)
+        fingerprint, = reader.unpack(_SIZE)
+        prices = reader.floats(catalog_size)
+        changes = reader.floats(catalog_size)
+
+        event_rng_state = reader.rng_state()
+        price_rng_state = reader.rng_state()
+
+        next_order_id = 1
+        resting_orders = []
+        if version >= 2:
+            next_order_id, = reader.unpack(_SIZE)
+            for _ in range(reader.unpack(_SIZE)[0]):
+                side = reader.string()
+                ticker = reader.string()
+                kind = reader.string()
+                order_id, quantity, trigger_price, allow_partial = (
+                    reader.unpack(_ORDER)
+                )
+                order = Order(
+                    side, ticker, quantity, allow_partial, kind, trigger_price
+                )
+                order.id = order_id
+                resting_orders.append(order)
+
+        ticks_per_week, tick_in_week = TICKS_PER_WEEK, 0
+        if version >= 3:
+            ticks_per_week, tick_in_week = reader.unpack(_TICKS)
+        if not 0 <= tick_in_week < ticks_per_week:
+            raise ValueError("Снимок поврежден: неверный тик недели")
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Снимок поврежден: {e}") from e
+
+    if game_state is None:
+        game_state = GameState()
+    market = game_state.market
+    catalog = get_catalog()
+    if catalog_size != len(catalog) or fingerprint != catalog.fingerprint:
+        raise ValueError("Снимок сделан для другого каталога активов")
+
+    game_state.ticks_per_week = ticks_per_week
+    # Восстановление - не новая игра: журнал не получает записи 'game'
+    journal = game_state.journal
+    game_state.journal = None
+    try:
+        game_state.reset_game(seed)
+    finally:
+        game_state.journal = journal
+    game_state.tick_in_week = tick_in_week
+    game_state.current_week = current_week
+    game_state.total_weeks = total_weeks
+    game_state.game_finished = game_finished
+    game_state.initial_balance = initial_balance
+    game_state.selected_asset_type = selected_asset_type
+    game_state.selected_asset_ticker = selected_asset_ticker
+    game_state.operation_type = operation_type
+    game_state.quantity_input = quantity_input
+    game_state.market_volatility = market_volatility
+    game_state.current_event = current_event
+    game_state.used_events = used_events
+    game_state.market_news = market_news
+    game_state.player.update({
+        'balance': balance,
+        'portfolio': portfolio,
+        'total_value': total_value,
+        'total_profit': total_profit,
+        'trades_today': trades_today,
+        'max_trades_per_day': max_trades_per_day,
+        'history': history,
+        'dividends_earned': dividends_earned,
+        'interest_earned': interest_earned
+    })
+    market.set_prices(prices, changes)
+    game_state.event_rng.bit_generator.state = event_rng_state
+    game_state.price_rng.bit_generator.state = price_rng_state
+    for order in resting_orders:
+        game_state.order_engine.submit(order)
+    game_state.order_engine.next_id = next_order_id
+    return game_state
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Атомарно записывает файл через временный файл рядом с ним."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def save_snapshot(game_state: GameState, path: str) -> None:
+    """
+    Сохраняет снимок игры в файл.
+
+    Args:
+        game_state: Состояние игры
+        path: Путь к файлу снимка
+    """
+    _write_file(path, dump_snapshot(game_state))
+
+
+def read_snapshot(
+        path: str,
+        game_state: Optional[GameState] = None
+) -> GameState:
+    """
+    Загружает снимок игры из файла.
+
+    Args:
+        path: Путь к файлу снимка
+        game_state: Состояние, в которое восстанавливается снимок
+
+    Returns:
+        Восстановленное состояние игры
+    """
+    with open(path, 'rb') as file:
+        return load_snapshot(file.read(), game_state)
+
+
+class SnapshotWriter:
+    """
+    Фоновая запись снимков.
+
+    Состояние кодируется в вызывающем потоке (это быстро и дает
+    согласованный снимок), а сжатие и запись на диск выполняются в
+    отдельном потоке, чтобы автосохранение не задерживало кадр.
+    """
+
+    def __init__(self):
+        """Инициализация писателя; поток запускается при первом снимке."""
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+
+    def submit(self, game_state: GameState, path: str) -> None:
+        """
+        Ставит снимок игры в очередь на запись.
+
+        Args:
+            game_state: Состояние игры
+            path: Путь к файлу снимка
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name='snapshot-writer', daemon=True
+            )
+            self._thread.start()
+        self._queue.put((path, encode_game_state(game_state)))
+
+    def flush(self) -> None:
+        """Ждет записи всех поставленных в очередь снимков."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Записывает оставшиеся снимки и останавливает поток."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Цикл фонового потока."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, payload = item
+                _write_file(path, compress_snapshot(payload))
+            except Exception as e:
+                # Поток должен пережить любую ошибку, иначе следующие снимки
+                # останутся в очереди, а flush будет ждать их вечно
+                self.last_error = e
+                print(f"Ошибка сохранения снимка {item[0]}: {e}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,119 @@
+import os
+import sys
+import unittest
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from accrual import ACCRUAL_DIVIDEND, ACCRUAL_INTEREST, AccrualTable
+from simulation_core import ASSETS, GameState, get_catalog
+
+
+def legacy_accruals(portfolio, prices, periods_per_year, ticks=1):
+    """Начисления по правилам категорий, посчитанные поштучно."""
+    dividends = interest = 0.0
+    for asset in ASSETS['акции']:
+        quantity = portfolio.get(asset['ticker'], 0)
+        dividends += (
+            prices[asset['ticker']] * quantity * asset['dividend'] / 100 /
+            periods_per_year
+        )
+    for asset in ASSETS['облигации']:
+        quantity = portfolio.get(asset['ticker'], 0)
+        interest += (
+            prices[asset['ticker']] * quantity * asset['yield'] / 100 /
+            periods_per_year
+        )
+    for asset in ASSETS['вклады']:
+        quantity = portfolio.get(asset['ticker'], 0)
+        interest += quantity * asset['yield'] / 100 / periods_per_year * ticks
+    return dividends, interest
+
+
+class TestAccrualTable(unittest.TestCase):
+    """Тесты векторного начисления."""
+
+    def setUp(self):
+        self.catalog = get_catalog()
+        self.table = AccrualTable(self.catalog)
+        self.prices = {
+            ticker: self.catalog.base_prices[position]
+            for ticker, position in self.catalog.positions.items()
+        }
+        self.portfolio = {
+            'SBER': 10, 'VTBR': 1000, 'SBER-SB29R': 3, 'VTB-B1379': 5,
+            ASSETS['вклады'][0]['ticker']: 2
+        }
+
+    def test_rate_vectors(self):
+        """Ставки категорий попадают в свои векторы."""
+        sber = self.catalog.positions['SBER']
+        deposit = self.catalog.positions[ASSETS['вклады'][0]['ticker']]
+        self.assertAlmostEqual(self.table.price_rates[sber], 0.068)
+        self.assertEqual(self.table.notional_rates[sber], 0.0)
+        self.assertEqual(self.table.price_rates[deposit], 0.0)
+        self.assertAlmostEqual(
+            self.table.notional_rates[deposit], ASSETS['вклады'][0]['yield'] / 100
+        )
+        self.assertEqual(self.table.kinds[sber], ACCRUAL_DIVIDEND)
+        self.assertEqual(self.table.kinds[deposit], ACCRUAL_INTEREST)
+
+    def test_matches_category_rules(self):
+        """Векторное начисление совпадает с правилами категорий."""
+        holdings = self.table.holdings(self.portfolio)
+        for ticks in (1, 5):
+            price_sums = self.catalog.base_prices * ticks
+            sums = {ticker: price * ticks for ticker, price in self.prices.items()}
+            dividends, interest = self.table.totals(
+                self.table.accrue(holdings, price_sums, 52 * ticks, ticks)
+            )
+            expected = legacy_accruals(self.portfolio, sums, 52 * ticks, ticks)
+            self.assertAlmostEqual(dividends, expected[0], places=9)
+            self.assertAlmostEqual(interest, expected[1], places=9)
+
+    def test_holdings_skip_unknown_and_empty(self):
+        """Неизвестные тикеры и нулевые позиции не приносят начислений."""
+        holdings = self.table.holdings({'NOPE': 10, 'SBER': 0})
+        self.assertFalse(holdings.any())
+
+    def test_many_players(self):
+        """Начисление матрицы портфелей совпадает с начислением по игрокам."""
+        portfolios = [self.portfolio, {}, {'VTBR': 7}]
+        matrix = self.table.holdings_matrix(portfolios)
+        amounts = self.table.accrue(matrix, self.catalog.base_prices, 52)
+        dividends, interest = self.table.totals(amounts)
+        self.assertEqual(dividends.shape, (3,))
+        for row, portfolio in enumerate(portfolios):
+            single = self.table.totals(self.table.accrue(
+                self.table.holdings(portfolio), self.catalog.base_prices, 52
+            ))
+            self.assertAlmostEqual(dividends[row], single[0])
+            self.assertAlmostEqual(interest[row], single[1])
+
+
+class TestGameAccruals(unittest.TestCase):
+    """Тесты начислений в игре."""
+
+    def test_game_balance_and_earnings(self):
+        """Игра зачисляет дивиденды и проценты на баланс."""
+        game_state = GameState(seed=1)
+        portfolio = {'SBER': 10, 'SBER-SB29R': 3, ASSETS['вклады'][0]['ticker']: 2}
+        game_state.player['portfolio'] = dict(portfolio)
+        balance = game_state.player['balance']
+        prices = {
+            ticker: game_state.market.get(ticker)['price']
+            for ticker in get_catalog().positions
+        }
+
+        game_state.apply_dividends_and_interest()
+
+        dividends, interest = legacy_accruals(portfolio, prices, 52)
+        self.assertAlmostEqual(game_state.player['dividends_earned'], dividends)
+        self.assertAlmostEqual(game_state.player['interest_earned'], interest)
+        self.assertAlmostEqual(
+            game_state.player['balance'], balance + dividends + interest
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from event_table import EventTable
+from simulation_core import MARKET_EVENTS, GameState, get_catalog, get_event_table
+
+
+class TestEventTable(unittest.TestCase):
+    """Тесты компиляции рыночных событий."""
+
+    def setUp(self):
+        self.catalog = get_catalog()
+
+    def test_ticker_and_class_effects_compiled(self):
+        """Ключи эффектов разрешаются в позиции каталога."""
+        table = EventTable(MARKET_EVENTS, self.catalog)
+        positions = self.catalog.positions
+
+        effects = dict(zip(table.positions[0].tolist(), table.multipliers[0].tolist()))
+        self.assertEqual(
+            effects, {positions['VTBR']: 1 + 0.08, positions['SBER']: 1 + 0.02}
+        )
+        self.assertEqual(
+            sorted(table.positions[2].tolist()),
+            list(self.catalog.class_positions['акции'])
+        )
+
+    def test_overlapping_and_unknown_keys(self):
+        """Эффекты на один актив перемножаются, неизвестные ключи пропускаются."""
+        event = {
+            'name': 'Тест', 'description': '',
+            'effects': {'акции': 0.1, 'SBER': 0.2, 'NOPE': 0.5}
+        }
+        table = EventTable([event], self.catalog)
+        effects = dict(zip(table.positions[0].tolist(), table.multipliers[0].tolist()))
+        self.assertAlmostEqual(effects[self.catalog.positions['SBER']], 1.1 * 1.2)
+        self.assertEqual(len(effects), len(self.catalog.class_positions['акции']))
+
+    def test_masks(self):
+        """Маска использованных событий переводится в события и обратно."""
+        table = get_event_table()
+        events = [MARKET_EVENTS[1], MARKET_EVENTS[4]]
+        mask = table.mask_of(events)
+        self.assertEqual(mask, 0b10010)
+        self.assertEqual(table.events_in(mask), events)
+        self.assertEqual(table.free_indices(mask), [0, 2, 3, 5, 6, 7])
+        with self.assertRaises(ValueError):
+            table.index_of(dict(MARKET_EVENTS[0]))
+
+
+class TestApplyEvent(unittest.TestCase):
+    """Тесты применения скомпилированных событий в игре."""
+
+    def test_event_applies_effects(self):
+        """Событие меняет цены затронутых активов на свои множители."""
+        for index, event in enumerate(MARKET_EVENTS):
+            game_state = GameState(seed=1)
+            # Свободным остается только проверяемое событие
+            game_state.used_event_mask = get_event_table().full_mask & ~(1 << index)
+            before = game_state.market.prices.tolist()
+
+            game_state.apply_market_event()
+
+            self.assertIs(game_state.current_event, event)
+            after = game_state.market.prices.tolist()
+            for key, value in event['effects'].items():
+                group = game_state.market.assets.get(key)
+                assets = group if group is not None else [game_state.market.get(key)]
+                for asset in assets:
+                    position = get_catalog().positions[asset['ticker']]
+                    self.assertEqual(
+                        after[position], max(0.01, before[position] * (1 + value))
+                    )
+                    self.assertAlmostEqual(asset['change'], value * 100)
+
+    def test_events_do_not_repeat_until_all_used(self):
+        """События не повторяются, пока не использованы все."""
+        game_state = GameState(seed=3)
+        seen = []
+        for _ in range(len(MARKET_EVENTS)):
+            game_state.apply_market_event()
+            seen.append(game_state.current_event['name'])
+        self.assertEqual(len(set(seen)), len(MARKET_EVENTS))
+        self.assertEqual(game_state.used_event_mask, get_event_table().full_mask)
+
+        game_state.apply_market_event()
+        self.assertEqual(bin(game_state.used_event_mask).count('1'), 1)
+
+    def test_used_events_compatibility(self):
+        """Список used_events читается и задается через маску."""
+        game_state = GameState(seed=3)
+        game_state.used_events = [MARKET_EVENTS[2]]
+        self.assertEqual(game_state.used_event_mask, 0b100)
+        self.assertEqual(game_state.used_events, [MARKET_EVENTS[2]])
+
+    def test_scripted_scenario(self):
+        """Сотни событий сценария компилируются при замене списка."""
+        tickers = list(get_catalog().positions)
+        scripted = [
+            {
+                'name': f'Событие {number}', 'description': '',
+                'effects': {tickers[number % len(tickers)]: 0.01},
+                'volatility_effect': 0.0
+            }
+            for number in range(300)
+        ]
+        with patch('simulation_core.MARKET_EVENTS', scripted):
+            game_state = GameState(seed=5)
+            for _ in range(300):
+                game_state.apply_market_event()
+            self.assertEqual(len(get_event_table()), 300)
+            self.assertEqual(len(game_state.used_events), 300)
+        self.assertEqual(len(get_event_table()), len(MARKET_EVENTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import sys
 import os
+import tempfile
 import pygame
 from unittest.mock import Mock, patch, MagicMock
 
@@ -47,8 +48,13 @@ try:
         GameState, Button, InputField, TabButton, AssetCard, VTBAssetCard,
         format_currency, draw_text, load_logo, create_dummy_logo,
         SCREEN_WIDTH, SCREEN_HEIGHT, INITIAL_BALANCE, MAX_TRADES_PER_DAY,
-        TOTAL_WEEKS, ASSETS, VTB_DARK_GRAY, VTB_WHITE
+        TOTAL_WEEKS, ASSETS, VTB_DARK_GRAY, VTB_WHITE, HeaderRenderer,
+        ImageCache, TextCache, AssetCardPool, DirtyRectRenderer,
+        FrameScheduler, FRAME_MODE_RESPONSIVE, FRAME_MODE_POWER_SAVING,
+        AUTOSAVE_PATH, discard_autosave, restore_autosave
     )
+    from market_state import AssetCatalog, MarketState
+    from snapshot import save_snapshot
 except ImportError as e:
     print(f"Ошибка импорта: {e}")
 
@@ -364,6 +370,64 @@ class TestUtilityFunctions(unittest.TestCase):
         self.skipTest("Тест требует реального Pygame Surface - пропускаем")
 
 
+class TestImageCache(unittest.TestCase):
+    """Тесты кэша изображений."""
+
+    @patch('os.path.exists')
+    @patch('pygame.image.load')
+    def test_image_loaded_once(self, mock_load, mock_exists):
+        """Повторное обращение не читает файл заново."""
+        mock_exists.return_value = True
+        mock_load.return_value = Mock()
+        cache = ImageCache()
+
+        first = cache.get('icon.png', (20, 20))
+        second = cache.get('icon.png', (20, 20))
+
+        self.assertIs(first, second)
+        mock_load.assert_called_once()
+
+    @patch('os.path.exists')
+    def test_missing_file_cached(self, mock_exists):
+        """Отсутствующий файл проверяется на диске только один раз."""
+        mock_exists.return_value = False
+        cache = ImageCache()
+
+        self.assertIsNone(cache.get('missing.png', (20, 20)))
+        self.assertIsNone(cache.get('missing.png', (20, 20)))
+        mock_exists.assert_called_once()
+
+
+class TestTextCache(unittest.TestCase):
+    """Тесты LRU-кэша текста."""
+
+    def test_hits_and_misses(self):
+        """Повторный текст берется из кэша."""
+        font = Mock()
+        cache = TextCache(max_size=4)
+
+        first = cache.render(font, "ПОРТФЕЛЬ ИНВЕСТИЦИЙ", VTB_WHITE)
+        second = cache.render(font, "ПОРТФЕЛЬ ИНВЕСТИЦИЙ", VTB_WHITE)
+
+        self.assertIs(first, second)
+        font.render.assert_called_once()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_eviction_keeps_size_bounded(self):
+        """Старые записи вытесняются при переполнении."""
+        font = Mock()
+        cache = TextCache(max_size=2)
+
+        cache.render(font, "1 000 Р", VTB_WHITE)
+        cache.render(font, "2 000 Р", VTB_WHITE)
+        cache.render(font, "1 000 Р", VTB_WHITE)
+        cache.render(font, "3 000 Р", VTB_WHITE)
+
+        self.assertEqual(len(cache), 2)
+        cache.render(font, "1 000 Р", VTB_WHITE)
+        self.assertEqual(cache.hits, 2)
+
+
 class TestUIComponents(unittest.TestCase):
     """Тесты UI компонентов."""
 
@@ -475,6 +539,181 @@ class TestAssetCards(unittest.TestCase):
         self.assertIsInstance(result, bool)
 
 
+class TestAssetCardPool(unittest.TestCase):
+    """Тесты набора карточек активов."""
+
+    def test_cards_created_once(self):
+        """Карточки вкладки создаются один раз."""
+        pool = AssetCardPool()
+
+        first = pool.cards('акции')
+        second = pool.cards('акции')
+
+        self.assertIs(first, second)
+        self.assertEqual(len(first), len(ASSETS['акции']))
+
+    def test_card_at_uses_same_layout(self):
+        """Попадание по карточке использует те же объекты, что и отрисовка."""
+        pool = AssetCardPool()
+        cards = pool.cards('облигации')
+
+        card = pool.card_at('облигации', cards[1].rect.center)
+
+        self.assertIs(card, cards[1])
+        self.assertIsNone(pool.card_at('облигации', (0, 0)))
+
+    def test_missing_category_has_no_cards(self):
+        """Вкладка категории, которой нет в каталоге, пуста."""
+        catalog = AssetCatalog({'вклады': ASSETS['вклады']})
+        pool = AssetCardPool(market=MarketState(catalog))
+
+        self.assertEqual(pool.cards('акции'), [])
+        self.assertIsNone(pool.card_at('акции', (0, 0)))
+
+
+class TestHeaderRenderer(unittest.TestCase):
+    """Тесты кэширования заголовка."""
+
+    def setUp(self):
+        # Шрифты создаются только в init_ui(), подставляем мок
+        patcher = patch('investment_simulator.small_font', mock_font)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_background_rendered_once(self):
+        """Градиент рисуется один раз, дальше используется кэш."""
+        header = HeaderRenderer()
+        surface = Mock()
+
+        with patch.object(
+                HeaderRenderer, '_render_background', return_value=Mock()
+        ) as mock_render:
+            header.draw(surface, "Неделя: 1/12")
+            header.draw(surface, "Неделя: 1/12")
+            header.draw(surface, "Неделя: 2/12")
+
+        mock_render.assert_called_once()
+
+    def test_week_text_rerendered_on_change(self):
+        """Текст недели перерисовывается только при изменении."""
+        header = HeaderRenderer()
+        header._background = Mock()
+
+        header.draw(Mock(), "Неделя: 1/12")
+        week_surface = header._week_surface
+        header.draw(Mock(), "Неделя: 1/12")
+        self.assertIs(header._week_surface, week_surface)
+
+        header.draw(Mock(), "Неделя: 2/12")
+        self.assertEqual(header._week_text, "Неделя: 2/12")
+
+
+class TestAutosave(unittest.TestCase):
+    """Тесты автосохранения."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, 'autosave.vtbs')
+        patcher = patch('investment_simulator.AUTOSAVE_PATH', self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_disabled_by_default(self):
+        """По умолчанию автосохранение выключено."""
+        self.assertIsNone(AUTOSAVE_PATH)
+
+    def test_restore_and_discard(self):
+        """Незавершенная игра восстанавливается, новая игра удаляет снимок."""
+        game_state = GameState(seed=3)
+        game_state.next_week()
+        save_snapshot(game_state, self.path)
+
+        restored = GameState()
+        self.assertTrue(restore_autosave(restored))
+        self.assertEqual(restored.current_week, game_state.current_week)
+
+        discard_autosave()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(restore_autosave(GameState()))
+        discard_autosave()
+
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    """Тесты перерисовки по грязным областям."""
+
+    def setUp(self):
+        self.state = {'balance': 100, 'message': ''}
+        self.draw_calls = []
+        self.renderer = DirtyRectRenderer(Mock())
+        self.balance_panel = self.renderer.add_panel(
+            pygame.Rect(0, 0, 100, 50),
+            lambda: self.draw_calls.append('balance'),
+            lambda: self.state['balance']
+        )
+        self.message_panel = self.renderer.add_panel(
+            pygame.Rect(50, 40, 100, 50),
+            lambda: self.draw_calls.append('message'),
+            lambda: self.state['message']
+        )
+        self.news_panel = self.renderer.add_panel(
+            pygame.Rect(300, 300, 100, 50),
+            lambda: self.draw_calls.append('news'),
+            lambda: None
+        )
+        self.renderer.render()
+        self.draw_calls.clear()
+
+    def test_idle_frame_draws_nothing(self):
+        """Без изменений ничего не перерисовывается."""
+        self.assertEqual(self.renderer.render(), [])
+        self.assertEqual(self.draw_calls, [])
+
+    def test_changed_panel_redraws_with_overlapping(self):
+        """Изменившаяся панель перерисовывается вместе с пересекающими."""
+        self.state['balance'] = 200
+
+        dirty_rects = self.renderer.render()
+
+        self.assertEqual(self.draw_calls, ['balance', 'message'])
+        self.assertIn(self.balance_panel.rect, dirty_rects)
+        self.assertNotIn(self.news_panel.rect, dirty_rects)
+
+
+class TestFrameScheduler(unittest.TestCase):
+    """Тесты планировщика кадров."""
+
+    def test_responsive_mode_ticks_at_fps(self):
+        """В отзывчивом режиме кадры идут с постоянной частотой."""
+        clock = Mock()
+        scheduler = FrameScheduler(clock, FRAME_MODE_RESPONSIVE, fps=60)
+
+        with patch('pygame.time.get_ticks', return_value=100000), \
+                patch.object(pygame.event, 'get', return_value=[]):
+            scheduler.wait_for_events()
+
+        clock.tick.assert_called_once_with(60)
+
+    @patch('pygame.time.get_ticks', return_value=100000)
+    def test_power_saving_waits_until_wake_time(self, mock_ticks):
+        """В простое цикл ждет событие не дольше, чем до wake_time."""
+        scheduler = FrameScheduler(
+            Mock(), FRAME_MODE_POWER_SAVING, idle_timeout=1000, active_period=500
+        )
+        scheduler._last_activity = 0
+
+        with patch.object(pygame.event, 'wait') as mock_wait, \
+                patch.object(pygame.event, 'get', return_value=[]):
+            scheduler.wait_for_events(wake_time=100300)
+
+        mock_wait.assert_called_once_with(300)
+
+    def test_unknown_mode_rejected(self):
+        """Неизвестный режим вызывает ошибку."""
+        with self.assertRaises(ValueError):
+            FrameScheduler(Mock(), 'turbo')
+
+
 class TestSimpleScenarios(unittest.TestCase):
     """Тесты простых сценариев без сложных зависимостей."""
 
@@ -512,9 +751,15 @@ def run_tests():
     # Добавляем тесты
     suite.addTests(loader.loadTestsFromTestCase(TestGameState))
     suite.addTests(loader.loadTestsFromTestCase(TestUtilityFunctions))
+    suite.addTests(loader.loadTestsFromTestCase(TestImageCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestTextCache))
     suite.addTests(loader.loadTestsFromTestCase(TestUIComponents))
     suite.addTests(loader.loadTestsFromTestCase(TestBasicFunctionality))
     suite.addTests(loader.loadTestsFromTestCase(TestAssetCards))
+    suite.addTests(loader.loadTestsFromTestCase(TestAssetCardPool))
+    suite.addTests(loader.loadTestsFromTestCase(TestHeaderRenderer))
+    suite.addTests(loader.loadTestsFromTestCase(TestDirtyRectRenderer))
+    suite.addTests(loader.loadTestsFromTestCase(TestFrameScheduler))
     suite.addTests(loader.loadTestsFromTestCase(TestSimpleScenarios))
 
     # Запускаем тесты
@@ -0,0 +1,116 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from journal import Journal, open_journal, read_journal, replay_journal
+from simulation_core import GameState
+
+
+def play_journaled_game(journal, seed=21, weeks=6):
+    """Проводит игру с журналом: покупки и несколько недель."""
+    game_state = GameState(seed=seed, journal=journal)
+    for ticker in ('SBER', 'SBER-SB29R', 'VTB-DEP'):
+        game_state.selected_asset_ticker = ticker
+        game_state.quantity_input = "5"
+        game_state.execute_trade()
+    for _ in range(weeks):
+        game_state.next_week()
+        game_state.selected_asset_ticker = 'VTBR'
+        game_state.quantity_input = "1"
+        game_state.execute_trade()
+    return game_state
+
+
+class TestJournal(unittest.TestCase):
+    """Тесты журнала действий и воспроизведения."""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.game_state = play_journaled_game(Journal(self.stream))
+        self.records = list(read_journal(self.stream.getvalue().splitlines()))
+
+    def test_records_all_actions(self):
+        """В журнал попадают игра, сделки, недели, цены и начисления."""
+        kinds = {record['type'] for record in self.records}
+        self.assertEqual(self.records[0]['type'], 'game')
+        self.assertEqual(self.records[0]['seed'], 21)
+        self.assertTrue({'trade', 'week', 'prices', 'accrual'} <= kinds)
+        self.assertEqual(
+            sum(record['type'] == 'week' for record in self.records), 6
+        )
+
+    def test_replay_rebuilds_state(self):
+        """Воспроизведение журнала дает то же состояние игры."""
+        restored = replay_journal(self.records)
+
+        self.assertEqual(restored.player, self.game_state.player)
+        self.assertEqual(restored.current_week, self.game_state.current_week)
+        self.assertEqual(
+            restored.market.prices.tolist(),
+            self.game_state.market.prices.tolist()
+        )
+        self.assertIsNone(restored.journal)
+
+    def test_replay_detects_tampering(self):
+        """Измененная запись обнаруживается при сверке."""
+        trade = next(r for r in self.records if r['type'] == 'trade')
+        trade['price'] += 1
+
+        with self.assertRaises(ValueError):
+            replay_journal(self.records)
+
+    def test_replay_without_game_record_rejected(self):
+        """Журнал без начала игры не воспроизводится."""
+        with self.assertRaises(ValueError):
+            replay_journal(self.records[1:])
+
+    def test_truncated_last_line_skipped(self):
+        """Оборванная последняя строка после сбоя пропускается."""
+        lines = self.stream.getvalue().splitlines()
+        lines[-1] = lines[-1][:5]
+
+        records = list(read_journal(lines))
+
+        self.assertEqual(len(records), len(lines) - 1)
+        with self.assertRaises(ValueError):
+            list(read_journal(lines + ['{}']))
+
+    def test_replay_with_ticks(self):
+        """Журнал игры с тиками внутри недели воспроизводится."""
+        stream = io.StringIO()
+        game_state = GameState(seed=4, ticks_per_week=3, journal=Journal(stream))
+        game_state.place_order('buy', 'SBER', 5)
+        game_state.next_tick()
+        game_state.place_order('buy', 'VTBR', 5)
+        game_state.next_week()
+        game_state.next_week()
+
+        records = list(read_journal(stream.getvalue().splitlines()))
+        self.assertEqual(records[0]['ticks'], 3)
+        self.assertEqual(
+            sum(record['type'] == 'tick' for record in records), 4
+        )
+
+        restored = replay_journal(records)
+        self.assertEqual(restored.ticks_per_week, 3)
+        self.assertEqual(restored.player, game_state.player)
+
+    def test_file_journal(self):
+        """Журнал в файле дописывается и читается обратно."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'game.jsonl')
+            with open_journal(path) as journal:
+                game_state = play_journaled_game(journal, seed=3, weeks=2)
+            with open(path, encoding='utf-8') as file:
+                restored = replay_journal(read_journal(file))
+
+        self.assertEqual(restored.player, game_state.player)
+
+
+if __name__ == '__main__':
+    unittest.main()
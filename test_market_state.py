@@ -0,0 +1,206 @@
+import json
+import os
+import pickle
+import sys
+import tracemalloc
+import unittest
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from market_state import AssetCatalog, AssetRecord, MarketState
+from simulation_core import GameState, ASSETS
+
+
+def make_assets():
+    """Создает небольшой каталог активов для тестов."""
+    return {
+        'акции': [
+            {'name': 'Акция', 'ticker': 'A', 'price': 100.0, 'base_price': 100.0,
+             'change': 0.0, 'volatility': 0.05},
+        ],
+        'вклады': [
+            {'name': 'Вклад', 'ticker': 'D', 'price': 1.0, 'base_price': 1.0,
+             'change': 0.0, 'volatility': 0.0},
+        ]
+    }
+
+
+class TestMarketState(unittest.TestCase):
+    """Тесты рыночного состояния сессии."""
+
+    def setUp(self):
+        self.catalog = AssetCatalog(make_assets())
+
+    def test_copy_on_write(self):
+        """Сессия копирует массивы каталога только при первой записи."""
+        market = MarketState(self.catalog)
+        self.assertIs(market.prices, self.catalog.base_prices)
+        self.assertFalse(market.owns_prices)
+
+        market.get('A')['price'] = 110.0
+
+        self.assertTrue(market.owns_prices)
+        self.assertEqual(market.get('A')['price'], 110.0)
+        self.assertEqual(self.catalog.base_prices[0], 100.0)
+
+        market.reset()
+        self.assertIs(market.prices, self.catalog.base_prices)
+
+    def test_sessions_are_isolated(self):
+        """Изменение цен в одной сессии не видно в другой."""
+        first = MarketState(self.catalog)
+        second = MarketState(self.catalog)
+
+        first.assets['акции'][0]['price'] = 50.0
+
+        self.assertEqual(second.assets['акции'][0]['price'], 100.0)
+
+    def test_view_behaves_like_dict(self):
+        """Актив сессии читается как словарь, статические поля неизменяемы."""
+        market = MarketState(self.catalog)
+        asset = market.get('D')
+
+        self.assertEqual(asset['name'], 'Вклад')
+        self.assertEqual(asset.get('dividend', 0), 0)
+        self.assertIn('price', asset)
+        with self.assertRaises(TypeError):
+            asset['name'] = 'Другое имя'
+        self.assertIsNone(market.get('NONE'))
+
+    def test_set_prices_checks_size(self):
+        """Массивы цен должны совпадать с каталогом по размеру."""
+        market = MarketState(self.catalog)
+        with self.assertRaises(ValueError):
+            market.set_prices([1.0], [0.0])
+
+
+class TestGameStateSessions(unittest.TestCase):
+    """Тесты нескольких игровых сессий в одном процессе."""
+
+    def test_games_do_not_share_prices(self):
+        """Две игры не меняют цены друг друга и каталог ASSETS."""
+        first = GameState()
+        second = GameState()
+
+        for _ in range(5):
+            first.next_week()
+
+        self.assertNotEqual(
+            first.find_asset_by_ticker('SBER')['price'],
+            second.find_asset_by_ticker('SBER')['price']
+        )
+        for group in ASSETS.values():
+            for asset in group:
+                self.assertEqual(asset['price'], asset['base_price'])
+        self.assertFalse(second.market.owns_prices)
+
+    def test_reset_keeps_market(self):
+        """Сброс игры возвращает цены к базовым в той же сессии."""
+        game_state = GameState()
+        market = game_state.market
+        game_state.next_week()
+
+        game_state.reset_game()
+
+        self.assertIs(game_state.market, market)
+        self.assertFalse(market.owns_prices)
+
+
+class TestAssetCatalog(unittest.TestCase):
+    """Тесты компактного каталога активов."""
+
+    def test_record_fields(self):
+        """Поля актива читаются из записи, столбцов и словаря значений."""
+        catalog = AssetCatalog(ASSETS)
+        asset = MarketState(catalog).get('SBER')
+        source = ASSETS['акции'][0]
+
+        self.assertEqual(dict(asset), source)
+        self.assertEqual(list(asset), list(source))
+        self.assertNotIn('yield', asset)
+        self.assertEqual(catalog.record(0).ticker, 'SBER')
+        bond = catalog.positions['SBER-SB29R']
+        self.assertIs(catalog.value(0, 'color'), catalog.value(bond, 'color'))
+
+    def test_records_are_compact_and_immutable(self):
+        """Запись без словаря экземпляра не меняется и переживает pickle."""
+        record = AssetCatalog(ASSETS).record(0)
+        self.assertFalse(hasattr(record, '__dict__'))
+        with self.assertRaises(AttributeError):
+            record.name = 'Другое имя'
+        copy = pickle.loads(pickle.dumps(record))
+        self.assertEqual((copy.ticker, copy.name), (record.ticker, record.name))
+
+    def test_extra_and_missing_fields(self):
+        """Нестандартные поля сохраняются, отсутствующие не выдумываются."""
+        assets = {'акции': [
+            {'ticker': 'X', 'base_price': 5.0, 'sector': 'IT', 'color': [1, 2, 3]}
+        ]}
+        asset = MarketState(AssetCatalog(assets)).get('X')
+        self.assertEqual(asset['sector'], 'IT')
+        self.assertEqual(asset['color'], (1, 2, 3))
+        self.assertEqual(asset.get('volatility', 0), 0)
+        self.assertEqual(
+            list(asset), ['ticker', 'price', 'base_price', 'change', 'color', 'sector']
+        )
+        catalog = AssetCatalog(assets)
+        self.assertIsInstance(catalog.record(0), AssetRecord)
+        self.assertEqual(dict(catalog.record(0).extra), {'sector': 'IT'})
+        self.assertEqual(dict(catalog.extras), {0: {'sector': 'IT'}})
+
+    def test_catalog_memory(self):
+        """Каталог целиком занимает в 5 раз меньше памяти, чем словари."""
+        count = 2000
+        text = json.dumps({'акции': [
+            {
+                'name': f'Компания {number}', 'ticker': f'T{number:05d}',
+                'price': 100.0 + number, 'base_price': 100.0 + number,
+                'change': 0.0, 'dividend': 5.0 + number % 7 / 10,
+                'risk': ('Низкий', 'Средний', 'Высокий')[number % 3],
+                'volatility': 0.03 + number % 5 / 100, 'color': [0, 168, 107],
+                'logo': f'T{number:05d}'
+            }
+            for number in range(count)
+        ]}, ensure_ascii=False)
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            assets = json.loads(text)
+            loaded = tracemalloc.get_traced_memory()[0] - before
+            before = tracemalloc.get_traced_memory()[0]
+            catalog = AssetCatalog(assets)
+            built = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        # Строки названий и тикеров каталог не копирует, а ссылается на них
+        payload = sum(
+            sys.getsizeof(asset['name']) + sys.getsizeof(asset['ticker'])
+            for asset in assets['акции']
+        )
+        self.assertEqual(len(catalog), count)
+        # Около 625 байт словаря против 100 байт каталога на актив вместе
+        # с индексом тикеров
+        self.assertGreaterEqual((loaded - payload) / built, 5)
+
+    def test_ticker_index(self):
+        """Индекс тикеров ведет себя как словарь позиций."""
+        catalog = AssetCatalog({'акции': [
+            {'ticker': ticker, 'base_price': 1.0} for ticker in ('C', 'A', 'B')
+        ]})
+        positions = catalog.positions
+        self.assertEqual(dict(positions), {'C': 0, 'A': 1, 'B': 2})
+        self.assertEqual(list(positions), ['C', 'A', 'B'])
+        self.assertIs(type(positions['B']), int)
+        self.assertIsNone(positions.get('D'))
+        self.assertIsNone(positions.get(None))
+        self.assertNotIn('0', positions)
+        self.assertEqual(pickle.loads(pickle.dumps(positions)), positions)
+        with self.assertRaisesRegex(ValueError, 'повторяются'):
+            AssetCatalog({'акции': [
+                {'ticker': 'A', 'base_price': 1.0}, {'ticker': 'A', 'base_price': 2.0}
+            ]})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from monte_carlo import (
+    run_batch, play_game, make_seeds, hold_cash_strategy, deposit_strategy,
+    MonteCarloResult
+)
+from simulation_core import ASSETS, INITIAL_BALANCE, TOTAL_WEEKS, GameState
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """Тесты пакетного прогона игр."""
+
+    def test_play_game_runs_all_weeks(self):
+        """Игра доходит до последней недели и приносит доход."""
+        game_state = play_game(1)
+        self.assertTrue(game_state.game_finished)
+        self.assertEqual(game_state.current_week, TOTAL_WEEKS)
+        self.assertGreater(game_state.player['dividends_earned'], 0)
+        self.assertGreater(game_state.player['interest_earned'], 0)
+        game_state.reset_game()
+
+    def test_batch_is_reproducible(self):
+        """Одинаковое зерно дает одинаковые результаты."""
+        first = run_batch(20, seed=7, workers=1)
+        second = run_batch(20, seed=7, workers=1)
+        np.testing.assert_array_equal(first.total_value, second.total_value)
+        self.assertEqual(len(first), 20)
+
+    def test_process_pool_matches_single_process(self):
+        """Результат не зависит от числа процессов."""
+        single = run_batch(12, seed=3, workers=1)
+        pooled = run_batch(12, seed=3, workers=2, chunk_size=5)
+        np.testing.assert_array_equal(single.seeds, pooled.seeds)
+        np.testing.assert_array_equal(single.total_value, pooled.total_value)
+        np.testing.assert_array_equal(single.interest, pooled.interest)
+
+    def test_batch_restores_global_state(self):
+        """Прогон в текущем процессе не трогает random и цены каталога."""
+        random.seed(42)
+        expected = random.random()
+        random.seed(42)
+        run_batch(3, workers=1)
+        self.assertEqual(random.random(), expected)
+        for group in ASSETS.values():
+            for asset in group:
+                self.assertEqual(asset['price'], asset['base_price'])
+
+    def test_game_repeats_by_seed(self):
+        """Игра из пакета повторяется по своему зерну."""
+        result = run_batch(3, seed=11, workers=1)
+        game_state = play_game(int(result.seeds[1]))
+        self.assertEqual(game_state.player['total_value'], result.total_value[1])
+
+    def test_hold_cash_strategy(self):
+        """Без покупок итоговая стоимость равна начальному балансу."""
+        result = run_batch(5, strategy=hold_cash_strategy, workers=1)
+        np.testing.assert_array_equal(
+            result.total_value, np.full(5, INITIAL_BALANCE)
+        )
+
+    def test_deposit_strategy_settled_without_weeks(self):
+        """Вклад до конца игры дает тот же итог, что и пошаговая игра."""
+        result = run_batch(4, seed=5, strategy=deposit_strategy, workers=1)
+        for row, seed in enumerate(result.seeds.tolist()):
+            game_state = GameState(seed=seed)
+            deposit_strategy(game_state)
+            while game_state.next_week():
+                pass
+            self.assertAlmostEqual(
+                result.total_value[row], game_state.player['total_value'], places=8
+            )
+        self.assertTrue((result.interest > 0).all())
+
+    def test_summary(self):
+        """Сводка содержит статистики по всем метрикам."""
+        result = MonteCarloResult(
+            make_seeds(4), np.array([1.0, 2.0, 3.0, 4.0]),
+            np.zeros(4), np.ones(4)
+        )
+        summary = result.summary()
+        self.assertEqual(set(summary), {'total_value', 'dividends', 'interest'})
+        self.assertEqual(summary['total_value']['mean'], 2.5)
+        self.assertEqual(summary['total_value']['p50'], 2.5)
+        self.assertEqual(summary['interest']['std'], 0.0)
+
+    def test_intraday_batch(self):
+        """Пакет игр с тиками внутри недели считается и воспроизводится."""
+        first = run_batch(6, seed=2, workers=1, ticks_per_week=78)
+        second = run_batch(6, seed=2, workers=1, ticks_per_week=78)
+        self.assertEqual(first.total_value.tolist(), second.total_value.tolist())
+        self.assertTrue((first.interest > 0).all())
+
+    def test_invalid_game_count(self):
+        """Пустой пакет отклоняется."""
+        with self.assertRaises(ValueError):
+            run_batch(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
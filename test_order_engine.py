@@ -0,0 +1,361 @@
+import io
+import os
+import sys
+import unittest
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from journal import Journal, read_journal, replay_journal
+from order_engine import (
+    ORDER_CANCELLED, ORDER_FILLED, ORDER_PARTIAL, ORDER_PENDING,
+    ORDER_REJECTED, Order, TriggerIndex
+)
+from simulation_core import GameState
+
+
+class TestOrderEngine(unittest.TestCase):
+    """Тесты исполнения поручений на покупку и продажу."""
+
+    def setUp(self):
+        self.game_state = GameState(seed=5)
+
+    def buy(self, ticker, quantity):
+        self.game_state.operation_type = 'buy'
+        self.game_state.selected_asset_ticker = ticker
+        self.game_state.quantity_input = str(quantity)
+        return self.game_state.execute_trade()
+
+    def test_sell_returns_money(self):
+        """Продажа возвращает деньги и уменьшает позицию."""
+        self.buy('SBER', 10)
+        balance = self.game_state.player['balance']
+        price = self.game_state.find_asset_by_ticker('SBER')['price']
+
+        self.game_state.operation_type = 'sell'
+        self.game_state.quantity_input = "4"
+        success, message = self.game_state.execute_trade()
+
+        self.assertTrue(success)
+        self.assertIn("Продано 4", message)
+        self.assertEqual(self.game_state.player['portfolio']['SBER'], 6)
+        self.assertAlmostEqual(
+            self.game_state.player['balance'], balance + price * 4
+        )
+        self.assertEqual(self.game_state.player['trades_today'], 2)
+
+    def test_sell_whole_position_removes_it(self):
+        """Продажа всей позиции убирает актив из портфеля и распределения."""
+        self.buy('SBER', 3)
+        self.game_state.operation_type = 'sell'
+        success, _ = self.game_state.execute_trade()
+
+        self.assertTrue(success)
+        self.assertNotIn('SBER', self.game_state.player['portfolio'])
+        distribution, value = self.game_state.get_portfolio_distribution()
+        self.assertEqual(distribution, {})
+        self.assertAlmostEqual(value, 0.0)
+        self.assertAlmostEqual(
+            self.game_state.player['total_value'],
+            self.game_state.player['balance']
+        )
+
+    def test_interactive_trade_is_all_or_nothing(self):
+        """Сделка из интерфейса не исполняется частично."""
+        success, message = self.buy('TCSG', 100)
+        self.assertFalse(success)
+        self.assertIn("Недостаточно средств", message)
+
+        self.game_state.operation_type = 'sell'
+        self.game_state.quantity_input = "1"
+        success, message = self.game_state.execute_trade()
+        self.assertFalse(success)
+        self.assertIn("Нет актива", message)
+        self.assertEqual(self.game_state.player['trades_today'], 0)
+
+    def test_partial_buy_fills_affordable_quantity(self):
+        """Частичная покупка исполняется в пределах баланса."""
+        order = self.game_state.place_order('buy', 'TCSG', 100)
+        self.assertEqual(order.status, ORDER_PENDING)
+
+        self.game_state.settle_orders()
+
+        price = self.game_state.find_asset_by_ticker('TCSG')['price']
+        self.assertEqual(order.status, ORDER_PARTIAL)
+        self.assertEqual(order.filled, int(10000.0 // price))
+        self.assertIn("из 100", order.message)
+        self.assertGreaterEqual(self.game_state.player['balance'], 0)
+        self.assertLess(self.game_state.player['balance'], price)
+
+    def test_partial_sell_fills_held_quantity(self):
+        """Частичная продажа ограничена позицией в портфеле."""
+        self.buy('VTBR', 7)
+        order = self.game_state.place_order('sell', 'VTBR', 10)
+        self.game_state.settle_orders()
+
+        self.assertEqual(order.status, ORDER_PARTIAL)
+        self.assertEqual(order.filled, 7)
+        self.assertNotIn('VTBR', self.game_state.player['portfolio'])
+
+    def test_invalid_orders_rejected_on_submit(self):
+        """Некорректные поручения отклоняются сразу и не ставятся в очередь."""
+        for order in (
+                self.game_state.place_order('hold', 'SBER', 1),
+                self.game_state.place_order('buy', 'SBER', 0)
+        ):
+            self.assertEqual(order.status, ORDER_REJECTED)
+        self.assertEqual(self.game_state.order_engine.pending, [])
+
+        order = self.game_state.place_order('buy', 'NOPE', 1)
+        self.game_state.settle_orders()
+        self.assertEqual(order.status, ORDER_REJECTED)
+        self.assertEqual(order.message, "Актив не найден")
+
+    def test_batch_settlement_revalues_once(self):
+        """Пачка поручений переоценивает портфель один раз."""
+        tickers = ['SBER', 'VTBR', 'SBER-SB29R', 'VTB-DEP']
+        orders = [
+            self.game_state.place_order('buy', ticker, 2) for ticker in tickers
+        ]
+        calls = []
+        original = self.game_state.update_portfolio_value
+
+        def counting_update():
+            calls.append(1)
+            original()
+
+        self.game_state.update_portfolio_value = counting_update
+        settled = self.game_state.settle_orders()
+
+        self.assertEqual(settled, orders)
+        self.assertTrue(all(order.status == ORDER_FILLED for order in orders))
+        self.assertEqual(len(calls), 1)
+
+        reference = GameState(seed=5)
+        for ticker in tickers:
+            reference.selected_asset_ticker = ticker
+            reference.quantity_input = "2"
+            reference.execute_trade()
+        self.assertEqual(
+            self.game_state.player['portfolio'], reference.player['portfolio']
+        )
+        self.assertEqual(
+            self.game_state.player['total_value'],
+            reference.player['total_value']
+        )
+
+    def test_batch_respects_trade_limit(self):
+        """Поручения сверх дневного лимита отклоняются."""
+        limit = self.game_state.player['max_trades_per_day']
+        orders = [
+            self.game_state.place_order('buy', 'VTB-DEP', 1)
+            for _ in range(limit + 3)
+        ]
+        self.game_state.settle_orders()
+
+        self.assertEqual(
+            [order.status for order in orders].count(ORDER_FILLED), limit
+        )
+        self.assertEqual(orders[-1].message, "Достигнут лимит сделок на сегодня")
+
+    def test_next_week_settles_pending_orders(self):
+        """Поданные за неделю поручения исполняются при переходе к следующей."""
+        order = self.game_state.place_order('buy', 'SBER', 1)
+        self.game_state.next_week()
+
+        self.assertEqual(order.status, ORDER_FILLED)
+        self.assertEqual(self.game_state.player['portfolio'], {'SBER': 1})
+        self.assertEqual(self.game_state.order_engine.pending, [])
+
+    def test_unknown_operation_type(self):
+        """Неизвестный тип операции в интерфейсе отклоняется."""
+        self.game_state.operation_type = 'short'
+        self.game_state.selected_asset_ticker = 'SBER'
+        success, message = self.game_state.execute_trade()
+        self.assertFalse(success)
+        self.assertEqual(message, "Неизвестный тип операции")
+
+    def test_order_repr(self):
+        """Представление поручения показывает сторону и статус."""
+        self.assertIn("'sell'", repr(Order('sell', 'SBER', 1)))
+
+
+class TestTriggerOrders(unittest.TestCase):
+    """Тесты лимитных и стоп-поручений."""
+
+    def setUp(self):
+        self.game_state = GameState(seed=5)
+        self.sber = self.game_state.market.get('SBER')
+
+    def test_buy_limit_fires_when_price_falls(self):
+        """Лимитная покупка срабатывает при снижении цены до лимита."""
+        price = self.sber['price']
+        order = self.game_state.place_order(
+            'buy', 'SBER', 2, kind='limit', trigger_price=price * 0.95
+        )
+        self.assertEqual(order.status, ORDER_PENDING)
+        self.assertEqual(order.id, 1)
+
+        self.sber['price'] = price * 0.97
+        self.assertEqual(self.game_state.trigger_orders(), [])
+
+        self.sber['price'] = price * 0.9
+        self.assertEqual(self.game_state.trigger_orders(), [order])
+        self.assertEqual(order.status, ORDER_FILLED)
+        self.assertAlmostEqual(order.price, price * 0.9)
+        self.assertEqual(self.game_state.player['portfolio'], {'SBER': 2})
+        self.assertEqual(self.game_state.order_engine.resting, {})
+
+    def test_stop_loss_and_sell_limit(self):
+        """Стоп-продажа срабатывает при падении, лимитная продажа - при росте."""
+        self.game_state.place_order('buy', 'SBER', 10)
+        self.game_state.settle_orders()
+        price = self.sber['price']
+        stop = self.game_state.place_order(
+            'sell', 'SBER', 4, kind='stop', trigger_price=price * 0.9
+        )
+        take = self.game_state.place_order(
+            'sell', 'SBER', 6, kind='limit', trigger_price=price * 1.1
+        )
+
+        self.sber['price'] = price * 1.2
+        self.assertEqual(self.game_state.trigger_orders(), [take])
+        self.sber['price'] = price * 0.8
+        self.assertEqual(self.game_state.trigger_orders(), [stop])
+        self.assertEqual(self.game_state.player['portfolio'], {})
+
+    def test_marketable_order_fills_immediately(self):
+        """Поручение, цена которого уже достигнута, исполняется сразу."""
+        order = self.game_state.place_order(
+            'buy', 'SBER', 1, kind='limit', trigger_price=self.sber['price'] * 2
+        )
+        self.assertEqual(order.status, ORDER_FILLED)
+
+    def test_cancel(self):
+        """Отмененное поручение не срабатывает."""
+        order = self.game_state.place_order(
+            'buy', 'SBER', 1, kind='limit', trigger_price=1.0
+        )
+        self.assertTrue(self.game_state.cancel_order(order.id))
+        self.assertFalse(self.game_state.cancel_order(order.id))
+        self.assertEqual(order.status, ORDER_CANCELLED)
+
+        self.sber['price'] = 0.5
+        self.assertEqual(self.game_state.trigger_orders(), [])
+
+    def test_invalid_trigger_price(self):
+        """Лимитное поручение без цены срабатывания отклоняется."""
+        order = self.game_state.place_order('buy', 'SBER', 1, kind='limit')
+        self.assertEqual(order.status, ORDER_REJECTED)
+        order = self.game_state.place_order(
+            'buy', 'SBER', 1, kind='iceberg', trigger_price=1.0
+        )
+        self.assertEqual(order.status, ORDER_REJECTED)
+
+    def test_orders_fire_during_game(self):
+        """Поручения срабатывают при недельном изменении цен и событиях."""
+        self.game_state.place_order('buy', 'TCSG', 1)
+        self.game_state.settle_orders()
+        orders = []
+        for asset in ('SBER', 'VTBR', 'TCSG'):
+            price = self.game_state.market.get(asset)['price']
+            orders.append(self.game_state.place_order(
+                'buy', asset, 1, kind='limit', trigger_price=price * 0.97
+            ))
+        orders.append(self.game_state.place_order(
+            'sell', 'TCSG', 1, kind='stop',
+            trigger_price=self.game_state.market.get('TCSG')['price'] * 0.97
+        ))
+        while self.game_state.next_week():
+            pass
+
+        self.assertTrue(any(order.is_filled for order in orders))
+        for order in orders:
+            if order.is_filled:
+                self.assertTrue(order.is_triggered(order.price))
+
+    def test_index_pops_only_crossed_orders(self):
+        """Индекс извлекает только поручения, цена которых достигнута."""
+        index = TriggerIndex()
+        orders = []
+        for number in range(1, 20001):
+            order = Order(
+                'buy' if number % 2 else 'sell', 'SBER', 1,
+                kind='limit', trigger_price=float(number % 1000 + 1)
+            )
+            order.id = number
+            index.add(order)
+            orders.append(order)
+
+        fired = index.pop_triggered('SBER', 500.5)
+        expected = [
+            order for order in orders if order.is_triggered(500.5)
+        ]
+        self.assertEqual(
+            sorted(order.id for order in fired),
+            [order.id for order in expected]
+        )
+        self.assertEqual(index.pop_triggered('SBER', 500.5), [])
+
+
+class TestOrderJournal(unittest.TestCase):
+    """Тесты журналирования продаж и частичных исполнений."""
+
+    def test_replay_sells_and_partial_fills(self):
+        """Журнал игры с продажами и частичными исполнениями воспроизводится."""
+        stream = io.StringIO()
+        game_state = GameState(seed=9, journal=Journal(stream))
+        game_state.place_order('buy', 'TCSG', 10)
+        game_state.place_order('buy', 'SBER', 5)
+        game_state.next_week()
+        game_state.place_order('sell', 'TCSG', 100)
+        game_state.operation_type = 'sell'
+        game_state.selected_asset_ticker = 'SBER'
+        game_state.quantity_input = "2"
+        game_state.execute_trade()
+        game_state.next_week()
+
+        records = list(read_journal(stream.getvalue().splitlines()))
+        sides = [record['side'] for record in records if record['type'] == 'trade']
+        self.assertEqual(sides, ['buy', 'buy', 'sell', 'sell'])
+
+        replayed = replay_journal(records)
+        self.assertEqual(replayed.player, game_state.player)
+
+    def test_replay_trigger_orders(self):
+        """Журнал с лимитными и стоп-поручениями воспроизводится."""
+        stream = io.StringIO()
+        game_state = GameState(seed=3, journal=Journal(stream))
+        game_state.place_order('buy', 'VTBR', 40)
+        game_state.settle_orders()
+        price = game_state.market.get('VTBR')['price']
+        game_state.place_order(
+            'sell', 'VTBR', 40, kind='stop', trigger_price=price * 0.98
+        )
+        game_state.place_order(
+            'buy', 'VTBR', 10, kind='limit', trigger_price=price * 0.95
+        )
+        cancelled = game_state.place_order(
+            'buy', 'SBER', 1, kind='limit', trigger_price=1.0
+        )
+        game_state.cancel_order(cancelled.id)
+        while game_state.next_week():
+            pass
+
+        records = list(read_journal(stream.getvalue().splitlines()))
+        triggered = [
+            record for record in records
+            if record['type'] == 'trade' and 'order' in record
+        ]
+        self.assertTrue(triggered)
+
+        replayed = replay_journal(records)
+        self.assertEqual(replayed.player, game_state.player)
+        self.assertEqual(
+            sorted(replayed.order_engine.resting),
+            sorted(game_state.order_engine.resting)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
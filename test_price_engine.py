@@ -0,0 +1,104 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from market_state import AssetCatalog, MarketState
+from price_engine import VectorPriceEngine, PRICE_FLOOR
+from simulation_core import GameState, get_catalog
+
+
+def make_catalog():
+    """Создает небольшой каталог активов для тестов."""
+    return AssetCatalog({
+        'акции': [
+            {'name': 'Акция', 'ticker': 'A', 'base_price': 100.0, 'volatility': 0.05},
+            {'name': 'Копейка', 'ticker': 'B', 'base_price': 0.01, 'volatility': 0.5},
+        ],
+        'вклады': [
+            {'name': 'Вклад', 'ticker': 'D', 'base_price': 1.0, 'volatility': 0.0},
+        ]
+    })
+
+
+class TestVectorPriceEngine(unittest.TestCase):
+    """Тесты векторизованного движка цен."""
+
+    def test_step_keeps_price_in_band_and_floor(self):
+        """Цены меняются в пределах коридора и не ниже минимума."""
+        engine = VectorPriceEngine(make_catalog(), seed=1)
+
+        for _ in range(50):
+            old_price = engine.prices[0]
+            engine.step(market_volatility=2.0)
+            ratio = engine.prices[0] / old_price - 1
+            self.assertLessEqual(abs(ratio), 0.1 + 1e-12)
+            self.assertGreaterEqual(engine.prices[1], PRICE_FLOOR)
+
+    def test_zero_volatility_asset_unchanged(self):
+        """Актив без волатильности сохраняет цену и прошлое изменение."""
+        engine = VectorPriceEngine(make_catalog(), seed=2)
+        engine.set_prices(engine.prices, np.array([0.0, 0.0, 3.0]))
+
+        engine.step(market_volatility=1.0)
+
+        self.assertEqual(engine.prices[2], 1.0)
+        self.assertEqual(engine.changes[2], 3.0)
+
+    def test_news_threshold(self):
+        """Новость появляется только при изменении больше 80% коридора."""
+        engine = VectorPriceEngine(make_catalog(), seed=3)
+        shocks = np.random.default_rng(3).uniform(
+            -engine.volatilities, engine.volatilities
+        )
+
+        news = engine.step(market_volatility=1.0)
+
+        expected = int((np.abs(shocks) > engine.volatilities * 0.8)[:2].sum())
+        self.assertEqual(len(news), expected)
+
+
+class TestGameStateWithEngine(unittest.TestCase):
+    """Тесты GameState с векторизованным движком цен."""
+
+    def setUp(self):
+        self.game_state = GameState(
+            price_engine=VectorPriceEngine(get_catalog(), seed=5)
+        )
+        self.game_state.reset_game()
+
+    def tearDown(self):
+        self.game_state.reset_game()
+
+    def test_engine_survives_reset(self):
+        """Сброс игры сохраняет движок цен."""
+        self.game_state.reset_game()
+        self.assertIsNotNone(self.game_state.price_engine)
+
+    def test_update_prices_moves_assets(self):
+        """Обновление цен меняет цены в ASSETS."""
+        self.game_state.update_prices()
+
+        sber = self.game_state.find_asset_by_ticker('SBER')
+        self.assertNotEqual(sber['price'], sber['base_price'])
+
+    def test_engine_on_own_catalog(self):
+        """Движок строится по каталогу сессии, а не по встроенным активам."""
+        catalog = make_catalog()
+        game_state = GameState(
+            price_engine=VectorPriceEngine(catalog, seed=6),
+            market=MarketState(catalog)
+        )
+
+        game_state.update_prices()
+
+        self.assertNotEqual(game_state.market.get('A')['price'], 100.0)
+        self.assertEqual(game_state.market.get('D')['price'], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from monte_carlo import hold_cash_strategy, run_batch
+from price_history import PriceHistory, open_history, write_history
+from simulation_core import TOTAL_WEEKS, GameState, get_catalog
+
+
+def make_paths(tickers, rows, seed=0):
+    """Создает случайные ценовые пути для тикеров."""
+    rng = np.random.default_rng(seed)
+    returns = rng.uniform(-0.02, 0.02, size=(rows, len(tickers)))
+    return 100 * np.cumprod(1 + returns, axis=0)
+
+
+class TestPriceHistoryFile(unittest.TestCase):
+    """Тесты файла истории цен."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'history.vtbh')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_chunks_round_trip(self):
+        """Матрица, записанная частями, читается через отображение."""
+        paths = make_paths(['A', 'B', 'C'], 100)
+        rows = write_history(self.path, ['A', 'B', 'C'], [paths[:60], paths[60:]])
+        self.assertEqual(rows, 100)
+
+        history = PriceHistory(self.path)
+        self.assertIsInstance(history.prices, np.memmap)
+        self.assertFalse(history.prices.flags.writeable)
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history.tickers, ('A', 'B', 'C'))
+        np.testing.assert_array_equal(history.prices, paths)
+        np.testing.assert_array_equal(
+            history.row(7, np.array([2, 0])), paths[7, [2, 0]]
+        )
+
+    def test_float32(self):
+        """История может храниться в float32."""
+        paths = make_paths(['A'], 10)
+        write_history(self.path, ['A'], paths, dtype='<f4')
+        history = PriceHistory(self.path)
+        self.assertEqual(history.prices.dtype, np.float32)
+        np.testing.assert_allclose(history.prices, paths, rtol=1e-6)
+
+    def test_invalid(self):
+        """Некорректные данные и файлы отклоняются."""
+        with self.assertRaises(ValueError):
+            write_history(self.path, ['A', 'A'], [[1.0, 1.0]])
+        with self.assertRaises(ValueError):
+            write_history(self.path, ['A', 'B'], [[1.0, 0.0]])
+        with self.assertRaises(ValueError):
+            write_history(self.path, ['A', 'B'], [[1.0]])
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+        with open(self.path, 'wb') as file:
+            file.write(b'not a history file at all, definitely')
+        with self.assertRaises(ValueError):
+            PriceHistory(self.path)
+
+        write_history(self.path, ['A'], make_paths(['A'], 10))
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 8)
+        with self.assertRaisesRegex(ValueError, 'обрезан'):
+            PriceHistory(self.path)
+
+    def test_shared_mapping(self):
+        """Сессии процесса делят одно отображение, pickle передает путь."""
+        write_history(self.path, ['A'], make_paths(['A'], 10))
+        history = open_history(self.path)
+        self.assertIs(open_history(self.path), history)
+        self.assertIs(pickle.loads(pickle.dumps(history)), history)
+        self.assertLess(len(pickle.dumps(history)), 200)
+
+        write_history(self.path, ['A'], make_paths(['A'], 20))
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 10 ** 9))
+        self.assertEqual(len(open_history(self.path)), 20)
+
+
+class TestHistoricalGame(unittest.TestCase):
+    """Тесты игры на исторических ценах."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'history.vtbh')
+        # Все активы кроме вкладов плюс тикер, которого нет в каталоге
+        catalog = get_catalog()
+        self.tickers = [
+            ticker for ticker, position in catalog.positions.items()
+            if catalog.volatilities[position] > 0
+        ] + ['NOPE']
+        self.ticks = 2
+        self.rows = TOTAL_WEEKS * self.ticks + 5
+        self.paths = make_paths(self.tickers, self.rows)
+        write_history(self.path, self.tickers, self.paths)
+        self.history = open_history(self.path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def prices(self, game_state, tickers):
+        return [game_state.market.get(ticker)['price'] for ticker in tickers]
+
+    def test_prices_follow_history(self):
+        """Без событий цены точно повторяют историю со стартовой строки."""
+        game_state = GameState(
+            seed=1, ticks_per_week=self.ticks,
+            price_history=self.history, history_start=3
+        )
+        game_state.apply_market_event = lambda: None
+        tickers = self.tickers[:-1]
+        deposit = get_catalog().class_positions['вклады'][0]
+        deposit_price = float(game_state.market.prices[deposit])
+
+        self.assertEqual(self.prices(game_state, tickers), self.paths[3, :-1].tolist())
+        for week in range(2, TOTAL_WEEKS + 1):
+            game_state.next_week()
+            row = 3 + (week - 1) * self.ticks
+            self.assertEqual(
+                self.prices(game_state, tickers), self.paths[row, :-1].tolist()
+            )
+        self.assertFalse(game_state.next_week())
+        self.assertEqual(float(game_state.market.prices[deposit]), deposit_price)
+
+    def test_event_shift_persists(self):
+        """Сдвиг цены от события сохраняется на следующих тиках."""
+        game_state = GameState(
+            seed=1, ticks_per_week=self.ticks, price_history=self.history
+        )
+        position = get_catalog().positions['SBER']
+        column = self.tickers.index('SBER')
+        game_state.market.update_prices(
+            np.array([position]), np.array([self.paths[0, column] * 1.1]),
+            np.array([10.0])
+        )
+        game_state.apply_market_event = lambda: None
+        game_state.next_week()
+        self.assertAlmostEqual(
+            float(game_state.market.prices[position]),
+            self.paths[self.ticks, column] * 1.1
+        )
+
+    def test_reset_returns_to_start(self):
+        """Сброс игры возвращает цены на начальную строку истории."""
+        game_state = GameState(
+            seed=1, ticks_per_week=self.ticks, price_history=self.history
+        )
+        for _ in range(5):
+            game_state.next_week()
+        game_state.reset_game(2)
+        self.assertEqual(
+            self.prices(game_state, self.tickers[:-1]), self.paths[0, :-1].tolist()
+        )
+
+    def test_history_too_short(self):
+        """История короче игры и история вместе с движком отклоняются."""
+        with self.assertRaises(ValueError):
+            GameState(price_history=self.history, history_start=self.rows)
+        with self.assertRaises(ValueError):
+            GameState(price_history=self.history, price_engine=object())
+
+    def test_batch_over_processes(self):
+        """Пакет игр на истории одинаков в одном и в нескольких процессах."""
+        single = run_batch(
+            4, seed=1, strategy=hold_cash_strategy, workers=1,
+            ticks_per_week=self.ticks, price_history=self.history
+        )
+        pooled = run_batch(
+            4, seed=1, strategy=hold_cash_strategy, workers=2,
+            ticks_per_week=self.ticks, price_history=self.history
+        )
+        np.testing.assert_array_equal(single.total_value, pooled.total_value)
+
+
+if __name__ == '__main__':
+    unittest.main()
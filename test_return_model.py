@@ -0,0 +1,148 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from price_engine import VectorPriceEngine
+from return_model import (
+    CholeskyReturnModel, FactorReturnModel, correlation_from_pairs
+)
+from simulation_core import ASSETS, GameState, get_catalog
+
+
+def sample_correlation(model, draws=20000, seed=0):
+    """Возвращает выборочную матрицу корреляций шоков модели."""
+    shocks = model.draw(np.random.default_rng(seed), draws)
+    return np.corrcoef(shocks, rowvar=False)
+
+
+class TestReturnModels(unittest.TestCase):
+    """Тесты моделей коррелированной доходности."""
+
+    def setUp(self):
+        self.positions = get_catalog().positions
+        self.correlation = correlation_from_pairs(self.positions, {
+            ('SBER', 'VTBR'): 0.7,
+            ('SBER', 'TCSG'): 0.5,
+            ('VTBR', 'TCSG'): 0.4,
+            ('SBER-SB29R', 'VTB-B1379'): 0.8
+        })
+
+    def test_cholesky_reproduces_correlation(self):
+        """Шоки модели Холецкого имеют заданную корреляцию."""
+        model = CholeskyReturnModel(self.correlation)
+        np.testing.assert_allclose(model.correlation(), self.correlation)
+        np.testing.assert_allclose(
+            sample_correlation(model), self.correlation, atol=0.03
+        )
+
+    def test_factor_model_reproduces_correlation(self):
+        """Шоки факторной модели имеют корреляцию B * B^T."""
+        loadings = np.array([[0.8, 0.0], [0.6, 0.3], [0.0, 0.9], [0.5, 0.5]])
+        model = FactorReturnModel(loadings)
+        expected = loadings @ loadings.T
+        np.fill_diagonal(expected, 1.0)
+        np.testing.assert_allclose(model.correlation(), expected)
+        np.testing.assert_allclose(sample_correlation(model), expected, atol=0.03)
+
+    def test_draws_split_across_calls(self):
+        """Несколько шагов за вызов расходуют поток как столько же вызовов."""
+        model = FactorReturnModel(np.full(6, 0.5))
+        block = model.draw(np.random.default_rng(3), 4)
+        rng = np.random.default_rng(3)
+        rows = np.vstack([model.draw(rng) for _ in range(4)])
+        np.testing.assert_allclose(block, rows)
+
+    def test_invalid_matrices_rejected(self):
+        """Некорректные матрицы и нагрузки отклоняются."""
+        with self.assertRaises(ValueError):
+            CholeskyReturnModel([[1.0, 0.5], [0.4, 1.0]])
+        with self.assertRaises(ValueError):
+            CholeskyReturnModel([[2.0, 0.0], [0.0, 1.0]])
+        with self.assertRaises(ValueError):
+            CholeskyReturnModel([[1.0, 1.2], [1.2, 1.0]])
+        with self.assertRaises(ValueError):
+            FactorReturnModel([[0.9, 0.9]])
+        with self.assertRaises(ValueError):
+            correlation_from_pairs(self.positions, {('SBER', 'NOPE'): 0.5})
+
+    def test_large_factor_model(self):
+        """Факторная модель на тысячи активов не хранит матрицу n x n."""
+        model = FactorReturnModel(np.full((5000, 3), 0.3))
+        shocks = model.draw(np.random.default_rng(0), 2)
+        self.assertEqual(shocks.shape, (2, 5000))
+        self.assertEqual(model.loadings.nbytes, 5000 * 3 * 8)
+
+
+class TestCorrelatedGame(unittest.TestCase):
+    """Тесты коррелированных цен в игре."""
+
+    def setUp(self):
+        catalog = get_catalog()
+        self.sber = catalog.positions['SBER']
+        self.vtbr = catalog.positions['VTBR']
+        self.model = CholeskyReturnModel(correlation_from_pairs(
+            catalog.positions, {('SBER', 'VTBR'): 0.9}
+        ))
+
+    def _changes(self, game_state, steps=3000):
+        changes = []
+        for _ in range(steps):
+            game_state.market.reset()
+            game_state.update_prices()
+            changes.append(game_state.market.changes.copy())
+        return np.array(changes)
+
+    def test_prices_co_move(self):
+        """Цены коррелированных активов меняются согласованно."""
+        changes = self._changes(GameState(seed=1, return_model=self.model))
+        correlation = np.corrcoef(changes[:, self.sber], changes[:, self.vtbr])
+        self.assertGreater(correlation[0, 1], 0.85)
+
+        independent = self._changes(GameState(seed=1))
+        correlation = np.corrcoef(
+            independent[:, self.sber], independent[:, self.vtbr]
+        )
+        self.assertLess(abs(correlation[0, 1]), 0.1)
+
+    def test_variance_matches_uniform_corridor(self):
+        """Дисперсия изменений совпадает с равномерным шоком в коридоре."""
+        changes = self._changes(GameState(seed=2, return_model=self.model))
+        volatility = ASSETS['акции'][0]['volatility']
+        self.assertAlmostEqual(
+            changes[:, self.sber].std() / 100, volatility / np.sqrt(3), places=3
+        )
+
+    def test_price_engine_uses_model(self):
+        """Движок цен на массивах использует ту же модель."""
+        game_state = GameState(
+            price_engine=VectorPriceEngine(get_catalog()), seed=1,
+            return_model=self.model
+        )
+        changes = self._changes(game_state)
+        correlation = np.corrcoef(changes[:, self.sber], changes[:, self.vtbr])
+        self.assertGreater(correlation[0, 1], 0.85)
+
+    def test_game_repeats_by_seed(self):
+        """Игра с моделью доходности повторяется по зерну и переживает сброс."""
+        first = GameState(seed=4, return_model=self.model, ticks_per_week=5)
+        second = GameState(seed=9, return_model=self.model, ticks_per_week=5)
+        second.reset_game(4)
+        first.fast_forward()
+        second.fast_forward()
+        self.assertIs(second.return_model, self.model)
+        self.assertEqual(first.player['history'], second.player['history'])
+
+    def test_model_size_checked(self):
+        """Модель другого размера, чем каталог, отклоняется."""
+        game_state = GameState(return_model=CholeskyReturnModel(np.eye(3)))
+        with self.assertRaises(ValueError):
+            game_state.update_prices()
+
+
+if __name__ == '__main__':
+    unittest.main()
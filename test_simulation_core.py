@@ -0,0 +1,339 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import simulation_core
+from simulation_core import (
+    GameState, ASSETS, MARKET_EVENTS, INITIAL_BALANCE, TOTAL_WEEKS,
+    WEEKS_PER_YEAR, get_catalog, make_rng_streams, register_asset
+)
+
+
+class TestHeadlessImport(unittest.TestCase):
+    """Тесты импорта ядра без графического интерфейса."""
+
+    def test_import_does_not_load_pygame(self):
+        """Импорт ядра не подключает Pygame."""
+        result = subprocess.run(
+            [
+                sys.executable, '-c',
+                'import sys, simulation_core; '
+                'sys.exit(1 if "pygame" in sys.modules else 0)'
+            ],
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        self.assertEqual(result.returncode, 0)
+
+
+class TestHeadlessGame(unittest.TestCase):
+    """Тесты полной игры без интерфейса."""
+
+    def setUp(self):
+        self.game_state = GameState()
+        self.game_state.reset_game()
+
+    def tearDown(self):
+        self.game_state.reset_game()
+
+    def test_full_game(self):
+        """Игра проходит все недели и завершается."""
+        self.game_state.selected_asset_ticker = 'SBER'
+        self.game_state.quantity_input = "5"
+        success, _ = self.game_state.execute_trade()
+        self.assertTrue(success)
+
+        while self.game_state.next_week():
+            pass
+
+        self.assertTrue(self.game_state.game_finished)
+        self.assertEqual(self.game_state.current_week, TOTAL_WEEKS)
+        self.assertGreater(self.game_state.player['total_value'], 0)
+
+    def test_catalog_available(self):
+        """Данные активов и события доступны из ядра."""
+        self.assertIn('акции', ASSETS)
+        self.assertGreater(len(MARKET_EVENTS), 0)
+        self.assertEqual(self.game_state.player['balance'], INITIAL_BALANCE)
+
+
+class TestRegisterAsset(unittest.TestCase):
+    """Тесты добавления активов в ASSETS."""
+
+    def test_catalog_rebuilt(self):
+        """Новый актив попадает в каталог, повторный тикер отклоняется."""
+        asset = {
+            'name': 'Тест', 'ticker': 'TEST', 'price': 10.0, 'base_price': 10.0,
+            'change': 0.0, 'volatility': 0.0
+        }
+        register_asset('акции', asset)
+        try:
+            self.assertIn('TEST', get_catalog().positions)
+            with self.assertRaises(ValueError):
+                register_asset('акции', dict(asset))
+        finally:
+            ASSETS['акции'].remove(asset)
+            simulation_core._assets_version += 1
+        self.assertNotIn('TEST', get_catalog().positions)
+
+
+class TestIncrementalValuation(unittest.TestCase):
+    """Тесты инкрементальной оценки портфеля."""
+
+    def setUp(self):
+        self.game_state = GameState()
+        self.game_state.reset_game()
+
+    def tearDown(self):
+        self.game_state.reset_game()
+
+    def _full_holdings_value(self):
+        """Стоимость позиций, посчитанная полным перебором."""
+        return sum(
+            self.game_state.find_asset_by_ticker(ticker)['price'] * quantity
+            for ticker, quantity in self.game_state.player['portfolio'].items()
+        )
+
+    def _buy(self, ticker, quantity):
+        self.game_state.selected_asset_ticker = ticker
+        self.game_state.quantity_input = str(quantity)
+        success, _ = self.game_state.execute_trade()
+        self.assertTrue(success)
+
+    def test_trade_applies_delta(self):
+        """Сделка обновляет кэш без расхождения с полным пересчетом."""
+        self._buy('SBER', 10)
+        self._buy('SBER', 5)
+        self._buy('VTBR', 10)
+
+        distribution, holdings_value = (
+            self.game_state.get_portfolio_distribution()
+        )
+        self.assertAlmostEqual(holdings_value, self._full_holdings_value())
+        self.assertEqual(set(distribution), {'SBER', 'VTBR'})
+        self.assertAlmostEqual(
+            self.game_state.player['total_value'],
+            self.game_state.player['balance'] + holdings_value
+        )
+
+    def test_cache_reused_without_changes(self):
+        """Без изменений цен и портфеля оценка не пересчитывается."""
+        self._buy('SBER', 10)
+        version = self.game_state.valuation_version
+        distribution, _ = self.game_state.get_portfolio_distribution()
+
+        self.game_state.update_portfolio_value()
+        self.assertEqual(self.game_state.valuation_version, version)
+        self.assertIs(
+            self.game_state.get_portfolio_distribution()[0], distribution
+        )
+
+    def test_price_change_invalidates_cache(self):
+        """Изменение цен приводит к пересчету стоимости."""
+        self._buy('SBER', 10)
+        version = self.game_state.valuation_version
+
+        self.game_state.next_week()
+
+        self.assertNotEqual(self.game_state.valuation_version, version)
+        _, holdings_value = self.game_state.get_portfolio_distribution()
+        self.assertAlmostEqual(holdings_value, self._full_holdings_value())
+
+
+class TestSeededGame(unittest.TestCase):
+    """Тесты воспроизводимости игры по зерну."""
+
+    def _play(self, seed):
+        game_state = GameState(seed=seed)
+        game_state.selected_asset_ticker = 'SBER'
+        game_state.execute_trade()
+        while game_state.next_week():
+            pass
+        return game_state
+
+    def test_same_seed_same_game(self):
+        """Одинаковое зерно дает одинаковую историю игры."""
+        first = self._play(123)
+        second = self._play(123)
+
+        self.assertEqual(first.seed, 123)
+        self.assertEqual(first.player['history'], second.player['history'])
+        self.assertEqual(first.market_news, second.market_news)
+
+    def test_different_seeds_differ(self):
+        """Разные зерна дают разные игры."""
+        self.assertNotEqual(
+            self._play(1).player['history'], self._play(2).player['history']
+        )
+
+    def test_seed_is_exposed(self):
+        """Зерно выбирается автоматически и меняется при сбросе."""
+        game_state = GameState()
+        self.assertIsInstance(game_state.seed, int)
+        game_state.reset_game(seed=5)
+        self.assertEqual(game_state.seed, 5)
+
+    def test_price_stream_independent_of_events(self):
+        """Рыночные события не сдвигают поток ценового шума."""
+        quiet = GameState(seed=9)
+        eventful = GameState(seed=9)
+        quiet.event_rng = make_rng_streams(0)[0]
+        eventful.apply_market_event()
+        eventful.apply_market_event()
+
+        quiet.update_prices()
+        eventful.update_prices()
+
+        self.assertEqual(
+            quiet.price_rng.bit_generator.state,
+            eventful.price_rng.bit_generator.state
+        )
+
+
+
+class TestTicks(unittest.TestCase):
+    """Тесты тиков внутри недели."""
+
+    def _buy(self, game_state):
+        game_state.place_order('buy', 'SBER', 10)
+        game_state.place_order('buy', 'TCSG-2R', 2)
+        game_state.place_order('buy', 'VTB-DEP', 1000)
+        game_state.settle_orders()
+
+    def test_default_is_one_tick_per_week(self):
+        """По умолчанию неделя состоит из одного тика."""
+        game_state = GameState(seed=1)
+        self.assertTrue(game_state.next_tick())
+        self.assertEqual(game_state.current_week, 2)
+        self.assertEqual(game_state.tick_in_week, 0)
+
+    def test_week_starts_on_first_tick(self):
+        """Первый тик начинает неделю, история пишется после последнего."""
+        game_state = GameState(seed=1, ticks_per_week=5)
+        self._buy(game_state)
+        prices = game_state.market.prices.tolist()
+
+        game_state.next_tick()
+        self.assertEqual(game_state.current_week, 2)
+        self.assertEqual(game_state.tick_in_week, 1)
+        self.assertNotEqual(game_state.market.prices.tolist(), prices)
+        self.assertEqual(game_state.player['history'][1], INITIAL_BALANCE)
+
+        for _ in range(4):
+            game_state.next_tick()
+        self.assertEqual(game_state.current_week, 2)
+        self.assertEqual(game_state.tick_in_week, 0)
+        self.assertEqual(
+            game_state.player['history'][1], game_state.player['total_value']
+        )
+
+    def test_trade_limit_resets_every_tick(self):
+        """Лимит сделок действует на один тик."""
+        game_state = GameState(seed=1, ticks_per_week=5)
+        game_state.player['trades_today'] = game_state.player['max_trades_per_day']
+        game_state.next_tick()
+        game_state.player['trades_today'] = game_state.player['max_trades_per_day']
+        game_state.next_tick()
+        self.assertEqual(game_state.player['trades_today'], 0)
+
+    def test_fast_forward_matches_stepwise_ticks(self):
+        """Векторизованная неделя совпадает с пошаговыми тиками."""
+        fast = GameState(seed=8, ticks_per_week=20)
+        stepwise = GameState(seed=8, ticks_per_week=20)
+        for game_state in (fast, stepwise):
+            self._buy(game_state)
+
+        while fast.next_week():
+            pass
+        while stepwise.next_tick():
+            pass
+
+        self.assertEqual(
+            fast.market.prices.tolist(), stepwise.market.prices.tolist()
+        )
+        self.assertEqual(fast.market_news, stepwise.market_news)
+        for key in ('balance', 'dividends_earned', 'interest_earned'):
+            self.assertAlmostEqual(
+                fast.player[key], stepwise.player[key], places=8
+            )
+        for fast_value, step_value in zip(
+                fast.player['history'], stepwise.player['history']
+        ):
+            self.assertAlmostEqual(fast_value, step_value, places=8)
+
+    def test_weekly_accrual_does_not_depend_on_ticks(self):
+        """Проценты по вкладу за игру не зависят от числа тиков."""
+        earned = []
+        for ticks in (1, 7, 390):
+            game_state = GameState(seed=2, ticks_per_week=ticks)
+            game_state.place_order('buy', 'VTB-DEP', 1000)
+            game_state.fast_forward()
+            earned.append(game_state.player['interest_earned'])
+
+        expected = 1000 * 26.0 / 100 / WEEKS_PER_YEAR * (TOTAL_WEEKS - 1)
+        for value in earned:
+            self.assertAlmostEqual(value, expected)
+
+    def test_invalid_tick_count(self):
+        """Число тиков в неделе должно быть положительным."""
+        with self.assertRaises(ValueError):
+            GameState(ticks_per_week=0)
+
+
+class TestAnalyticSettlement(unittest.TestCase):
+    """Тесты расчета итога без ценового шума."""
+
+    def _play(self, portfolio, analytic, ticks=1, seed=4):
+        game_state = GameState(seed=seed, ticks_per_week=ticks)
+        for ticker, quantity in portfolio.items():
+            game_state.place_order('buy', ticker, quantity)
+        game_state.settle_orders()
+        if analytic:
+            game_state.fast_forward()
+        else:
+            while game_state.next_tick():
+                pass
+        return game_state
+
+    def test_deposits_match_stepwise_game(self):
+        """Итог портфеля из вкладов совпадает с пошаговой игрой."""
+        portfolio = {'VTB-DEP': 5000, 'SBER-DEP': 3000}
+        for ticks in (1, 5):
+            for seed in range(5):
+                fast = self._play(portfolio, True, ticks, seed)
+                stepwise = self._play(portfolio, False, ticks, seed)
+
+                self.assertTrue(fast.game_finished)
+                self.assertEqual(fast.current_week, stepwise.current_week)
+                self.assertEqual(fast.used_event_mask, stepwise.used_event_mask)
+                for key in ('balance', 'total_value', 'interest_earned'):
+                    self.assertAlmostEqual(
+                        fast.player[key], stepwise.player[key], places=8
+                    )
+                for fast_value, step_value in zip(
+                        fast.player['history'], stepwise.player['history']
+                ):
+                    self.assertAlmostEqual(fast_value, step_value, places=8)
+
+    def test_only_deterministic_portfolios_settled(self):
+        """Портфель с волатильными активами и игра с журналом идут по неделям."""
+        game_state = GameState(seed=4)
+        self.assertTrue(game_state._can_settle_analytically())
+        game_state.player['portfolio'] = {'VTB-DEP': 10, 'SBER-SB29R': 1}
+        self.assertFalse(game_state._can_settle_analytically())
+
+        game_state = GameState(seed=4)
+        game_state.journal = object()
+        self.assertFalse(game_state._can_settle_analytically())
+
+        fast = self._play({'SBER': 5, 'VTB-DEP': 100}, True)
+        stepwise = self._play({'SBER': 5, 'VTB-DEP': 100}, False)
+        self.assertEqual(fast.market.prices.tolist(), stepwise.market.prices.tolist())
+        self.assertEqual(fast.player['history'], stepwise.player['history'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from journal import Journal
+from simulation_core import GameState
+from snapshot import (
+    dump_snapshot, load_snapshot, save_snapshot, read_snapshot,
+    SnapshotWriter, SNAPSHOT_MAGIC
+)
+
+
+def play_weeks(game_state, weeks):
+    """Покупает активы и проводит несколько недель."""
+    for ticker in ('SBER', 'SBER-SB29R', 'VTB-DEP'):
+        game_state.selected_asset_ticker = ticker
+        game_state.quantity_input = "5"
+        game_state.execute_trade()
+    for _ in range(weeks):
+        game_state.next_week()
+
+
+class TestSnapshot(unittest.TestCase):
+    """Тесты бинарных снимков состояния игры."""
+
+    def setUp(self):
+        self.game_state = GameState(seed=77)
+        play_weeks(self.game_state, 5)
+
+    def test_round_trip(self):
+        """Снимок восстанавливает все данные игры."""
+        restored = load_snapshot(dump_snapshot(self.game_state))
+
+        self.assertEqual(restored.seed, self.game_state.seed)
+        self.assertEqual(restored.current_week, self.game_state.current_week)
+        self.assertEqual(restored.player, self.game_state.player)
+        self.assertEqual(restored.used_events, self.game_state.used_events)
+        self.assertIs(restored.current_event, self.game_state.current_event)
+        self.assertEqual(restored.market_news, self.game_state.market_news)
+        self.assertEqual(
+            restored.market_volatility, self.game_state.market_volatility
+        )
+        self.assertEqual(
+            restored.market.prices.tolist(),
+            self.game_state.market.prices.tolist()
+        )
+
+    def test_restored_game_continues_identically(self):
+        """После восстановления игра продолжается так же, как исходная."""
+        restored = load_snapshot(dump_snapshot(self.game_state))
+
+        while self.game_state.next_week():
+            pass
+        while restored.next_week():
+            pass
+
+        self.assertEqual(restored.player['history'], self.game_state.player['history'])
+
+    def test_resting_orders_restored(self):
+        """Ожидающие лимитные и стоп-поручения переживают снимок."""
+        price = self.game_state.market.get('SBER')['price']
+        self.game_state.place_order(
+            'sell', 'SBER', 5, kind='stop', trigger_price=price * 0.97
+        )
+        self.game_state.place_order(
+            'buy', 'VTBR', 3, kind='limit', trigger_price=1.0
+        )
+        restored = load_snapshot(dump_snapshot(self.game_state))
+
+        engine = restored.order_engine
+        self.assertEqual(sorted(engine.resting), [1, 2])
+        self.assertEqual(engine.next_id, 3)
+        self.assertEqual(engine.resting[1].kind, 'stop')
+        self.assertEqual(engine.resting[1].trigger_price, price * 0.97)
+
+        while self.game_state.next_week():
+            pass
+        while restored.next_week():
+            pass
+        self.assertEqual(restored.player, self.game_state.player)
+
+    def test_mid_week_snapshot(self):
+        """Снимок посреди недели продолжает игру с того же тика."""
+        game_state = GameState(seed=6, ticks_per_week=4)
+        play_weeks(game_state, 2)
+        game_state.next_tick()
+        restored = load_snapshot(dump_snapshot(game_state))
+
+        self.assertEqual(restored.ticks_per_week, 4)
+        self.assertEqual(restored.tick_in_week, 1)
+        game_state.fast_forward()
+        restored.fast_forward()
+        self.assertEqual(restored.player['history'], game_state.player['history'])
+
+    def test_snapshot_is_compact(self):
+        """Снимок занимает меньше килобайта."""
+        data = dump_snapshot(self.game_state)
+        self.assertTrue(data.startswith(SNAPSHOT_MAGIC))
+        self.assertLess(len(data), 1024)
+
+    def test_corrupted_snapshot_rejected(self):
+        """Поврежденный или чужой снимок не загружается."""
+        data = dump_snapshot(self.game_state)
+        with self.assertRaises(ValueError):
+            load_snapshot(b'XXXX' + data[4:])
+        with self.assertRaises(ValueError):
+            load_snapshot(data[:-5])
+        with self.assertRaises(ValueError):
+            load_snapshot(data[:6] + b'\x00\x00\x00\x00' + data[10:])
+
+    def test_failed_load_keeps_state(self):
+        """Неудачная загрузка не меняет текущую игру."""
+        target = GameState(seed=1)
+        with self.assertRaises(ValueError):
+            load_snapshot(dump_snapshot(self.game_state)[:-5], target)
+        self.assertEqual(target.seed, 1)
+
+    def test_restore_into_existing_state(self):
+        """Снимок загружается в существующее состояние с его рынком."""
+        target = GameState()
+        market = target.market
+
+        load_snapshot(dump_snapshot(self.game_state), target)
+
+        self.assertIs(target.market, market)
+        self.assertEqual(target.player['portfolio'], self.game_state.player['portfolio'])
+
+    def test_restore_does_not_journal(self):
+        """Восстановление не пишет в журнал запись новой игры."""
+        stream = io.StringIO()
+        target = GameState()
+        target.journal = journal = Journal(stream)
+
+        load_snapshot(dump_snapshot(self.game_state), target)
+
+        self.assertIs(target.journal, journal)
+        journal.flush()
+        self.assertEqual(stream.getvalue(), '')
+
+
+class TestSnapshotFiles(unittest.TestCase):
+    """Тесты записи снимков в файлы."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'saves', 'game.vtbs')
+        self.game_state = GameState(seed=5)
+        play_weeks(self.game_state, 2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_read(self):
+        """Снимок сохраняется в файл и читается обратно."""
+        save_snapshot(self.game_state, self.path)
+        restored = read_snapshot(self.path)
+        self.assertEqual(restored.player, self.game_state.player)
+
+    def test_background_writer(self):
+        """Фоновый писатель записывает последний поставленный снимок."""
+        writer = SnapshotWriter()
+        writer.submit(self.game_state, self.path)
+        self.game_state.next_week()
+        writer.submit(self.game_state, self.path)
+        writer.close()
+
+        restored = read_snapshot(self.path)
+        self.assertEqual(restored.current_week, self.game_state.current_week)
+        self.assertIsNone(writer.last_error)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_background_writer_survives_error(self):
+        """Ошибка при сжатии не останавливает фоновый поток."""
+        writer = SnapshotWriter()
+        with patch('snapshot.compress_snapshot', side_effect=MemoryError):
+            writer.submit(self.game_state, self.path)
+            writer.flush()
+        self.assertIsInstance(writer.last_error, MemoryError)
+
+        writer.submit(self.game_state, self.path)
+        writer.flush()
+        writer.close()
+        restored = read_snapshot(self.path)
+        self.assertEqual(restored.current_week, self.game_state.current_week)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,279 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# Добавляем путь к проекту для импорта
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import universe
+from market_state import SESSION_FIELDS
+from simulation_core import (
+    ASSETS, MARKET_EVENTS, GameState, get_catalog, get_event_table, use_universe
+)
+from universe import load_universe, read_assets, read_events, read_cache
+
+ASSETS_CSV = """\
+class,ticker,name,base_price,dividend,yield,risk,volatility,color,logo_file,sector
+акции,AAA,Альфа,100,5,,Высокий,0.03,#102030,aaa.png,банки
+акции,BBB,Бета,50.5,,,Средний,0.02,,,
+вклады,DEP,Вклад,1,,10,Низкий,0,,,
+"""
+
+EVENTS_CSV = """name,description,effects,volatility_effect
+Рост,Акции растут,акции:0.05;DEP:0.01,0.002
+Падение,,AAA:-0.1,
+"""
+
+
+class TestUniverseFiles(unittest.TestCase):
+    """Тесты разбора файлов набора активов."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.assets_path = self.write('assets.csv', ASSETS_CSV)
+        self.events_path = self.write('events.csv', EVENTS_CSV)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def test_csv_assets(self):
+        """Строки CSV становятся активами в формате ASSETS."""
+        assets = read_assets(self.assets_path)
+        self.assertEqual(list(assets), ['акции', 'вклады'])
+        first = assets['акции'][0]
+        self.assertEqual(first['base_price'], 100.0)
+        self.assertEqual(first['price'], 100.0)
+        self.assertEqual(first['color'], (16, 32, 48))
+        self.assertEqual(first['sector'], 'банки')
+        self.assertNotIn('dividend', assets['акции'][1])
+
+    def test_json_assets_match_csv(self):
+        """Файл JSON в формате ASSETS дает тот же каталог, что и CSV."""
+        path = os.path.join(self.temp_dir.name, 'assets.json')
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(read_assets(self.assets_path), file, ensure_ascii=False)
+        from_csv = load_universe(self.assets_path, use_cache=False).catalog
+        from_json = load_universe(path, use_cache=False).catalog
+        self.assertEqual(from_json.fingerprint, from_csv.fingerprint)
+        for position in range(len(from_csv)):
+            self.assertEqual(from_json.fields(position), from_csv.fields(position))
+
+    def test_invalid_assets(self):
+        """Ошибки в данных сообщаются с номером строки."""
+        header = ASSETS_CSV.splitlines()[0]
+        cases = {
+            'повтор': 'акции,AAA,А,1\nакции,AAA,Б,2',
+            'цена': 'акции,AAA,А,0',
+            'число': 'акции,AAA,А,abc',
+            'волатильность': 'акции,AAA,А,1,,,,-0.1',
+            'цвет': 'акции,AAA,А,1,,,,,red',
+            'категория': ',AAA,А,1',
+            'неизвестная категория': 'etf,AAA,А,1',
+            'тикер': 'акции,,А,1'
+        }
+        for case, rows in cases.items():
+            with self.subTest(case):
+                path = self.write('bad.csv', f"{header}\n{rows}\n")
+                with self.assertRaisesRegex(ValueError, r'bad\.csv:\d'):
+                    load_universe(path, use_cache=False)
+
+    def test_events(self):
+        """События проверяются по каталогу."""
+        catalog = load_universe(self.assets_path, use_cache=False).catalog
+        events = read_events(self.events_path, catalog)
+        self.assertEqual(events[0]['effects'], {'акции': 0.05, 'DEP': 0.01})
+        self.assertEqual(events[0]['volatility_effect'], 0.002)
+        self.assertEqual(events[1]['volatility_effect'], 0.0)
+
+        path = self.write('bad.json', json.dumps([
+            {'name': 'Неизвестный', 'effects': {'SBER': 0.1}}
+        ]))
+        with self.assertRaisesRegex(ValueError, 'SBER'):
+            read_events(path, catalog)
+
+
+class TestUniverseCache(unittest.TestCase):
+    """Тесты двоичного кэша набора."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.assets_path = os.path.join(self.temp_dir.name, 'assets.csv')
+        self.events_path = os.path.join(self.temp_dir.name, 'events.csv')
+        for path, text in ((self.assets_path, ASSETS_CSV),
+                           (self.events_path, EVENTS_CSV)):
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+        self.cache_path = os.path.join(self.temp_dir.name, 'assets.vtbu')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def load(self):
+        return load_universe(self.assets_path, self.events_path)
+
+    def test_cached_catalog_equals_parsed(self):
+        """Каталог из кэша совпадает с разобранным."""
+        parsed = self.load()
+        self.assertFalse(parsed.from_cache)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        cached = self.load()
+        self.assertTrue(cached.from_cache)
+        self.assertEqual(cached.events, parsed.events)
+        self.assertEqual(cached.catalog.fingerprint, parsed.catalog.fingerprint)
+        for asset_class, positions in parsed.catalog.class_positions.items():
+            np.testing.assert_array_equal(
+                cached.catalog.class_positions[asset_class], positions
+            )
+        self.assertEqual(
+            list(cached.catalog.class_positions), list(parsed.catalog.class_positions)
+        )
+        self.assertEqual(dict(cached.catalog.extras), dict(parsed.catalog.extras))
+        for position in range(len(parsed.catalog)):
+            fields = parsed.catalog.fields(position)
+            self.assertEqual(cached.catalog.fields(position), fields)
+            for key in fields:
+                if key not in SESSION_FIELDS:
+                    self.assertEqual(
+                        cached.catalog.value(position, key),
+                        parsed.catalog.value(position, key)
+                    )
+        np.testing.assert_array_equal(
+            cached.catalog.base_prices, parsed.catalog.base_prices
+        )
+
+    def test_changed_source_invalidates(self):
+        """Изменение исходного файла перестраивает кэш."""
+        self.load()
+        with open(self.assets_path, 'a', encoding='utf-8') as file:
+            file.write('облигации,BND,Облигация,1000,,8,Низкий,0.001,,,\n')
+        reloaded = self.load()
+        self.assertFalse(reloaded.from_cache)
+        self.assertIn('BND', reloaded.catalog.positions)
+        self.assertTrue(self.load().from_cache)
+
+    def test_touched_source_keeps_cache(self):
+        """Новое время изменения при том же содержимом не сбрасывает кэш."""
+        self.load()
+        stat = os.stat(self.assets_path)
+        os.utime(self.assets_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertTrue(self.load().from_cache)
+
+    def test_corrupted_cache_rebuilt(self):
+        """Поврежденный кэш игнорируется и перезаписывается."""
+        self.load()
+        with open(self.cache_path, 'r+b') as file:
+            file.seek(-3, os.SEEK_END)
+            file.write(b'\xff\xff\xff')
+        self.assertIsNone(
+            read_cache(self.cache_path, [self.assets_path, self.events_path])
+        )
+        self.assertFalse(self.load().from_cache)
+        self.assertTrue(self.load().from_cache)
+
+    def test_source_edited_during_load(self):
+        """Файл, измененный во время разбора, не получает кэш старого содержимого."""
+        original = universe.load_catalog
+
+        def load_and_edit(path):
+            catalog = original(path)
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write('облигации,BND,Облигация,1000,,8,Низкий,0.001,,,\n')
+            return catalog
+
+        with patch('universe.load_catalog', side_effect=load_and_edit):
+            self.assertNotIn('BND', self.load().catalog.positions)
+        self.assertFalse(os.path.exists(self.cache_path))
+        reloaded = self.load()
+        self.assertFalse(reloaded.from_cache)
+        self.assertIn('BND', reloaded.catalog.positions)
+
+    def test_other_sources_not_cached(self):
+        """Кэш привязан к набору исходных файлов."""
+        self.load()
+        self.assertIsNone(read_cache(self.cache_path, [self.assets_path]))
+
+
+class TestUseUniverse(unittest.TestCase):
+    """Тесты подключения набора к игре."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.assets_path = os.path.join(self.temp_dir.name, 'assets.csv')
+        self.events_path = os.path.join(self.temp_dir.name, 'events.csv')
+        for path, text in ((self.assets_path, ASSETS_CSV),
+                           (self.events_path, EVENTS_CSV)):
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+
+    def tearDown(self):
+        use_universe(None)
+        self.temp_dir.cleanup()
+
+    def test_install_and_restore(self):
+        """Игра идет на подключенном наборе, None возвращает встроенный."""
+        builtin_events = list(MARKET_EVENTS)
+        loaded = load_universe(self.assets_path, self.events_path)
+        loaded.install()
+
+        self.assertIs(get_catalog(), loaded.catalog)
+        self.assertEqual(len(get_event_table()), 2)
+        game_state = GameState(seed=1)
+        self.assertEqual(
+            list(game_state.market.assets), ['акции', 'вклады']
+        )
+        for _ in range(3):
+            game_state.next_week()
+        self.assertEqual(game_state.current_week, 4)
+
+        use_universe(None)
+        self.assertEqual(list(get_catalog().positions)[0], ASSETS['акции'][0]['ticker'])
+        self.assertEqual(MARKET_EVENTS, builtin_events)
+        self.assertEqual(len(get_event_table()), len(builtin_events))
+
+    def test_universe_without_stocks(self):
+        """Набор без акций открывается на первой своей категории."""
+        path = os.path.join(self.temp_dir.name, 'deposits.csv')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(ASSETS_CSV.splitlines()[0] + '\n')
+            file.write('облигации,BND,Облигация,1000,,8,Низкий,0.001,,,\n')
+            file.write('вклады,DEP,Вклад,1,,10,Низкий,0,,,\n')
+        load_universe(path, use_cache=False).install()
+
+        game_state = GameState(seed=1)
+        self.assertEqual(game_state.selected_asset_type, 'облигации')
+        self.assertEqual(game_state.market.assets.get('акции', []), [])
+        game_state.selected_asset_ticker = 'DEP'
+        game_state.quantity_input = "100"
+        game_state.execute_trade()
+        game_state.next_week()
+        self.assertGreater(game_state.player['interest_earned'], 0)
+
+    def test_logo_files_from_catalog(self):
+        """Файлы логотипов берутся из поля logo_file каталога."""
+        catalog = get_catalog()
+        self.assertEqual(
+            catalog.value(catalog.positions['SBER'], 'logo_file'), 'sber.png'
+        )
+        loaded = load_universe(self.assets_path, use_cache=False)
+        catalog = loaded.catalog
+        self.assertEqual(
+            catalog.value(catalog.positions['AAA'], 'logo_file'), 'aaa.png'
+        )
+        with self.assertRaises(KeyError):
+            catalog.value(catalog.positions['BBB'], 'logo_file')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,561 @@
+"""
+Загрузка набора активов и рыночных событий из файлов данных.
+
+Активы читаются из CSV (строка на актив, колонка class - категория) или
+JSON (словарь категорий в формате ASSETS), события - из JSON (список в
+формате MARKET_EVENTS) или CSV (колонка effects вида "SBER:0.02;акции:-0.01").
+Строки CSV проверяются по мере чтения и сразу попадают в столбцы каталога,
+словари активов не накапливаются.
+
+Разобранный набор сохраняется в двоичный кэш: заголовок (сигнатура, версия,
+CRC32), размер, время изменения и SHA-256 исходных файлов, метаданные в
+JSON и числовые столбцы сырыми массивами. Пока исходные файлы не изменились,
+следующий запуск берет каталог из кэша без разбора файлов. Если у файла
+изменилось только время изменения, а содержимое то же, кэш остается
+действительным.
+"""
+
+import csv
+import hashlib
+import json
+import math
+import os
+import struct
+import zlib
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import simulation_core
+from accrual import ACCRUAL_RULES
+from market_state import CATEGORY_FIELDS, NUMERIC_FIELDS, AssetCatalog
+from snapshot import _write_file
+
+CACHE_MAGIC = b'VTBU'
+CACHE_VERSION = 1
+# Расширение кэша по умолчанию: файл лежит рядом с файлом активов
+CACHE_SUFFIX = '.vtbu'
+
+_HEADER = struct.Struct('<4sHHI')
+_SOURCE = struct.Struct('<qq32s')
+_SIZE = struct.Struct('<Q')
+
+# Колонка категории актива в CSV
+CLASS_COLUMN = 'class'
+# Разделители эффектов события в CSV: "SBER:0.02;акции:-0.01"
+EFFECT_SEPARATOR = ';'
+EFFECT_VALUE_SEPARATOR = ':'
+# Размер блока чтения при подсчете SHA-256
+_DIGEST_CHUNK = 1 << 20
+
+
+class Universe:
+    """Набор активов и событий, загруженный из файлов данных."""
+
+    def __init__(
+            self,
+            catalog: AssetCatalog,
+            events: Optional[List[Dict[str, Any]]] = None,
+            from_cache: bool = False
+    ):
+        """
+        Инициализация набора.
+
+        Args:
+            catalog: Каталог активов
+            events: События в формате MARKET_EVENTS (None - файл событий
+                    не задан)
+            from_cache: True, если набор прочитан из кэша
+        """
+        self.catalog = catalog
+        self.events = events
+        self.from_cache = from_cache
+
+    def install(self) -> None:
+        """Подключает набор к ядру симуляции (simulation_core.use_universe)."""
+        simulation_core.use_universe(self.catalog, self.events)
+
+
+def _is_json(path: str) -> bool:
+    """Проверяет, что файл данных в формате JSON (по расширению)."""
+    return path.lower().endswith('.json')
+
+
+def _number(value: Any, field: str, where: str) -> float:
+    """Возвращает конечное число поля или сообщает об ошибке."""
+    if isinstance(value, bool):
+        raise ValueError(f"{where}: поле {field} должно быть числом")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: поле {field} должно быть числом") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{where}: поле {field} должно быть конечным числом")
+    return number
+
+
+def _parse_color(value: str, where: str) -> Tuple[int, int, int]:
+    """Разбирает цвет вида #RRGGBB."""
+    text = value.strip()
+    if len(text) != 7 or not text.startswith('#'):
+        raise ValueError(f"{where}: цвет должен иметь вид #RRGGBB")
+    try:
+        return tuple(int(text[i:i + 2], 16) for i in (1, 3, 5))
+    except ValueError:
+        raise ValueError(f"{where}: цвет должен иметь вид #RRGGBB") from None
+
+
+def _checked_asset(asset: Any, where: str) -> Dict[str, Any]:
+    """
+    Проверяет актив и дополняет его полями сессии в формате ASSETS.
+
+    Raises:
+        ValueError: Если актив некорректен
+    """
+    if not isinstance(asset, dict):
+        raise ValueError(f"{where}: актив должен быть словарем")
+    ticker = asset.get('ticker')
+    if not isinstance(ticker, str) or not ticker.strip():
+        raise ValueError(f"{where}: не задан тикер")
+    if not isinstance(asset.get('name', ''), str):
+        raise ValueError(f"{where}: название должно быть строкой")
+    if 'base_price' not in asset:
+        raise ValueError(f"{where}: не задана базовая цена")
+    for field in NUMERIC_FIELDS:
+        if field in asset:
+            asset[field] = _number(asset[field], field, where)
+            if asset[field] < 0:
+                raise ValueError(f"{where}: поле {field} не может быть отрицательным")
+    if asset['base_price'] <= 0:
+        raise ValueError(f"{where}: базовая цена должна быть больше 0")
+    color = asset.get('color')
+    if color is not None:
+        if (not isinstance(color, (list, tuple)) or len(color) != 3 or
+                not all(isinstance(c, int) and 0 <= c <= 255 for c in color)):
+            raise ValueError(f"{where}: цвет должен быть тремя числами 0-255")
+        asset['color'] = tuple(color)
+    asset.setdefault('price', asset['base_price'])
+    asset.setdefault('change', 0.0)
+    return asset
+
+
+def _parse_csv_asset(row: Dict[str, Optional[str]], where: str) -> Dict[str, Any]:
+    """Переводит строку CSV в словарь актива; пустые ячейки пропускаются."""
+    asset: Dict[str, Any] = {}
+    for field, value in row.items():
+        if field is None:
+            raise ValueError(f"{where}: лишние значения в строке")
+        if value is None or not value.strip():
+            continue
+        value = value.strip()
+        if field == 'color':
+            asset[field] = _parse_color(value, where)
+        elif field in NUMERIC_FIELDS:
+            asset[field] = _number(value, field, where)
+        else:
+            asset[field] = value
+    return asset
+
+
+def _read_asset_rows(path: str) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Читает активы файла по одному.
+
+    Yields:
+        (место в файле, категория, актив)
+    """
+    if _is_json(path):
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: ожидается словарь категорий активов")
+        for asset_class, group in data.items():
+            if not isinstance(group, list):
+                raise ValueError(f"{path}: категория {asset_class} должна быть списком")
+            for number, asset in enumerate(group, 1):
+                yield f"{path}: {asset_class}[{number}]", asset_class, asset
+        return
+
+    with open(path, encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        fields = reader.fieldnames or []
+        if CLASS_COLUMN not in fields or 'ticker' not in fields:
+            raise ValueError(
+                f"{path}: в заголовке CSV нужны колонки {CLASS_COLUMN} и ticker"
+            )
+        for row in reader:
+            where = f"{path}:{reader.line_num}"
+            asset_class = (row.pop(CLASS_COLUMN) or '').strip()
+            yield where, asset_class, _parse_csv_asset(row, where)
+
+
+def iter_assets(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Читает и проверяет активы из CSV или JSON по одному.
+
+    Args:
+        path: Путь к файлу активов
+
+    Yields:
+        Пары (категория, актив в формате ASSETS)
+
+    Raises:
+        ValueError: Если файл некорректен или категория актива не из
+                    ACCRUAL_RULES (с указанием строки)
+        OSError: Если файл не читается
+    """
+    tickers = set()
+    for where, asset_class, asset in _read_asset_rows(path):
+        if not asset_class:
+            raise ValueError(f"{where}: не задана категория актива")
+        if asset_class not in ACCRUAL_RULES:
+            raise ValueError(
+                f"{where}: неизвестная категория {asset_class} "
+                f"(допустимы: {', '.join(ACCRUAL_RULES)})"
+            )
+        asset = _checked_asset(asset, where)
+        if asset['ticker'] in tickers:
+            raise ValueError(f"{where}: тикер {asset['ticker']} повторяется")
+        tickers.add(asset['ticker'])
+        yield asset_class, asset
+
+
+def read_assets(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Читает активы из CSV или JSON в формате ASSETS.
+
+    Args:
+        path: Путь к файлу активов
+
+    Returns:
+        Активы по категориям
+    """
+    assets: Dict[str, List[Dict[str, Any]]] = {}
+    for asset_class, asset in iter_assets(path):
+        assets.setdefault(asset_class, []).append(asset)
+    return assets
+
+
+def load_catalog(path: str) -> AssetCatalog:
+    """
+    Строит каталог активов прямо при чтении файла, без кэша.
+
+    Args:
+        path: Путь к файлу активов
+
+    Raises:
+        ValueError: Если файл некорректен или в нем нет активов
+    """
+    catalog = AssetCatalog.from_rows(iter_assets(path))
+    if not len(catalog):
+        raise ValueError(f"{path}: нет активов")
+    return catalog
+
+
+def _checked_event(event: Any, catalog: AssetCatalog, where: str) -> Dict[str, Any]:
+    """
+    Проверяет событие: ключи эффектов должны быть категориями или тикерами
+    каталога.
+
+    Raises:
+        ValueError: Если событие некорректно
+    """
+    if not isinstance(event, dict):
+        raise ValueError(f"{where}: событие должно быть словарем")
+    name = event.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError(f"{where}: не задано название события")
+    if not isinstance(event.get('description', ''), str):
+        raise ValueError(f"{where}: описание должно быть строкой")
+    effects = event.get('effects', {})
+    if not isinstance(effects, dict):
+        raise ValueError(f"{where}: эффекты должны быть словарем")
+    checked = {}
+    for key, value in effects.items():
+        if key not in catalog.class_positions and key not in catalog.positions:
+            raise ValueError(f"{where}: неизвестный актив или категория {key}")
+        value = _number(value, key, where)
+        if value <= -1:
+            raise ValueError(f"{where}: эффект {key} обнуляет цену")
+        checked[key] = value
+    return {
+        'name': name,
+        'description': event.get('description', ''),
+        'effects': checked,
+        'volatility_effect': _number(
+            event.get('volatility_effect', 0.0), 'volatility_effect', where
+        )
+    }
+
+
+def _parse_effects(text: str, where: str) -> Dict[str, str]:
+    """Разбирает эффекты события из CSV вида "SBER:0.02;акции:-0.01"."""
+    effects = {}
+    for part in text.split(EFFECT_SEPARATOR):
+        if not part.strip():
+            continue
+        key, separator, value = part.rpartition(EFFECT_VALUE_SEPARATOR)
+        if not separator or not key.strip():
+            raise ValueError(f"{where}: эффект должен иметь вид КЛЮЧ:ЧИСЛО")
+        effects[key.strip()] = value
+    return effects
+
+
+def read_events(path: str, catalog: AssetCatalog) -> List[Dict[str, Any]]:
+    """
+    Читает и проверяет рыночные события из JSON или CSV.
+
+    Args:
+        path: Путь к файлу событий
+        catalog: Каталог, по которому проверяются ключи эффектов
+
+    Returns:
+        События в формате MARKET_EVENTS
+
+    Raises:
+        ValueError: Если файл некорректен (с указанием места)
+        OSError: Если файл не читается
+    """
+    events = []
+    if _is_json(path):
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        if not isinstance(data, list):
+            raise ValueError(f"{path}: ожидается список событий")
+        for number, event in enumerate(data, 1):
+            events.append(_checked_event(event, catalog, f"{path}: [{number}]"))
+        return events
+
+    with open(path, encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        if 'name' not in (reader.fieldnames or []):
+            raise ValueError(f"{path}: в заголовке CSV нужна колонка name")
+        for row in reader:
+            where = f"{path}:{reader.line_num}"
+            event: Dict[str, Any] = {
+                'name': (row.get('name') or '').strip(),
+                'description': (row.get('description') or '').strip(),
+                'effects': _parse_effects(row.get('effects') or '', where)
+            }
+            if (row.get('volatility_effect') or '').strip():
+                event['volatility_effect'] = row['volatility_effect']
+            events.append(_checked_event(event, catalog, where))
+    return events
+
+
+def _file_digest(path: str) -> bytes:
+    """Возвращает SHA-256 содержимого файла."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_DIGEST_CHUNK), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _source_stamps(sources: Sequence[str]) -> List[Tuple[int, int, bytes]]:
+    """Возвращает размер, время изменения и SHA-256 исходных файлов."""
+    stamps = []
+    for path in sources:
+        stat = os.stat(path)
+        stamps.append((stat.st_size, stat.st_mtime_ns, _file_digest(path)))
+    return stamps
+
+
+def _encode_cache(
+        stamps: Sequence[Tuple[int, int, bytes]],
+        catalog: AssetCatalog,
+        events: Optional[List[Dict[str, Any]]]
+) -> bytes:
+    """Кодирует набор и отметки исходных файлов в тело кэша."""
+    meta = {
+        'tickers': catalog.tickers,
+        'names': catalog.names,
+        'logos': catalog.logos,
+        'extras': {
+            str(position): dict(extra) for position, extra in catalog.extras.items()
+        },
+        'classes': {
+            asset_class: positions.tolist()
+            for asset_class, positions in catalog.class_positions.items()
+        },
+        'categories': {
+            field: list(catalog.categories[field][1:]) for field in CATEGORY_FIELDS
+        },
+        'events': events
+    }
+    meta_data = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    parts = [_SIZE.pack(len(meta_data)), meta_data]
+    for field in NUMERIC_FIELDS:
+        parts.append(np.asarray(catalog.columns[field], dtype='<f8').tobytes())
+    for field in CATEGORY_FIELDS:
+        parts.append(np.asarray(catalog.codes[field], dtype='<u2').tobytes())
+    body = b''.join(parts)
+    header = _HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(stamps), zlib.crc32(body))
+    return header + b''.join(_SOURCE.pack(*stamp) for stamp in stamps) + body
+
+
+def write_cache(
+        cache_path: str,
+        sources: Sequence[str],
+        catalog: AssetCatalog,
+        events: Optional[List[Dict[str, Any]]] = None,
+        stamps: Optional[Sequence[Tuple[int, int, bytes]]] = None
+) -> None:
+    """
+    Записывает кэш набора атомарно (через временный файл).
+
+    Args:
+        cache_path: Путь к файлу кэша
+        sources: Исходные файлы, по которым проверяется кэш
+        catalog: Каталог активов
+        events: События набора
+        stamps: Отметки исходных файлов, снятые до их разбора (по умолчанию
+                снимаются сейчас)
+    """
+    if stamps is None:
+        stamps = _source_stamps(sources)
+    _write_file(cache_path, _encode_cache(stamps, catalog, events))
+
+
+def _sources_match(data: bytes, offset: int, sources: Sequence[str]) -> bool:
+    """Сверяет отметки исходных файлов в кэше с файлами на диске."""
+    for path in sources:
+        size, mtime_ns, digest = _SOURCE.unpack_from(data, offset)
+        offset += _SOURCE.size
+        stat = os.stat(path)
+        if stat.st_size != size:
+            return False
+        # Время изменения совпало - файл не трогали, хэш не нужен
+        if stat.st_mtime_ns != mtime_ns and _file_digest(path) != digest:
+            return False
+    return True
+
+
+def read_cache(
+        cache_path: str,
+        sources: Sequence[str]
+) -> Optional[Tuple[AssetCatalog, Optional[List[Dict[str, Any]]]]]:
+    """
+    Читает набор из кэша, если он действителен для исходных файлов.
+
+    Args:
+        cache_path: Путь к файлу кэша
+        sources: Исходные файлы набора
+
+    Returns:
+        (каталог, события) или None, если кэша нет, он поврежден или
+        исходные файлы изменились
+    """
+    try:
+        with open(cache_path, 'rb') as file:
+            data = file.read()
+        magic, version, count, checksum = _HEADER.unpack_from(data)
+        if (magic != CACHE_MAGIC or version != CACHE_VERSION or
+                count != len(sources)):
+            return None
+        offset = _HEADER.size
+        if not _sources_match(data, offset, sources):
+            return None
+        offset += _SOURCE.size * count
+        if zlib.crc32(memoryview(data)[offset:]) != checksum:
+            return None
+
+        meta_size, = _SIZE.unpack_from(data, offset)
+        offset += _SIZE.size
+        meta = json.loads(data[offset:offset + meta_size].decode('utf-8'))
+        offset += meta_size
+
+        size = len(meta['tickers'])
+        columns = {}
+        for field in NUMERIC_FIELDS:
+            columns[field] = np.frombuffer(data, dtype='<f8', count=size, offset=offset)
+            offset += size * 8
+        codes = {}
+        for field in CATEGORY_FIELDS:
+            codes[field] = np.frombuffer(data, dtype='<u2', count=size, offset=offset)
+            offset += size * 2
+        if offset != len(data):
+            return None
+
+        tickers = meta['tickers']
+        texts = {
+            'ticker': tickers,
+            'name': meta['names'],
+            # Ключ логотипа обычно совпадает с тикером
+            'logo': [
+                ticker if logo == ticker else logo
+                for ticker, logo in zip(tickers, meta['logos'])
+            ]
+        }
+        extras = {
+            int(position): MappingProxyType(extra)
+            for position, extra in meta['extras'].items()
+        }
+        categories = {
+            field: (None,) + tuple(
+                tuple(value) if isinstance(value, list) else value
+                for value in meta['categories'][field]
+            )
+            for field in CATEGORY_FIELDS
+        }
+        catalog = AssetCatalog.from_columns(
+            texts, extras, meta['classes'], columns, codes, categories
+        )
+        return catalog, meta['events']
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+
+
+def load_universe(
+        assets_path: str,
+        events_path: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        use_cache: bool = True
+) -> Universe:
+    """
+    Загружает набор активов и событий, по возможности из кэша.
+
+    Если кэш недействителен, файлы разбираются заново и кэш перезаписывается;
+    ошибка записи кэша не мешает загрузке.
+
+    Args:
+        assets_path: Файл активов (CSV или JSON)
+        events_path: Файл событий (JSON или CSV); если не задан, события
+                     ядра не меняются
+        cache_path: Файл кэша (по умолчанию рядом с файлом активов
+                    с расширением CACHE_SUFFIX)
+        use_cache: Читать и записывать ли кэш
+
+    Returns:
+        Загруженный набор (universe.install() подключает его к игре)
+
+    Raises:
+        ValueError: Если файлы данных некорректны
+        OSError: Если файлы данных не читаются
+    """
+    sources = [assets_path] if events_path is None else [assets_path, events_path]
+    if cache_path is None:
+        cache_path = os.path.splitext(assets_path)[0] + CACHE_SUFFIX
+
+    if use_cache:
+        cached = read_cache(cache_path, sources)
+        if cached is not None:
+            return Universe(cached[0], cached[1], from_cache=True)
+
+    # Отметки снимаются до разбора: файл, измененный во время загрузки,
+    # не должен получить кэш старого содержимого
+    stamps = _source_stamps(sources) if use_cache else None
+    catalog = load_catalog(assets_path)
+    events = None if events_path is None else read_events(events_path, catalog)
+    if use_cache:
+        try:
+            changed = any(
+                (stat.st_size, stat.st_mtime_ns) != stamp[:2]
+                for stat, stamp in zip(map(os.stat, sources), stamps)
+            )
+            if not changed:
+                write_cache(cache_path, sources, catalog, events, stamps)
+        except OSError:
+            pass
+    return Universe(catalog, events)